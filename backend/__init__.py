@@ -0,0 +1,5 @@
+"""Backend for the This Day in History app.
+
+Everything here is imported once per server process; the Streamlit script
+(``app.py``) and the page modules in ``ui`` only call into it.
+"""
@@ -0,0 +1,403 @@
+"""OpenAI-backed helpers: content generation, translation and answer checking."""
+import calendar
+from datetime import date
+
+import streamlit as st
+
+from backend.breaker import CircuitOpenError
+from backend.cache import daily_content_cache, generation_flights, get_or_refresh, local_history_cache, translation_cache, trivia_cache
+from backend.clients import chat_completion
+from backend.config import DAILY_CONTENT_TIMEOUT_SECONDS, DIFFICULTIES, LOCAL_HISTORY_POOL_SIZE, PREGENERATE_ALL_TRIVIA_DIFFICULTIES
+from backend.knowledge_base import build_fallback_content, format_facts_for_prompt, lookup_facts
+from backend.localities import canonical_locality
+from backend.metrics import instrumented
+from backend.parser import CORE_SECTIONS, PLACEHOLDERS, parse_fact_list, parse_history_response, parse_trivia_block, split_trivia_by_difficulty
+from backend.text import normalize_content, normalize_text
+from backend.trivia_bank import draw_questions
+
+TRIVIA_COMPLEXITY = {
+    'Easy': "very well-known facts, common knowledge",
+    'Medium': "general historical facts, moderately challenging",
+    'Hard': "obscure facts, specific details, challenging",
+}
+
+
+@instrumented
+def check_partial_correctness_with_ai(user_answer, correct_answer):
+    """
+    Uses AI to determine if a user's answer is partially correct compared to the actual answer.
+    Returns "Yes" or "No".
+    """
+    prompt = f"""
+    Compare the user's answer "{user_answer}" with the correct answer "{correct_answer}".
+    Is the user's answer partially correct or substantially similar to the correct answer, even if not an exact match?
+    Consider misspellings, slightly different phrasing, or capturing the main idea.
+    Respond with "Yes" or "No" only.
+    """
+    try:
+        reply = chat_completion(
+            prompt,
+            max_tokens=5, # Expecting a short answer
+            temperature=0.0 # Make it deterministic
+        )
+        return reply.lower() == "yes"
+    except Exception as e:
+        st.warning(f"⚠️ AI partial correctness check failed: {e}. Defaulting to exact match for this question.")
+        return False
+
+@instrumented
+def generate_related_trivia_article(question, answer):
+    """
+    Generates a short educational article explaining the answer to a trivia question.
+    """
+    prompt = f"""
+    Write a concise, educational article (around 50-100 words) that explains the answer to the following trivia question and provides relevant context.
+    
+    Trivia Question: "{question}"
+    Correct Answer: "{answer}"
+    
+    Focus on educating the reader about the topic related to the question and answer.
+    """
+    try:
+        return chat_completion(
+            prompt,
+            max_tokens=200, # Max 200 tokens for around 100 words
+            temperature=0.5 # A bit more creativity
+        )
+    except Exception as e:
+        st.warning(f"⚠️ Could not generate explanation for trivia question: {e}. Please try again.")
+        return "An explanation could not be generated at this time."
+
+def _translate_text(text, target_language):
+    """
+    OpenAI translation of one string. Raises on failure so that a failed call is never
+    cached and the next rerun retries it.
+    """
+    prompt = f"Translate the following text to {target_language} while preserving context, tone, and formatting (e.g., lists, paragraphs, specific dates/years in facts): \n\n{text}"
+    return normalize_text(chat_completion(
+        prompt,
+        max_tokens=1000, # Increased max_tokens for longer articles
+        temperature=0.2 # Keep it less creative for translation
+    ))
+
+def _translate_or_original(text, target_language):
+    """(translation, False), or (text, True) if the translation failed and the English is kept."""
+    if not text or target_language == 'English':
+        return text, False
+    try:
+        return get_or_refresh(translation_cache, (text, target_language), lambda: _translate_text(text, target_language)), False
+    except CircuitOpenError:
+        return text, True # The page already says the AI service is unavailable; don't warn once per string
+    except Exception as e:
+        st.warning(f"⚠️ Translation to {target_language} failed for some content: {e}. Displaying original English.")
+        return text, True
+
+
+@instrumented
+def translate_text_with_ai(text, target_language):
+    """
+    Translates a single string of text using the OpenAI API.
+    UI labels and content repeat on every rerun, so translations are shared by every session
+    through translation_cache (per text and language) and served stale-while-revalidate.
+    """
+    return _translate_or_original(text, target_language)[0]
+
+
+@instrumented
+def translate_text_checked(text, target_language):
+    """translate_text_with_ai, also returning whether the text fell back to English, so output that did isn't cached."""
+    return _translate_or_original(text, target_language)
+
+def translate_content(data, target_language):
+    """
+    Translates relevant textual content within the daily_data dictionary,
+    excluding trivia questions, hints, and answers.
+    """
+    if target_language == 'English':
+        return data
+
+    translated_data = data.copy() # Create a copy to modify
+
+    # Translate main articles and facts
+    translated_data['event_article'] = translate_text_with_ai(data['event_article'], target_language)
+    translated_data['born_article'] = translate_text_with_ai(data['born_article'], target_language)
+    translated_data['fun_fact_section'] = translate_text_with_ai(data['fun_fact_section'], target_language)
+    translated_data['local_history_section'] = translate_text_with_ai(data['local_history_section'], target_language)
+
+    # Translate Did You Know? section (list of strings)
+    translated_data['did_you_know_section'] = [
+        translate_text_with_ai(fact, target_language) for fact in data['did_you_know_section']
+    ]
+
+    # Translate Memory Prompts (list of strings)
+    translated_data['memory_prompt_section'] = [
+        translate_text_with_ai(prompt, target_language) for prompt in data['memory_prompt_section']
+    ]
+
+    # TRIVIA SECTION IS EXPLICITLY NOT TRANSLATED HERE.
+    # It remains in its original English form as generated by get_this_day_in_history_facts.
+    
+    return translated_data
+
+@instrumented
+def get_this_day_in_history_facts(current_day, current_month, user_info, preferred_decade=None, topic=None, difficulty='Medium', local_city=None, local_state_country=None):
+    """
+    Returns 'This Day in History' content for the date and preferences. Content is shared by
+    every session through daily_content_cache and served stale-while-revalidate, and
+    concurrent misses for the same key wait on a single generation. The local history fact
+    depends only on the locality, so it is not part of that content or its key: it comes
+    from the locality's pool (see get_local_history_fact). If generation fails, content is
+    built from the local knowledge base, or failing that placeholder content is returned.
+    A short generated trivia list is filled up to five with placeholders, with a warning.
+    """
+    local_history = {'local_history_section': get_local_history_fact(current_day, current_month, local_city, local_state_country)}
+    try:
+        content = dict(_cached_daily_content(current_day, current_month, preferred_decade, topic, difficulty), **local_history)
+        content['trivia_section'] = _pad_trivia_questions(list(content['trivia_section'])) # A copy: the cached list is shared
+        return content
+    except Exception as e:
+        fallback = build_fallback_content(current_month, current_day, lookup_facts(current_month, current_day, preferred_decade, topic))
+        if fallback is not None:
+            st.warning(f"⚠️ Could not reach the AI service ({e}). Showing facts from the local history archive instead.")
+            return dict(normalize_content(fallback), **local_history)
+        st.error(f"Error generating history: {e}")
+        return {
+            'event_article': "Could not fetch event history.",
+            'born_article': "Could not fetch birth history.",
+            'fun_fact_section': "Could not fetch fun fact.",
+            'trivia_section': [], # Empty list if error
+            'did_you_know_section': ["No 'Did You Know?' facts available for today. Please try again or adjust preferences."], # Ensure default content
+            'memory_prompt_section': ["No memory prompts available.", "Consider your favorite childhood memory.", "What's a happy moment from your past week?"],
+            'local_history_section': "Could not fetch local history for your area. Please check your location settings or try again."
+        }
+
+
+@instrumented
+def fetch_daily_content(current_day, current_month, preferred_decade=None, topic=None, difficulty='Medium', local_city=None, local_state_country=None):
+    """
+    get_this_day_in_history_facts for batch jobs (see backend/export.py): nothing is written
+    to the page, and when neither the model nor the knowledge base has content for the day
+    the error is raised instead of returning placeholder content. trivia_section holds the
+    questions as generated, which may be fewer than five.
+    """
+    local_history = {'local_history_section': get_local_history_fact(current_day, current_month, local_city, local_state_country)}
+    try:
+        return dict(_cached_daily_content(current_day, current_month, preferred_decade, topic, difficulty), **local_history)
+    except Exception:
+        fallback = build_fallback_content(current_month, current_day, lookup_facts(current_month, current_day, preferred_decade, topic))
+        if fallback is None:
+            raise
+        return dict(normalize_content(fallback), **local_history)
+
+
+def _cached_daily_content(current_day, current_month, preferred_decade, topic, difficulty):
+    """
+    The day's content without its local history, from daily_content_cache or generated on a
+    miss; trivia_section is not padded, so fewer than five questions means some were lost.
+    Runs on refresh and batch threads too, so it never writes to the page. Raises on API errors.
+    """
+    def generate():
+        facts = lookup_facts(current_month, current_day, preferred_decade, topic)
+        has_fallback = build_fallback_content(current_month, current_day, facts) is not None
+        return _generate_history_facts(current_day, current_month, facts, has_fallback, preferred_decade, topic, difficulty)
+
+    return get_or_refresh(daily_content_cache, (current_month, current_day, preferred_decade, topic, difficulty), generate, should_store=_has_core_sections)
+
+
+def _generate_history_facts(current_day, current_month, facts, has_fallback, preferred_decade, topic, difficulty):
+    """
+    Generates 'This Day in History' facts using OpenAI API with specific content requirements.
+    Incorporates customization options for decade, topic and difficulty,
+    grounded in the knowledge-base facts when there are any. Raises on API errors.
+    """
+    current_date_str = f"{current_month:02d}-{current_day:02d}"
+
+    event_word_count, born_word_count = 300, 150
+    trivia_complexity = TRIVIA_COMPLEXITY.get(difficulty, TRIVIA_COMPLEXITY['Medium'])
+
+    event_year_range = "between the years 1800 and 1960"
+    born_year_range = "between 1800 and 1970"
+
+    topic_clause = f" focusing on {topic}" if topic else ""
+    decade_clause = f" specifically from the {preferred_decade}" if preferred_decade and preferred_decade != "None" else ""
+
+    # Ground the articles in the local knowledge base when it has facts for this day, so the
+    # model writes up known facts instead of recalling (and choosing) them itself
+    if facts['events']:
+        event_instruction = f"Write a short article (around {event_word_count} words) about the first of the events listed below, using the others only for context."
+    else:
+        event_instruction = f"Write a short article (around {event_word_count} words) about a famous historical event that happened on this day {event_year_range}{topic_clause}{decade_clause}."
+    if facts['births']:
+        born_instruction = f"Write a brief article (around {born_word_count} words) about the first person in the births listed below."
+    else:
+        born_instruction = f"Write a brief article (around {born_word_count} words) about a well-known person born on this day {born_year_range}{decade_clause}."
+    facts_clause = ""
+    if facts['events'] or facts['births']:
+        facts_clause = f"""
+    Facts for this day (base your articles and fun fact on these):
+{format_facts_for_prompt(facts)}
+    """
+
+    prompt = f"""
+    You are an assistant generating 'This Day in History' facts for {current_date_str}.
+    {facts_clause}
+    Please provide:
+
+    1. Event Article: {event_instruction} Use clear, informative language.
+    2. Born on this Day Article: {born_instruction} Use clear, informative language.
+    3. Fun Fact: Provide one interesting and unusual fun fact that occurred on this day in history.
+    4. Trivia Questions: Provide **exactly five** concise, direct trivia questions based on today’s date. These should be actual questions that require a factual answer, and should not be "Did You Know?" statements or prompts for reflection. **Strictly avoid generating "Did You Know?" statements, "Memory Prompts", or any conversational phrases within the trivia questions themselves.** Topics can include history, famous birthdays, pop culture, or global events. The questions should be {trivia_complexity}. For each question, provide the correct answer in parentheses (like this) and a short, distinct hint in square brackets [like this]. Ensure each question is on a new line and begins with "a. ", "b. ", "c. ", "d. ", "e. " respectively.
+    5. Did You Know?: Provide three "Did You Know?" facts related to nostalgic content (e.g., old prices, inventions, fashion facts) from past decades (e.g., 1930s-1970s).
+    6. Memory Prompts: Provide **two to three** engaging questions to encourage reminiscing and conversation. Each prompt should be a complete sentence or question, without leading hyphens or bullet points in the raw output, ready to be formatted as paragraphs. (e.g., "Do you remember your first concert?", "What was your favorite childhood game?", "What's a memorable school event from your youth?").
+
+    Format your response clearly with these headings. Ensure articles are within the specified word counts.
+    """
+    if has_fallback:
+        # Local content is ready, so a slow completion fails over to it instead of holding the page
+        content = chat_completion(prompt, timeout=DAILY_CONTENT_TIMEOUT_SECONDS, max_retries=0)
+    else:
+        content = chat_completion(prompt)
+
+    parsed = normalize_content(parse_history_response(content)) # Render-ready once, before it is cached
+    del parsed['local_history_section'], parsed['parse_confidence']['local_history_section'] # Not asked for; see get_local_history_fact
+    weak_sections = [name for name, confidence in parsed['parse_confidence'].items() if confidence < 0.5]
+    if weak_sections:
+        print(f"WARNING: Low parse confidence for {current_date_str}: {parsed['parse_confidence']}") # Log to console for debugging
+
+    # A complete trivia set is just as good for the trivia page, so keep it for that difficulty
+    if len(parsed['trivia_section']) == 5:
+        trivia_cache.set(_trivia_cache_key(current_day, current_month, difficulty, topic), list(parsed['trivia_section']))
+    return parsed
+
+
+@instrumented
+def generate_local_history_facts(city, region, count=LOCAL_HISTORY_POOL_SIZE):
+    """
+    Generates count general historical facts about a place, or about the United States
+    when city is None. Raises on API errors.
+    """
+    place = f"{city}, {region}" if city else "the United States"
+    prompt = f"""
+    Provide {count} different general historical facts about {place} (e.g., related to its founding, a major historical event, or a significant person). Always include the specific date (month, day, year) or year of each fact within the fact itself. Do NOT refer to "this day in history" or any current date. Each fact must be a genuine historical event.
+    Write each fact on its own line, numbered "1. ", "2. " and so on, and respond with the facts only.
+    """
+    return [normalize_text(fact) for fact in parse_fact_list(chat_completion(prompt, max_tokens=120 * count, temperature=0.7))]
+
+
+def get_local_history_fact(current_day, current_month, local_city=None, local_state_country=None):
+    """
+    Returns the local history fact for a day. Facts are generated LOCAL_HISTORY_POOL_SIZE at
+    a time per canonical locality (see backend/localities.py), so "pittsburgh, pa" and
+    "Pittsburgh, Pennsylvania" share one pool, cached in local_history_cache; each day of
+    the year shows one fact from it. Without a full locality the pool is about the United
+    States. On failure returns the placeholder that the page and the PDF leave out.
+    """
+    city, region = canonical_locality(local_city, local_state_country) or (None, None)
+    try:
+        pool = get_or_refresh(local_history_cache, (city, region), lambda: generate_local_history_facts(city, region), should_store=bool)
+    except Exception as e:
+        print(f"ERROR: Could not generate local history for {f'{city}, {region}' if city else 'the United States'}: {e}") # Log to console for debugging
+        pool = []
+    if not pool:
+        return PLACEHOLDERS['local_history_section']
+    return pool[date(2000, current_month, current_day).timetuple().tm_yday % len(pool)] # 2000 is a leap year, so Feb 29 works
+
+
+def _has_core_sections(content):
+    """False for generated content missing an article, which is shown but not cached, so the next visit regenerates it."""
+    return all(content['parse_confidence'][name] > 0 for name in CORE_SECTIONS)
+
+
+def _pad_trivia_questions(trivia_questions):
+    """Fills a short trivia list up to five entries with placeholders, warning the user."""
+    # If less than 5 questions are found, or none, ensure default behavior
+    if len(trivia_questions) < 5:
+        st.warning(f"⚠️ Only {len(trivia_questions)} trivia questions found. AI might not have generated enough or parsing failed for some. Filling missing questions with placeholders.")
+        while len(trivia_questions) < 5:
+            trivia_questions.append({
+                'question': 'No question available.',
+                'answer': 'No answer available.',
+                'hint': 'No hint available.'
+            })
+    return trivia_questions
+
+
+def _trivia_cache_key(current_day, current_month, difficulty, topic):
+    return (current_month, current_day, difficulty, topic or None)
+
+
+def _trivia_prompt_header(current_day, current_month, topic):
+    topic_clause = f" Where possible, focus on {topic}." if topic else ""
+    return f"""
+    You are an assistant writing trivia for 'This Day in History' on {current_month:02d}-{current_day:02d}.
+    Questions should be concise, direct trivia questions based on this date that require a factual answer.{topic_clause}
+    **Strictly avoid generating "Did You Know?" statements, "Memory Prompts", or any conversational phrases within the trivia questions themselves.** Topics can include history, famous birthdays, pop culture, or global events.
+    For each question, provide the correct answer in parentheses (like this) and a short, distinct hint in square brackets [like this]. Ensure each question is on a new line and begins with "a. ", "b. ", "c. ", "d. ", "e. " respectively.
+    """
+
+
+@instrumented
+def generate_trivia_questions(current_day, current_month, difficulty='Medium', topic=None):
+    """
+    Generates only the five trivia questions for a date and difficulty, without the articles
+    and other sections of get_this_day_in_history_facts. Raises on API errors.
+    """
+    prompt = _trivia_prompt_header(current_day, current_month, topic) + f"""
+    Provide **exactly five** questions. The questions should be {TRIVIA_COMPLEXITY.get(difficulty, TRIVIA_COMPLEXITY['Medium'])}.
+    Respond with the five questions only.
+    """
+    return parse_trivia_block(chat_completion(prompt, max_tokens=600, temperature=0.7))
+
+
+@instrumented
+def generate_trivia_for_all_difficulties(current_day, current_month, topic=None):
+    """
+    Generates five trivia questions for each of Easy, Medium and Hard in a single call.
+    Returns {difficulty: [questions]}; a difficulty missing from the response maps to [].
+    """
+    difficulty_lines = "\n".join(f"    - {level}: {TRIVIA_COMPLEXITY[level]}" for level in DIFFICULTIES)
+    prompt = _trivia_prompt_header(current_day, current_month, topic) + f"""
+    Provide **exactly five** questions for each difficulty level below, under the headings "Easy:", "Medium:" and "Hard:" (each heading on its own line):
+{difficulty_lines}
+    Respond with the three headings and their questions only.
+    """
+    blocks = split_trivia_by_difficulty(chat_completion(prompt, max_tokens=1600, temperature=0.7))
+    return {level: parse_trivia_block(blocks.get(level, '')) for level in DIFFICULTIES}
+
+
+@instrumented
+def get_trivia_questions(current_day, current_month, difficulty='Medium', topic=None, current_year=None):
+    """
+    Returns five trivia questions for the date and difficulty. Sources, in order: the
+    pre-generated question bank, the shared trivia cache, and finally the model, which
+    generates just the trivia (or all three difficulties at once when
+    PREGENERATE_ALL_TRIVIA_DIFFICULTIES is set); every complete generated set is cached.
+    """
+    year = current_year or date.today().year
+    if (current_month, current_day) == (2, 29) and not calendar.isleap(year):
+        year = 2024 # Feb 29 asked for outside a leap year; any leap year seeds the draw
+    banked = draw_questions(date(year, current_month, current_day), difficulty, topic)
+    if banked:
+        return banked
+
+    cache_key = _trivia_cache_key(current_day, current_month, difficulty, topic)
+    cached = trivia_cache.get(cache_key)
+    if cached is not None:
+        return list(cached)
+
+    try:
+        if PREGENERATE_ALL_TRIVIA_DIFFICULTIES:
+            generated = generation_flights.do(('trivia', current_month, current_day, topic),
+                                              lambda: generate_trivia_for_all_difficulties(current_day, current_month, topic))
+        else:
+            generated = {difficulty: generation_flights.do(('trivia',) + cache_key,
+                                                           lambda: generate_trivia_questions(current_day, current_month, difficulty, topic))}
+    except Exception as e:
+        st.error(f"Error generating trivia: {e}")
+        return []
+
+    for level, questions in generated.items():
+        if len(questions) == 5: # Never cache a partial set; the next request retries it
+            trivia_cache.set(_trivia_cache_key(current_day, current_month, level, topic), list(questions))
+    return _pad_trivia_questions(list(generated.get(difficulty, [])))
+
@@ -0,0 +1,102 @@
+"""
+Circuit breaker around the OpenAI API.
+
+When OpenAI is down or very slow, every model call on a page would otherwise wait for its
+own timeout before falling back. After enough consecutive failed or slow calls the breaker
+opens and calls fail at once with CircuitOpenError, so pages fall back straight away to
+cached, English or knowledge-base content. Once the cooldown has passed a single probe call
+is let through (half-open): if it succeeds the breaker closes, otherwise it reopens for
+another cooldown.
+"""
+import threading
+import time
+
+import openai
+
+from backend.config import OPENAI_BREAKER_COOLDOWN_SECONDS, OPENAI_BREAKER_FAILURE_THRESHOLD, OPENAI_BREAKER_SLOW_CALL_SECONDS
+
+CLOSED = 'closed'
+OPEN = 'open'
+HALF_OPEN = 'half_open'
+
+# Errors that mean the service is unavailable, as opposed to a problem with the request
+OUTAGE_ERRORS = (openai.APIConnectionError, openai.InternalServerError, openai.RateLimitError)
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling the model while the circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """Counts consecutive failed or slow calls and fails fast for a cooldown once there are too many."""
+
+    def __init__(self, failure_threshold, slow_call_seconds, cooldown_seconds):
+        self.failure_threshold = failure_threshold
+        self.slow_call_seconds = slow_call_seconds
+        self.cooldown_seconds = cooldown_seconds
+        self.state = CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._times_opened = 0
+        self._lock = threading.Lock()
+
+    def _cooldown_remaining(self):
+        return self._opened_at + self.cooldown_seconds - time.monotonic()
+
+    def before_call(self):
+        """Raises CircuitOpenError unless a call may go ahead now."""
+        with self._lock:
+            if self.state == OPEN:
+                remaining = self._cooldown_remaining()
+                if remaining > 0:
+                    raise CircuitOpenError(f"The AI service is unavailable; retrying in {remaining:.0f} seconds.")
+                self.state = HALF_OPEN
+                self._probe_in_flight = False
+            if self.state == HALF_OPEN:
+                if self._probe_in_flight:
+                    raise CircuitOpenError("The AI service is unavailable; checking whether it has recovered.")
+                self._probe_in_flight = True
+
+    def record_result(self, elapsed_seconds, error=None):
+        """Records a finished call. Outage errors and calls slower than slow_call_seconds count as failures."""
+        failed = isinstance(error, OUTAGE_ERRORS) or elapsed_seconds > self.slow_call_seconds
+        with self._lock:
+            if self.state == HALF_OPEN:
+                self._probe_in_flight = False
+                if failed:
+                    self._open()
+                else:
+                    self.state = CLOSED
+                    self._consecutive_failures = 0
+            elif failed:
+                self._consecutive_failures += 1
+                if self.state == CLOSED and self._consecutive_failures >= self.failure_threshold:
+                    self._open()
+            else:
+                self._consecutive_failures = 0
+
+    def _open(self):
+        self.state = OPEN
+        self._opened_at = time.monotonic()
+        self._times_opened += 1
+        print(f"WARNING: OpenAI circuit breaker opened for {self.cooldown_seconds}s") # Log to console for debugging
+
+    def allows_calls(self):
+        """False while calls are failing fast (open, or half-open with the probe still running)."""
+        with self._lock:
+            if self.state == OPEN:
+                return self._cooldown_remaining() <= 0
+            return not (self.state == HALF_OPEN and self._probe_in_flight)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'state': self.state,
+                'consecutive_failures': self._consecutive_failures,
+                'times_opened': self._times_opened,
+                'cooldown_remaining_seconds': max(0.0, round(self._cooldown_remaining(), 1)) if self.state == OPEN else 0.0,
+            }
+
+
+openai_breaker = CircuitBreaker(OPENAI_BREAKER_FAILURE_THRESHOLD, OPENAI_BREAKER_SLOW_CALL_SECONDS, OPENAI_BREAKER_COOLDOWN_SECONDS)
@@ -0,0 +1,418 @@
+"""
+Process-wide caches shared by every session on this server.
+
+The artifact caches (daily content, translations, trivia, PDFs and trivia progress) store
+each value as a serialized blob: JSON, and zlib-compressed when that saves space. Entry
+sizes are then exact, and the caches share one byte budget, CACHE_MEMORY_BUDGET_MB: past
+it, entries are evicted across all of them, least recently used first or, with
+CACHE_EVICTION_POLICY=lfu, least often used among the least recent (see MemoryBudget).
+Each cache's stats() reports its hits, misses, size, compression ratio and evictions.
+
+With CACHE_BACKEND_URL set, the named caches below and generation_flights are kept in Redis
+instead, shared by every replica (see backend/redis_backend.py).
+"""
+import contextvars
+import hashlib
+import base64
+import json
+import sys
+import threading
+import time
+import zlib
+from collections import OrderedDict
+
+from backend.config import (
+    CACHE_BACKEND_URL,
+    CACHE_COMPRESS_MIN_BYTES,
+    CACHE_EVICTION_POLICY,
+    CACHE_FRESHNESS,
+    CACHE_KEY_PREFIX,
+    CACHE_LOCK_TIMEOUT_SECONDS,
+    CACHE_MEMORY_BUDGET_MB,
+    LEADERBOARD_CACHE_SECONDS,
+)
+from backend.memory import deep_sizeof
+from backend.ratelimit import BATCH, request_priority
+
+_PLAIN, _ZLIB = b'j', b'z' # First byte of a blob
+_BYTES_TAG, _TUPLE_TAG = '__bytes__', '__tuple__'
+
+
+def _to_json(value):
+    """value with bytes and tuples tagged, so that JSON (which has neither) round-trips them."""
+    if isinstance(value, (bytes, bytearray)):
+        return {_BYTES_TAG: base64.b64encode(value).decode('ascii')}
+    if isinstance(value, tuple):
+        return {_TUPLE_TAG: [_to_json(item) for item in value]}
+    if isinstance(value, list):
+        return [_to_json(item) for item in value]
+    if isinstance(value, dict):
+        if not all(isinstance(key, str) for key in value):
+            raise TypeError("Cached dicts must have string keys") # JSON would silently turn them into strings
+        return {key: _to_json(item) for key, item in value.items()}
+    return value
+
+
+def _from_json(obj):
+    if len(obj) == 1:
+        if _BYTES_TAG in obj:
+            return base64.b64decode(obj[_BYTES_TAG])
+        if _TUPLE_TAG in obj:
+            return tuple(obj[_TUPLE_TAG])
+    return obj
+
+
+def encode_value(value):
+    """
+    Serializes a cache value into a blob: JSON (strings, numbers, lists, dicts with string
+    keys, plus bytes and tuples), then zlib-compressed if it is at least
+    CACHE_COMPRESS_MIN_BYTES and compression makes it smaller (PDFs already are compressed).
+    Blobs are plain data, never code, so a blob read back from a shared Redis is safe to
+    decode. Returns (blob, serialized size).
+    """
+    serialized = json.dumps(_to_json(value), separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+    if len(serialized) >= CACHE_COMPRESS_MIN_BYTES:
+        compressed = zlib.compress(serialized, 6)
+        if len(compressed) < len(serialized):
+            return _ZLIB + compressed, len(serialized)
+    return _PLAIN + serialized, len(serialized)
+
+
+def decode_value(blob):
+    body = bytes(blob[1:])
+    return json.loads(zlib.decompress(body) if blob[:1] == _ZLIB else body, object_hook=_from_json)
+
+
+class _Entry:
+    __slots__ = ('fresh_until', 'expires_at', 'value', 'size', 'serialized_size', 'hits', 'last_used')
+
+    def __init__(self, fresh_until, expires_at, value, size, serialized_size, last_used):
+        self.fresh_until = fresh_until
+        self.expires_at = expires_at
+        self.value = value # The blob, for a cache with a budget
+        self.size = size # Bytes held by the blob and the key; 0 without a budget
+        self.serialized_size = serialized_size
+        self.hits = 0
+        self.last_used = last_used
+
+
+class TTLCache:
+    """
+    Thread-safe in-memory cache with a per-entry time-to-live and a size cap.
+    When full, the least recently used entry is evicted. With stale_ttl_seconds, an entry
+    is kept that much longer after it stops being fresh so get_entry can still serve it
+    (see get_or_refresh); get only ever returns fresh values.
+
+    With a MemoryBudget, values are stored as blobs (see encode_value) and every entry's
+    size is charged to the budget, which may evict it in favour of another cache's entry.
+    Each get then returns a new copy of the value. Without one, values are stored as is.
+    """
+
+    def __init__(self, ttl_seconds, max_entries=1024, stale_ttl_seconds=0, name=None, budget=None):
+        self.name = name # Identifies the cache's single-flight keys and stats; see make_cache
+        self.ttl_seconds = ttl_seconds
+        self.stale_ttl_seconds = stale_ttl_seconds
+        self.max_entries = max_entries
+        self.budget = budget
+        self._entries = OrderedDict() # key -> _Entry, least recently used first
+        self._lock = threading.Lock()
+        self._counts = {'hits': 0, 'misses': 0, 'evictions': 0, 'expirations': 0}
+        if budget is not None:
+            budget.register(self)
+
+    def get_entry(self, key):
+        """Returns (value, is_fresh) for key, or None if it is missing or past its stale window."""
+        with self._lock:
+            entry = self._entries.get(key)
+            now = time.monotonic()
+            if entry is not None and entry.expires_at < now:
+                self._remove(key, 'expirations')
+                entry = None
+            if entry is None:
+                self._counts['misses'] += 1
+                return None
+            self._counts['hits'] += 1
+            entry.hits += 1
+            entry.last_used = now
+            self._entries.move_to_end(key)
+            value, is_fresh = entry.value, entry.fresh_until >= now
+        return (decode_value(value) if self.budget is not None else value), is_fresh
+
+    def get(self, key, default=None):
+        """Returns the cached value for key, or default if it is missing or no longer fresh."""
+        entry = self.get_entry(key)
+        if entry is None or not entry[1]:
+            return default
+        return entry[0]
+
+    def set(self, key, value):
+        """Stores value under key, fresh for ttl_seconds."""
+        size = serialized_size = 0
+        if self.budget is not None:
+            value, serialized_size = encode_value(value)
+            size = sys.getsizeof(value) + deep_sizeof(key)
+        with self._lock:
+            now = time.monotonic()
+            fresh_until = now + self.ttl_seconds
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = _Entry(fresh_until, fresh_until + self.stale_ttl_seconds, value, size, serialized_size, now)
+            if self.budget is not None:
+                self.budget.charge(size)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)), 'evictions')
+        if self.budget is not None:
+            self.budget.enforce()
+
+    def _remove(self, key, reason=None):
+        """Drops key; the caller holds the lock."""
+        entry = self._entries.pop(key)
+        if self.budget is not None:
+            self.budget.charge(-entry.size)
+        if reason:
+            self._counts[reason] += 1
+
+    def evict(self, key):
+        """Evicts key if it is still cached, for the budget. Returns whether it was."""
+        with self._lock:
+            if key not in self._entries:
+                return False
+            self._remove(key, 'evictions')
+            return True
+
+    def eviction_candidates(self, sample_size):
+        """[(key, entry)] for up to sample_size of the least recently used entries."""
+        with self._lock:
+            candidates = []
+            for key, entry in self._entries.items():
+                candidates.append((key, entry))
+                if len(candidates) >= sample_size:
+                    break
+            return candidates
+
+    def values(self):
+        """The values of all fresh entries."""
+        now = time.monotonic()
+        with self._lock:
+            values = [entry.value for entry in self._entries.values() if entry.fresh_until >= now]
+        return [decode_value(value) for value in values] if self.budget is not None else values
+
+    def stats(self):
+        """Hit, miss, eviction and expiry counts, and the entries' size and compression."""
+        with self._lock:
+            stats = dict(self._counts, entries=len(self._entries))
+            if self.budget is not None:
+                stored = sum(entry.size for entry in self._entries.values())
+                serialized = sum(entry.serialized_size for entry in self._entries.values())
+                blobs = sum(len(entry.value) for entry in self._entries.values())
+                stats.update(bytes=stored, compression_ratio=round(serialized / blobs, 2) if blobs else None)
+        return stats
+
+    def clear(self):
+        with self._lock:
+            for key in list(self._entries):
+                self._remove(key)
+
+
+class MemoryBudget:
+    """
+    A byte budget shared by several TTLCaches. When their entries add up to more than
+    max_bytes, entries are evicted across all the caches until they fit: with the 'lru'
+    policy, the least recently used entry of any cache; with 'lfu', the least often hit of a
+    sample of each cache's least recently used entries (an approximation, like Redis', that
+    keeps hot UI-label translations over a one-off PDF). Expired entries always go first.
+    """
+
+    def __init__(self, max_bytes, policy='lru', sample_size=16):
+        if policy not in ('lru', 'lfu'):
+            raise ValueError(f"Unknown eviction policy {policy!r}; expected 'lru' or 'lfu'")
+        self.max_bytes = max_bytes
+        self.policy = policy
+        self.sample_size = sample_size
+        self.caches = []
+        self.used_bytes = 0
+        self._usage_lock = threading.Lock()
+        self._eviction_lock = threading.Lock() # One evicting thread at a time
+
+    def register(self, cache):
+        self.caches.append(cache)
+
+    def charge(self, size):
+        with self._usage_lock:
+            self.used_bytes += size
+
+    def enforce(self):
+        """Evicts entries until the caches fit in the budget."""
+        if self.used_bytes <= self.max_bytes:
+            return
+        with self._eviction_lock:
+            while self.used_bytes > self.max_bytes:
+                victim = self._pick_victim()
+                if victim is None:
+                    return
+                victim[0].evict(victim[1])
+
+    def _pick_victim(self):
+        now = time.monotonic()
+        best, best_rank = None, None
+        for cache in self.caches:
+            candidates = cache.eviction_candidates(1 if self.policy == 'lru' else self.sample_size)
+            for key, entry in candidates:
+                if entry.expires_at < now:
+                    return cache, key
+                rank = (entry.hits, entry.last_used) if self.policy == 'lfu' else (entry.last_used,)
+                if best_rank is None or rank < best_rank:
+                    best, best_rank = (cache, key), rank
+        return best
+
+    def stats(self):
+        return {'policy': self.policy, 'max_bytes': self.max_bytes, 'used_bytes': self.used_bytes}
+
+
+class _InFlightCall:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls for the same key onto one in-flight computation: the first
+    caller runs it, later callers wait and receive its result (or its exception). Nothing is
+    kept once the call finishes, so pair it with a cache for the result.
+    """
+
+    def __init__(self):
+        self._calls = {} # key -> _InFlightCall
+        self._lock = threading.Lock()
+
+    def is_in_flight(self, key):
+        with self._lock:
+            return key in self._calls
+
+    def do(self, key, fn):
+        """Returns fn() for the first caller with key, or waits for that caller's result."""
+        with self._lock:
+            call = self._calls.get(key)
+            is_leader = call is None
+            if is_leader:
+                call = self._calls[key] = _InFlightCall()
+        if not is_leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+
+def content_fingerprint(data):
+    """Stable digest of a JSON-like value, for keying artifacts derived from generated content."""
+    return hashlib.sha256(json.dumps(data, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+_redis_client = None
+
+
+def _shared_backend():
+    """The Redis client when CACHE_BACKEND_URL is set, else None."""
+    global _redis_client
+    if CACHE_BACKEND_URL and _redis_client is None:
+        from backend.redis_backend import connect
+        _redis_client = connect(CACHE_BACKEND_URL)
+    return _redis_client
+
+
+# The in-process artifact caches share this budget; Redis' maxmemory policy bounds a shared backend instead
+cache_budget = MemoryBudget(CACHE_MEMORY_BUDGET_MB * 2**20, CACHE_EVICTION_POLICY)
+_named_caches = {} # name -> cache, for cache_stats
+
+
+def make_cache(name, ttl_seconds, max_entries=1024, stale_ttl_seconds=0):
+    """
+    A compressed TTLCache within cache_budget, or a Redis-backed one shared by every replica
+    when CACHE_BACKEND_URL is set.
+    """
+    client = _shared_backend()
+    if client is not None:
+        from backend.redis_backend import RedisTTLCache
+        cache = RedisTTLCache(client, CACHE_KEY_PREFIX, name, ttl_seconds, max_entries, stale_ttl_seconds)
+    else:
+        cache = TTLCache(ttl_seconds, max_entries, stale_ttl_seconds, name=name, budget=cache_budget)
+    _named_caches[name] = cache
+    return cache
+
+
+def cache_stats():
+    """{cache name: stats} for every cache built by make_cache."""
+    return {name: cache.stats() for name, cache in _named_caches.items()}
+
+
+def _make_single_flight():
+    client = _shared_backend()
+    if client is not None:
+        from backend.redis_backend import RedisSingleFlight
+        return RedisSingleFlight(client, CACHE_KEY_PREFIX, SingleFlight(), CACHE_LOCK_TIMEOUT_SECONDS)
+    return SingleFlight()
+
+
+# Trivia depends only on month-day, difficulty and topic, so one generation serves every user that day.
+trivia_cache = make_cache('trivia', ttl_seconds=24 * 60 * 60, max_entries=2048)
+
+# Daily content depends only on the date and content preferences, not on who asks for it.
+daily_content_cache = make_cache('daily_content', CACHE_FRESHNESS['daily_content'][0], max_entries=512, stale_ttl_seconds=CACHE_FRESHNESS['daily_content'][1])
+translation_cache = make_cache('translation', CACHE_FRESHNESS['translation'][0], max_entries=20000, stale_ttl_seconds=CACHE_FRESHNESS['translation'][1])
+pdf_cache = make_cache('pdf', CACHE_FRESHNESS['pdf'][0], max_entries=256, stale_ttl_seconds=CACHE_FRESHNESS['pdf'][1])
+
+# Local history depends only on the canonical locality (see backend/localities.py), not the date.
+local_history_cache = make_cache('local_history', CACHE_FRESHNESS['local_history'][0], max_entries=2048, stale_ttl_seconds=CACHE_FRESHNESS['local_history'][1])
+
+# The leaderboard's Sheets read, shared by every session; log_trivia_score clears it.
+leaderboard_cache = make_cache('leaderboard', LEADERBOARD_CACHE_SECONDS, max_entries=1)
+
+# One in-flight OpenAI generation per content key, however many sessions (or replicas) miss the cache at once
+generation_flights = _make_single_flight()
+
+
+def get_or_refresh(cache, key, compute, should_store=None):
+    """
+    Stale-while-revalidate read. A fresh value is returned as is; a stale one is returned
+    immediately while a background thread recomputes it; a miss computes it now. Both paths
+    go through generation_flights, so a key is only ever computed once at a time. A failed
+    background refresh keeps the stale value until its stale window runs out. Computed
+    values for which should_store returns False are returned but not cached.
+    """
+    flight_key = (cache.name or id(cache), key)
+
+    def compute_and_store():
+        value = compute()
+        if should_store is None or should_store(value):
+            cache.set(key, value)
+        return value
+
+    entry = cache.get_entry(key)
+    if entry is None:
+        return generation_flights.do(flight_key, compute_and_store)
+    value, is_fresh = entry
+    if not is_fresh and not generation_flights.is_in_flight(flight_key):
+        # The refresh's model calls are attributed to the helper that found the value stale
+        context = contextvars.copy_context()
+        threading.Thread(target=context.run, args=(_refresh, flight_key, compute_and_store), daemon=True).start()
+    return value
+
+
+def _refresh(flight_key, compute_and_store):
+    try:
+        with request_priority(BATCH): # Someone is already being served the stale value
+            generation_flights.do(flight_key, compute_and_store)
+    except Exception as e:
+        print(f"ERROR: Background cache refresh failed: {e}") # Log to console for debugging
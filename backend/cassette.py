@@ -0,0 +1,101 @@
+"""
+Record/replay of model responses ("cassettes").
+
+With OPENAI_CASSETTE_MODE set, clients.chat_completion consults a cassette, a JSON-lines
+file of recorded prompt/reply pairs at OPENAI_CASSETTE_PATH:
+
+- record: every call goes to OpenAI as usual and its reply is appended to the cassette.
+- replay: replies come only from the cassette. A prompt that was never recorded raises
+  CassetteMissError, which callers handle like any other API error, so nothing is sent.
+- auto:   replay what was recorded, call OpenAI and record whatever was not.
+
+Requests are matched on the model and the prompt with its whitespace collapsed. When the
+same request was recorded several times, replay hands back the recordings in order and then
+starts over, so a run over the same pages returns the same replies every time. Replayed
+calls skip the circuit breaker, the rate limiter and the network, so the page, PDF and
+weekly planner pipelines can be run and profiled offline at full speed; they are not
+counted as model calls.
+"""
+import hashlib
+import json
+import os
+import threading
+from collections import defaultdict
+
+from backend.config import OPENAI_CASSETTE_MODE, OPENAI_CASSETTE_PATH
+
+MODES = ('record', 'replay', 'auto')
+
+
+class CassetteMissError(Exception):
+    """Raised in replay mode for a request the cassette has no recording of."""
+
+
+def normalize_prompt(prompt):
+    return " ".join(prompt.split())
+
+
+def request_key(model, prompt):
+    return hashlib.sha256(f"{model}\n{normalize_prompt(prompt)}".encode('utf-8')).hexdigest()
+
+
+class Cassette:
+    """The recorded replies of one cassette file, loaded on first use."""
+
+    def __init__(self, mode, path):
+        if mode and mode not in MODES:
+            raise ValueError(f"Unknown cassette mode {mode!r}; expected one of {', '.join(MODES)}")
+        self.mode = mode
+        self.path = path
+        self._replies = None # {request key: [reply, ...]}, in recording order
+        self._next_reply = defaultdict(int)
+        self._lock = threading.Lock()
+
+    @property
+    def replays(self):
+        return self.mode in ('replay', 'auto')
+
+    @property
+    def records(self):
+        return self.mode in ('record', 'auto')
+
+    def _load(self):
+        self._replies = defaultdict(list)
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, encoding='utf-8') as cassette_file:
+            for line in cassette_file:
+                if line.strip():
+                    entry = json.loads(line)
+                    self._replies[entry['key']].append(entry['reply'])
+
+    def lookup(self, model, prompt):
+        """The next recorded reply for this request, or None if there is none."""
+        key = request_key(model, prompt)
+        with self._lock:
+            if self._replies is None:
+                self._load()
+            replies = self._replies.get(key)
+            if not replies:
+                return None
+            index = self._next_reply[key] % len(replies)
+            self._next_reply[key] += 1
+            return replies[index]
+
+    def record(self, model, prompt, reply):
+        """Appends a reply to the cassette file."""
+        key = request_key(model, prompt)
+        entry = {'key': key, 'model': model, 'prompt': prompt, 'reply': reply}
+        with self._lock:
+            if self._replies is None:
+                self._load()
+            self._replies[key].append(reply)
+            try:
+                os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+                with open(self.path, 'a', encoding='utf-8') as cassette_file:
+                    cassette_file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            except OSError as e:
+                print(f"ERROR: Could not write to cassette {self.path}: {e}") # Log to console for debugging
+
+
+openai_cassette = Cassette(OPENAI_CASSETTE_MODE, OPENAI_CASSETTE_PATH)
@@ -0,0 +1,101 @@
+"""Process-wide OpenAI and Google Sheets clients.
+
+Both clients are built once per server process and shared by every session and rerun.
+A single OpenAI client keeps one pooled, keep-alive HTTP connection pool instead of a
+fresh TLS handshake per session; the gspread client owns one authorized session that
+refreshes its OAuth token on its own when it expires.
+"""
+import json
+import time
+
+import gspread
+import streamlit as st
+from oauth2client.service_account import ServiceAccountCredentials
+from openai import OpenAI
+
+from backend.breaker import openai_breaker
+from backend.cassette import CassetteMissError, openai_cassette
+from backend.config import AI_MODEL, GOOGLE_SCOPES, SPREADSHEET_KEY
+from backend.metrics import record_model_call
+from backend.profiling import in_phase
+from backend.ratelimit import openai_limiter
+
+
+def check_secrets():
+    """Stops the script with an error if a required secret is missing."""
+    for secret_name in ("OPENAI_API_KEY", "GOOGLE_SERVICE_JSON"):
+        if secret_name == "OPENAI_API_KEY" and openai_cassette.mode == 'replay':
+            continue # Replay never reaches OpenAI
+        if secret_name not in st.secrets:
+            st.error(f"❌ {secret_name} is missing from Streamlit secrets.")
+            st.stop()
+
+
+@st.cache_resource(show_spinner=False)
+def get_openai_client():
+    """Returns the process-wide OpenAI client."""
+    return OpenAI(api_key=st.secrets["OPENAI_API_KEY"], max_retries=2, timeout=60.0)
+
+
+@in_phase('ai')
+def chat_completion(prompt, max_tokens=None, temperature=None, timeout=None, max_retries=None):
+    """
+    Sends a single user prompt to AI_MODEL and returns the reply text, stripped. Every model
+    call goes through here: it fails fast with CircuitOpenError while the circuit breaker is
+    open, then waits its turn in the shared rate limiter at the priority set by
+    backend.ratelimit.request_priority. Raises on API errors.
+
+    With a cassette mode set (see backend/cassette.py), recorded replies are returned
+    without calling the model, and live replies are recorded.
+    """
+    if openai_cassette.replays:
+        reply = openai_cassette.lookup(AI_MODEL, prompt)
+        if reply is not None:
+            return reply
+        if openai_cassette.mode == 'replay':
+            raise CassetteMissError(f"No recorded reply in {openai_cassette.path} for this prompt: {prompt[:80]!r}")
+
+    options = {key: value for key, value in (('timeout', timeout), ('max_retries', max_retries)) if value is not None}
+    client = get_openai_client().with_options(**options) if options else get_openai_client()
+    params = {key: value for key, value in (('max_tokens', max_tokens), ('temperature', temperature)) if value is not None}
+
+    estimated_tokens = len(prompt) // 4 + (max_tokens or 1000) # ~4 characters per token, plus the reply
+    openai_breaker.before_call()
+    response, error, started = None, None, None
+    try:
+        openai_limiter.acquire(estimated_tokens)
+        started = time.monotonic() # Time spent queued in the limiter is not the service's latency
+        response = client.chat.completions.create(
+            model=AI_MODEL,
+            messages=[{"role": "user", "content": prompt}],
+            **params
+        )
+    except Exception as e:
+        error = e
+        raise
+    finally:
+        elapsed = time.monotonic() - started if started is not None else 0.0
+        openai_breaker.record_result(elapsed, error)
+        if started is not None:
+            usage = response.usage if response is not None else None
+            # A failed call still used a request; only a successful one reports its real token count
+            openai_limiter.record_usage(estimated_tokens, usage.total_tokens if usage else estimated_tokens)
+            record_model_call(elapsed, usage.prompt_tokens if usage else 0, usage.completion_tokens if usage else 0, error)
+    reply = response.choices[0].message.content.strip()
+    if openai_cassette.records:
+        openai_cassette.record(AI_MODEL, prompt, reply)
+    return reply
+
+
+@st.cache_resource(show_spinner=False)
+def get_gspread_client():
+    """Returns the process-wide gspread client (authorized once, token refresh handled by its session)."""
+    service_account_info = json.loads(st.secrets["GOOGLE_SERVICE_JSON"])
+    creds = ServiceAccountCredentials.from_json_keyfile_dict(service_account_info, GOOGLE_SCOPES)
+    return gspread.authorize(creds)
+
+
+@st.cache_resource(show_spinner=False)
+def get_spreadsheet():
+    """Returns the shared handle to the app's spreadsheet, so each helper skips the open_by_key round trip."""
+    return get_gspread_client().open_by_key(SPREADSHEET_KEY)
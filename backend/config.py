@@ -0,0 +1,135 @@
+"""Constants shared by the backend and the UI."""
+import os
+
+SPREADSHEET_KEY = "15LXglm49XBJBzeavaHvhgQn3SakqLGeRV80PxPHQfZ4"
+GOOGLE_SCOPES = ['https://www.googleapis.com/auth/spreadsheets', 'https://www.googleapis.com/auth/drive']
+
+AI_MODEL = "gpt-3.5-turbo" # You might consider "gpt-4" for better quality if budget allows
+
+LOGO_URL = "https://i.postimg.cc/8CRsCGCC/Chat-GPT-Image-Jun-7-2025-12-32-18-AM.png"
+
+LANGUAGES = ["English", "Spanish", "French", "German", "Italian", "Portuguese"]
+TOPICS = ["None", "Sports", "Music", "Inventions", "Politics", "Science", "Arts"]
+DECADES = ["None", "1800s", "1900s", "1910s", "1920s", "1930s", "1940s", "1950s", "1960s", "1970s", "1980s"]
+DIFFICULTIES = ["Easy", "Medium", "Hard"]
+
+# Initial dummy data structure for the daily content if no fetch has occurred or failed
+INITIAL_EMPTY_DATA = {
+    'event_article': "No historical event data available. Please try again.",
+    'born_article': "No birth data available. Please try again.",
+    'fun_fact_section': "No fun fact available. Please try again.",
+    'trivia_section': [],
+    'did_you_know_section': ["No 'Did You Know?' facts available. Please try again."],
+    'memory_prompt_section': ["No memory prompts available.", "Consider your favorite childhood memory.", "What's a happy moment from your past week?"],
+    'local_history_section': "No local history data available. Please try again."
+}
+
+# When set, a trivia cache miss generates all three difficulties for the date in one call,
+# so switching difficulty afterwards is served from cache.
+PREGENERATE_ALL_TRIVIA_DIFFICULTIES = os.environ.get("PREGENERATE_ALL_TRIVIA_DIFFICULTIES", "").lower() in ("1", "true", "yes")
+
+# Local data files (SQLite databases built by the offline jobs in scripts/)
+DATA_DIR = os.environ.get("TDIH_DATA_DIR", os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data"))
+TRIVIA_BANK_PATH = os.environ.get("TRIVIA_BANK_PATH", os.path.join(DATA_DIR, "trivia_bank.sqlite3"))
+KNOWLEDGE_BASE_PATH = os.environ.get("KNOWLEDGE_BASE_PATH", os.path.join(DATA_DIR, "on_this_day.sqlite3"))
+
+# Local history facts are generated this many at a time per locality, and the daily content
+# shows one of them per day, so a locality costs one model call for weeks of pages
+LOCAL_HISTORY_POOL_SIZE = int(os.environ.get("LOCAL_HISTORY_POOL_SIZE", "10"))
+
+# With local facts to fall back on, don't let a slow daily-content completion hold the page
+DAILY_CONTENT_TIMEOUT_SECONDS = float(os.environ.get("DAILY_CONTENT_TIMEOUT_SECONDS", "45"))
+
+# Stale-while-revalidate windows per cached artifact type, in seconds: (fresh for, then served
+# stale while a background refresh runs for). Override with e.g. PDF_FRESH_SECONDS / PDF_STALE_SECONDS.
+CACHE_FRESHNESS = {
+    artifact: (int(os.environ.get(f"{artifact.upper()}_FRESH_SECONDS", fresh)), int(os.environ.get(f"{artifact.upper()}_STALE_SECONDS", stale)))
+    for artifact, fresh, stale in (
+        ('daily_content', 24 * 60 * 60, 7 * 24 * 60 * 60),
+        ('translation', 7 * 24 * 60 * 60, 30 * 24 * 60 * 60),
+        ('pdf', 24 * 60 * 60, 7 * 24 * 60 * 60),
+        ('local_history', 30 * 24 * 60 * 60, 90 * 24 * 60 * 60),
+    )
+}
+
+# Process-wide OpenAI budget shared by every session (see backend/ratelimit.py); set these to
+# the account's limits for AI_MODEL, leaving some headroom for other users of the key.
+OPENAI_REQUESTS_PER_MINUTE = int(os.environ.get("OPENAI_REQUESTS_PER_MINUTE", "500"))
+OPENAI_TOKENS_PER_MINUTE = int(os.environ.get("OPENAI_TOKENS_PER_MINUTE", "160000"))
+
+# Circuit breaker around OpenAI (see backend/breaker.py): after this many consecutive failed
+# or slow calls, fail fast for the cooldown, then let one probe call through.
+OPENAI_BREAKER_FAILURE_THRESHOLD = int(os.environ.get("OPENAI_BREAKER_FAILURE_THRESHOLD", "3"))
+OPENAI_BREAKER_SLOW_CALL_SECONDS = float(os.environ.get("OPENAI_BREAKER_SLOW_CALL_SECONDS", "30"))
+OPENAI_BREAKER_COOLDOWN_SECONDS = float(os.environ.get("OPENAI_BREAKER_COOLDOWN_SECONDS", "60"))
+
+# Optional JSON-lines file that every OpenAI call is appended to (see backend/metrics.py)
+OPENAI_CALL_LOG_PATH = os.environ.get("OPENAI_CALL_LOG_PATH", "")
+
+# Usernames that can open the admin page (comma-separated)
+ADMIN_USERNAMES = {name.strip() for name in os.environ.get("ADMIN_USERNAMES", "").split(",") if name.strip()}
+
+# Opt-in per-rerun profiling (see backend/profiling.py); can also be switched on from the admin page
+PROFILE_RERUNS = os.environ.get("PROFILE_RERUNS", "").lower() in ("1", "true", "yes")
+PROFILE_SLOW_RERUN_SECONDS = float(os.environ.get("PROFILE_SLOW_RERUN_SECONDS", "5"))
+PROFILE_SAMPLE_INTERVAL_SECONDS = float(os.environ.get("PROFILE_SAMPLE_INTERVAL_SECONDS", "0.005"))
+PROFILE_DIR = os.environ.get("PROFILE_DIR", os.path.join(DATA_DIR, "profiles"))
+
+# Record/replay of model responses for offline development and CI (see backend/cassette.py):
+# "record", "replay" or "auto"; empty means every call goes to OpenAI.
+OPENAI_CASSETTE_MODE = os.environ.get("OPENAI_CASSETTE_MODE", "").lower()
+OPENAI_CASSETTE_PATH = os.environ.get("OPENAI_CASSETTE_PATH", os.path.join(DATA_DIR, "cassettes", "openai.jsonl"))
+
+# TrueType fonts for PDFs whose content doesn't fit the Latin-1 core fonts (see backend/text.py),
+# embedded as a subset of the glyphs used. Bold and italic fall back to the regular font.
+PDF_UNICODE_FONT_PATHS = {
+    '': os.environ.get("PDF_UNICODE_FONT_PATH", "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf"),
+    'B': os.environ.get("PDF_UNICODE_FONT_BOLD_PATH", "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf"),
+    'I': os.environ.get("PDF_UNICODE_FONT_ITALIC_PATH", "/usr/share/fonts/truetype/dejavu/DejaVuSans-Oblique.ttf"),
+}
+PDF_FONT_CACHE_DIR = os.environ.get("PDF_FONT_CACHE_DIR", os.path.join(DATA_DIR, "font_cache"))
+
+# Per-user trivia progress (see backend/progress.py) is written to Sheets in batches this often
+TRIVIA_PROGRESS_FLUSH_SECONDS = float(os.environ.get("TRIVIA_PROGRESS_FLUSH_SECONDS", "5"))
+
+# The trivia leaderboard is read from Sheets at most this often; logging a score refreshes it
+LEADERBOARD_CACHE_SECONDS = int(os.environ.get("LEADERBOARD_CACHE_SECONDS", "60"))
+
+# In-process caches (see backend/cache.py): total memory for the cached daily content,
+# translations, trivia, PDFs and trivia progress, which policy picks what to evict past it
+# ("lru" or "lfu"), and the smallest value worth compressing, in bytes
+CACHE_MEMORY_BUDGET_MB = float(os.environ.get("CACHE_MEMORY_BUDGET_MB", "256"))
+CACHE_EVICTION_POLICY = os.environ.get("CACHE_EVICTION_POLICY", "lru").lower()
+CACHE_COMPRESS_MIN_BYTES = int(os.environ.get("CACHE_COMPRESS_MIN_BYTES", "512"))
+
+# Shared cache for several replicas (see backend/redis_backend.py): a Redis URL such as
+# "redis://cache-host:6379/0", or "fakeredis://" for an in-process stand-in. Empty keeps every
+# cache in this process. Generation locks are renewed while their generation runs and expire
+# CACHE_LOCK_TIMEOUT_SECONDS after the last renewal, in case a replica dies holding one.
+CACHE_BACKEND_URL = os.environ.get("CACHE_BACKEND_URL", "")
+CACHE_KEY_PREFIX = os.environ.get("CACHE_KEY_PREFIX", "tdih:")
+CACHE_LOCK_TIMEOUT_SECONDS = float(os.environ.get("CACHE_LOCK_TIMEOUT_SECONDS", "120"))
+
+# Content referenced from session state (see backend/content_store.py): dropped after this long
+# unused, or when the store is full
+CONTENT_STORE_TTL_SECONDS = int(os.environ.get("CONTENT_STORE_TTL_SECONDS", str(2 * 24 * 60 * 60)))
+CONTENT_STORE_MAX_ENTRIES = int(os.environ.get("CONTENT_STORE_MAX_ENTRIES", "5000"))
+
+# Speculative prefetch after the main page is served (see backend/prefetch.py): content for the
+# days either side of the selected date, and the selected day in the facility's languages
+PREFETCH_ENABLED = os.environ.get("PREFETCH_ENABLED", "").lower() in ("1", "true", "yes")
+PREFETCH_LANGUAGES = [language.strip() for language in os.environ.get("PREFETCH_LANGUAGES", "").split(",") if language.strip() in LANGUAGES]
+PREFETCH_ADJACENT_DAYS = int(os.environ.get("PREFETCH_ADJACENT_DAYS", "1"))
+PREFETCH_DEDUP_SECONDS = float(os.environ.get("PREFETCH_DEDUP_SECONDS", "600"))
+PREFETCH_QUEUE_SIZE = int(os.environ.get("PREFETCH_QUEUE_SIZE", "200"))
+
+# Bulk export of a date range to one ZIP (see backend/export.py): days processed at once, the
+# longest range the planner page offers, where archives are written and how long they are kept
+EXPORT_WORKERS = int(os.environ.get("EXPORT_WORKERS", "4"))
+EXPORT_MAX_DAYS = int(os.environ.get("EXPORT_MAX_DAYS", "92"))
+EXPORT_DIR = os.environ.get("EXPORT_DIR", os.path.join(DATA_DIR, "exports"))
+EXPORT_RETENTION_SECONDS = int(os.environ.get("EXPORT_RETENTION_SECONDS", str(7 * 24 * 60 * 60)))
+
+# Worker processes that lay out PDFs for batch jobs (see backend/render_pool.py); by default
+# one per core beyond the one serving pages, and 0 lays them out in the calling thread
+PDF_RENDER_PROCESSES = int(os.environ.get("PDF_RENDER_PROCESSES", str(max((os.cpu_count() or 1) - 1, 0))))
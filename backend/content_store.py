@@ -0,0 +1,55 @@
+"""
+Shared, immutable content that session state refers to by key.
+
+Sessions viewing the same day used to each hold the daily content, its translation, the
+trivia questions and the trivia explanations in session state, so memory grew with every
+concurrent user even when they all looked at identical content. Now content is put in the
+process-wide content_store once and sessions keep only its key, a digest of the content:
+identical content put by any number of sessions is stored once.
+
+Stored values are shared by every session and must not be modified; lists are stored as
+tuples so an accidental in-place change fails loudly. An entry unused for
+CONTENT_STORE_TTL_SECONDS, or pushed out by newer ones, is dropped, and get returns None
+for it: callers fetch or restore the content again, as they would for a new session.
+A session stays on one replica, so unlike the caches this store is never shared via Redis.
+"""
+from backend.cache import TTLCache, content_fingerprint
+from backend.config import CONTENT_STORE_MAX_ENTRIES, CONTENT_STORE_TTL_SECONDS
+from backend.memory import deep_sizeof
+
+
+def _freeze(value):
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(item) for item in value)
+    if isinstance(value, dict):
+        return {key: _freeze(item) for key, item in value.items()}
+    return value
+
+
+class ContentStore:
+    def __init__(self, ttl_seconds, max_entries):
+        self._entries = TTLCache(ttl_seconds, max_entries=max_entries) # content key -> frozen content
+
+    def put(self, value):
+        """Stores value, unless identical content is already stored, and returns its key."""
+        key = content_fingerprint(value)
+        if self._entries.get(key) is None: # Also marks an existing entry as recently used
+            self._entries.set(key, _freeze(value))
+        return key
+
+    def get(self, key):
+        """The content stored under key, or None if there is no key or it has been dropped."""
+        if key is None:
+            return None
+        value = self._entries.get(key)
+        if value is not None:
+            self._entries.set(key, value) # Content a session still shows stays fresh
+        return value
+
+    def stats(self):
+        """Entries and total bytes held, for comparing with per-session state."""
+        values = self._entries.values()
+        return {'entries': len(values), 'bytes': deep_sizeof(values)}
+
+
+content_store = ContentStore(CONTENT_STORE_TTL_SECONDS, CONTENT_STORE_MAX_ENTRIES)
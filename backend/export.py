@@ -0,0 +1,192 @@
+"""
+Bulk export: one 'This Day in History' PDF per day of a date range, bundled in one ZIP.
+
+This generalizes the weekly planner's seven days to a month or a quarter. Days are
+processed EXPORT_WORKERS at a time on a thread pool, so while one day's content is being
+generated others are being translated and rendered. Every model call runs at the rate
+limiter's BATCH priority so page loads go first, and PDFs are laid out in the worker
+processes of backend/render_pool.py so rendering uses every core. Each PDF is written to
+its own file in the archive's day directory (the archive's path plus ".days") as soon as
+it is ready, and the ZIP is built once, when the export ends, from every day in that
+directory: disk I/O grows with the number of days, not its square. Every file is written
+under a temporary name and renamed into place, so exports of the same range running at once,
+in one process or several, never see each other's half-written files, and whichever builds
+the archive last includes every day either of them finished.
+
+Exports resume. The archive's path is derived from the range and every setting printed on
+the pages, so running the same export again (after a failure, a closed tab or a server
+restart) skips the days already in its day directory or archive; days whose content or PDF
+is still cached cost no model calls either. A day whose content could not be generated is
+left out, and the next run retries it. Archives and day directories untouched for
+EXPORT_RETENTION_SECONDS are deleted when an export starts, except those an export in this
+process is still writing.
+"""
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import timedelta
+
+from backend.ai import fetch_daily_content
+from backend.config import EXPORT_DIR, EXPORT_RETENTION_SECONDS, EXPORT_WORKERS
+from backend.pdf import get_history_pdf
+from backend.ratelimit import BATCH, request_priority
+
+
+_active_exports = {} # archive path -> exports in this process writing it
+_registry_lock = threading.Lock()
+
+
+def day_file_name(day):
+    """The PDF's name inside the archive, as the weekly planner has always named it."""
+    return f"This_Day_in_History_{day.strftime('%Y-%m-%d')}.pdf"
+
+
+def archive_path(start_date, end_date, user_info, current_language, custom_masthead_text=None, **preferences):
+    """Where the export with these settings is (or will be) written; the same settings give the same path."""
+    settings = [user_info['name'], current_language, custom_masthead_text or '', sorted(preferences.items())]
+    digest = hashlib.sha256(json.dumps(settings, default=str).encode('utf-8')).hexdigest()[:16]
+    return os.path.join(EXPORT_DIR, f"This_Day_in_History_{start_date:%Y-%m-%d}_to_{end_date:%Y-%m-%d}_{digest}.zip")
+
+
+def _days_dir(path):
+    return f"{path}.days"
+
+
+def _archived_names(path):
+    """File names in the archive at path; a missing or unreadable archive has none."""
+    if not os.path.exists(path):
+        return set()
+    try:
+        with zipfile.ZipFile(path) as archive:
+            return set(archive.namelist())
+    except zipfile.BadZipFile as e:
+        print(f"ERROR: Export archive {path} is damaged, rebuilding it: {e}") # Log to console for debugging
+        return set()
+
+
+def _remove_old_exports():
+    if not os.path.isdir(EXPORT_DIR):
+        return
+    cutoff = time.time() - EXPORT_RETENTION_SECONDS
+    for name in os.listdir(EXPORT_DIR):
+        path = os.path.join(EXPORT_DIR, name)
+        with _registry_lock:
+            in_use = any(path.startswith(active) for active in _active_exports) # The archive, its day directory or a temporary file
+        if in_use or not name.endswith(('.zip', '.tmp', '.days')) or os.path.getmtime(path) >= cutoff:
+            continue
+        if os.path.isdir(path):
+            shutil.rmtree(path, ignore_errors=True)
+        else:
+            os.remove(path)
+
+
+def _write_atomically(path, write):
+    """Calls write(file) on a temporary file next to path, then renames it to path in one step."""
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path) or '.', prefix=os.path.basename(path) + '.', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as temp_file:
+            write(temp_file)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+
+def _save_day(path, name, pdf_bytes):
+    _write_atomically(os.path.join(_days_dir(path), name), lambda day_file: day_file.write(pdf_bytes))
+
+
+def _saved_day_names(path):
+    return {name for name in os.listdir(_days_dir(path)) if name.endswith('.pdf')}
+
+
+def _build_archive(path):
+    """Writes the archive at path from the day directory, keeping days only the old archive has (if its directory was pruned)."""
+    day_names = _saved_day_names(path)
+
+    def write(archive_file):
+        with zipfile.ZipFile(archive_file, 'w', zipfile.ZIP_DEFLATED) as archive:
+            for name in sorted(day_names):
+                archive.write(os.path.join(_days_dir(path), name), name)
+            if os.path.exists(path):
+                try:
+                    with zipfile.ZipFile(path) as old_archive:
+                        for name in sorted(set(old_archive.namelist()) - day_names):
+                            archive.writestr(name, old_archive.read(name))
+                except zipfile.BadZipFile:
+                    pass # Reported by _archived_names; its days are being exported again
+
+    _write_atomically(path, write)
+
+
+def _render_day(day, user_info, current_language, custom_masthead_text, preferences):
+    """One day's PDF bytes; runs on a worker thread, so it sets its own priority."""
+    with request_priority(BATCH):
+        content = fetch_daily_content(day.day, day.month, **preferences)
+        return get_history_pdf(content, day.strftime('%B %d, %Y'), user_info, current_language, custom_masthead_text, pooled=True)
+
+
+def export_date_range(path, start_date, end_date, user_info, current_language="English", custom_masthead_text=None,
+                      workers=EXPORT_WORKERS, **preferences):
+    """
+    Writes the PDF for every day from start_date to end_date (inclusive) into the ZIP at
+    path, yielding (day, outcome, error) as each day is settled: outcome is 'resumed' for a
+    day already exported, 'exported' or 'failed' (with the error). Days are yielded in the
+    order they finish; the archive is complete once the last one has been. preferences are
+    get_this_day_in_history_facts' content preferences (preferred_decade, topic,
+    difficulty, local_city, local_state_country).
+    """
+    os.makedirs(_days_dir(path), exist_ok=True)
+    with _registry_lock:
+        _active_exports[path] = _active_exports.get(path, 0) + 1
+    try:
+        _remove_old_exports()
+        archived = _archived_names(path)
+        exported = _saved_day_names(path) | archived
+        added = yield from _export_days(path, exported, start_date, end_date, user_info, current_language, custom_masthead_text, workers, preferences)
+        if added or not exported <= archived:
+            _build_archive(path)
+    finally:
+        with _registry_lock:
+            _active_exports[path] -= 1
+            if not _active_exports[path]:
+                del _active_exports[path]
+
+
+def _export_days(path, exported, start_date, end_date, user_info, current_language, custom_masthead_text, workers, preferences):
+    """Yields each day's outcome as it settles; returns how many days were added."""
+    days = [start_date + timedelta(days=offset) for offset in range((end_date - start_date).days + 1)]
+    added = 0
+    pending = []
+    for day in days:
+        if day_file_name(day) in exported:
+            yield day, 'resumed', None
+        else:
+            pending.append(day)
+
+    # Only a few days are in flight at once, so a quarter's PDFs are never all in memory
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix='export') as pool:
+        in_flight = {}
+        while pending or in_flight:
+            while pending and len(in_flight) < 2 * workers:
+                day = pending.pop(0)
+                in_flight[pool.submit(_render_day, day, user_info, current_language, custom_masthead_text, preferences)] = day
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                day = in_flight.pop(future)
+                try:
+                    pdf_bytes = future.result()
+                except Exception as e:
+                    print(f"ERROR: Export of {day} failed: {e}") # Log to console for debugging
+                    yield day, 'failed', e
+                    continue
+                _save_day(path, day_file_name(day), pdf_bytes)
+                added += 1
+                yield day, 'exported', None
+    return added
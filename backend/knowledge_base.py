@@ -0,0 +1,178 @@
+"""
+Local "on this day" knowledge base (SQLite): events and births indexed by month-day.
+
+Built offline by scripts/build_knowledge_base.py. get_this_day_in_history_facts consults it
+first: the facts it finds are handed to the model to write up (instead of relying on the
+model's recall), and if the model is slow or down, build_fallback_content turns them
+into a complete daily page without any API call.
+"""
+import os
+import re
+import sqlite3
+from datetime import date
+
+from backend.config import KNOWLEDGE_BASE_PATH
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS facts (
+    id INTEGER PRIMARY KEY,
+    month_day TEXT NOT NULL,        -- 'MM-DD'
+    year INTEGER NOT NULL,
+    category TEXT NOT NULL,         -- 'event' | 'birth'
+    topic TEXT NOT NULL DEFAULT '', -- one of config.TOPICS, '' if none matched
+    text TEXT NOT NULL,             -- one-line summary, e.g. "The Wright brothers make the first powered flight."
+    detail TEXT NOT NULL DEFAULT '' -- short background paragraph about the main subject
+);
+CREATE INDEX IF NOT EXISTS idx_facts_date ON facts (month_day, category, year);
+CREATE INDEX IF NOT EXISTS idx_facts_year ON facts (year);
+CREATE INDEX IF NOT EXISTS idx_facts_topic ON facts (month_day, category, topic);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_facts_unique ON facts (month_day, category, year, text);
+"""
+
+# Keyword tagging used at build time to map facts onto the app's topic options
+TOPIC_KEYWORDS = {
+    'Sports': ["olympic", "baseball", "football", "world series", "boxing", "championship", "tennis", "golf", "athlete", "league", "super bowl", "hockey", "race"],
+    'Music': ["music", "song", "singer", "album", "band", "composer", "opera", "symphony", "jazz", "concert", "record"],
+    'Inventions': ["patent", "invent", "invention", "telephone", "telegraph", "radio", "television", "airplane", "flight", "automobile", "engine", "computer"],
+    'Politics': ["president", "election", "congress", "senate", "parliament", "treaty", "war", "constitution", "prime minister", "king", "queen", "amendment"],
+    'Science': ["scientist", "discover", "physicist", "chemist", "astronomer", "space", "nasa", "satellite", "vaccine", "medicine", "theory", "element"],
+    'Arts': ["painter", "artist", "novel", "author", "poet", "film", "actor", "actress", "theatre", "theater", "museum", "broadway", "writer"],
+}
+
+EVENT_YEARS = (1800, 1960) # Matches the year ranges asked of the model
+BIRTH_YEARS = (1800, 1970)
+
+
+def tag_topic(text):
+    """Returns the first topic whose keywords appear in text, or ''."""
+    lowered = text.lower()
+    for topic, keywords in TOPIC_KEYWORDS.items():
+        if any(re.search(rf"\b{re.escape(keyword)}", lowered) for keyword in keywords):
+            return topic
+    return ''
+
+
+def decade_year_range(preferred_decade):
+    """Maps a decade option to an inclusive year range; '1800s' is the whole century, the rest ten years."""
+    if not preferred_decade or preferred_decade == "None":
+        return None
+    start = int(preferred_decade[:4])
+    return (start, start + 99) if start == 1800 else (start, start + 9)
+
+
+def connect(path=KNOWLEDGE_BASE_PATH, create=False):
+    """Opens the knowledge base. Returns None if it does not exist yet and create is False."""
+    if not create:
+        try:
+            return sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        except sqlite3.OperationalError:
+            return None
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def add_facts(conn, current_month, current_day, category, facts):
+    """Inserts fact dicts (year/text/detail), tagging topics and skipping ones already stored. Returns the number added."""
+    month_day = f"{current_month:02d}-{current_day:02d}"
+    rows = [(month_day, fact['year'], category, tag_topic(f"{fact['text']} {fact['detail']}"), fact['text'], fact['detail'])
+            for fact in facts]
+    with conn:
+        cursor = conn.executemany(
+            "INSERT OR IGNORE INTO facts (month_day, year, category, topic, text, detail) VALUES (?, ?, ?, ?, ?, ?)", rows)
+    return cursor.rowcount
+
+
+def _query(conn, month_day, category, year_range, topic, limit):
+    sql = "SELECT year, text, detail FROM facts WHERE month_day = ? AND category = ? AND year BETWEEN ? AND ?"
+    params = [month_day, category, *year_range]
+    if topic:
+        sql += " AND topic = ?"
+        params.append(topic)
+    sql += " ORDER BY length(detail) DESC, year LIMIT ?" # Facts with background make better articles
+    params.append(limit)
+    return [{'year': year, 'text': text, 'detail': detail} for year, text, detail in conn.execute(sql, params)]
+
+
+def lookup_facts(current_month, current_day, preferred_decade=None, topic=None, limit=5, path=KNOWLEDGE_BASE_PATH):
+    """
+    Returns {'events': [...], 'births': [...]} for the month-day, each fact a dict with
+    year/text/detail. Filters by decade and topic, dropping the topic (then the decade)
+    if nothing matches. Both lists are empty if the knowledge base is missing.
+    """
+    conn = connect(path)
+    if conn is None:
+        return {'events': [], 'births': []}
+    month_day = f"{current_month:02d}-{current_day:02d}"
+    decade_range = decade_year_range(preferred_decade)
+    try:
+        found = {}
+        for key, category, default_range in (('events', 'event', EVENT_YEARS), ('births', 'birth', BIRTH_YEARS)):
+            found[key] = []
+            key_topic = topic if key == 'events' else None # Births are rarely tagged; don't narrow them by topic
+            for year_range, topic_filter in ((decade_range, key_topic), (decade_range, None), (default_range, key_topic), (default_range, None)):
+                if year_range is None:
+                    continue
+                found[key] = _query(conn, month_day, category, year_range, topic_filter, limit)
+                if found[key]:
+                    break
+        return found
+    except sqlite3.Error as e:
+        print(f"ERROR: Could not read knowledge base: {e}") # Log to console for debugging
+        return {'events': [], 'births': []}
+    finally:
+        conn.close()
+
+
+def format_facts_for_prompt(facts):
+    """Renders looked-up facts as a compact list for the generation prompt."""
+    lines = []
+    for label, key in (("Events", 'events'), ("Births", 'births')):
+        if facts[key]:
+            lines.append(f"{label}:")
+            lines.extend(f"- {fact['year']}: {fact['text']}" + (f" ({fact['detail'][:300]})" if fact['detail'] else "") for fact in facts[key])
+    return "\n".join(lines)
+
+
+def build_fallback_content(current_month, current_day, facts):
+    """
+    Builds a complete daily-content dict from local facts alone, for when the model is
+    unavailable. Returns None if there are no events to build it from.
+    """
+    if not facts['events']:
+        return None
+    date_label = date(2024, current_month, current_day).strftime('%B %d') # Leap year so 02-29 formats
+    event = facts['events'][0]
+    event_article = f"On {date_label}, {event['year']}: {event['text']}"
+    if event['detail']:
+        event_article += f"\n\n{event['detail']}"
+
+    if facts['births']:
+        birth = facts['births'][0]
+        born_article = f"Born on {date_label}, {birth['year']}: {birth['text']}"
+        if birth['detail']:
+            born_article += f"\n\n{birth['detail']}"
+    else:
+        born_article = "No birth article found."
+
+    extra_events = facts['events'][1:]
+    fun_fact = f"In {extra_events[0]['year']}, on this day: {extra_events[0]['text']}" if extra_events else "No fun fact found."
+    trivia = [{
+        'question': f"On {date_label}, in what year did this happen: {fact['text'].rstrip('.')}?",
+        'answer': str(fact['year']),
+        'hint': f"It was in the {fact['year'] // 10 * 10}s."
+    } for fact in facts['events'][:5]]
+
+    return {
+        'event_article': event_article,
+        'born_article': born_article,
+        'fun_fact_section': fun_fact,
+        'trivia_section': trivia,
+        'did_you_know_section': [f"{fact['year']}: {fact['text']}" for fact in extra_events[1:4]] or
+                                ["No 'Did You Know?' facts available for today. Please try again or adjust preferences."],
+        'memory_prompt_section': ["Do you remember where you were when you heard big news?",
+                                  "What was your favorite childhood game?",
+                                  "What's a memorable school event from your youth?"],
+        'local_history_section': "Could not generate local history fact."
+    }
@@ -0,0 +1,131 @@
+"""
+Canonical form of the user's locality, so equivalent spellings share cached content.
+
+"austin, tx", "Austin , TX." and "Austin, Texas, USA" all name the same place;
+canonical_locality turns each into ('Austin', 'Texas'): whitespace is collapsed, case is
+normalized (short all-caps acronyms such as "BC" or "UK" are kept), and U.S. state and
+territory abbreviations, postal ("PA") or traditional ("Penn."), are expanded from the
+tables below, so "pittsburgh, pa" and "Pittsburgh, Pennsylvania" share a cache. A trailing
+"USA" is dropped. Some postal codes are also country codes (DE is Germany, CA Canada); one
+is read as the country only when the city says so, from a short table of well-known cities
+of those countries, so "Berlin, DE" stays German. Anything else (a foreign region or
+country, or several parts without "USA") is kept as typed, only tidied, so it still names
+one place.
+"""
+import re
+
+# U.S. Postal Service abbreviations for the states, D.C. and the inhabited territories
+US_STATE_ABBREVIATIONS = {
+    'AL': "Alabama", 'AK': "Alaska", 'AZ': "Arizona", 'AR': "Arkansas", 'CA': "California",
+    'CO': "Colorado", 'CT': "Connecticut", 'DE': "Delaware", 'FL': "Florida", 'GA': "Georgia",
+    'HI': "Hawaii", 'ID': "Idaho", 'IL': "Illinois", 'IN': "Indiana", 'IA': "Iowa",
+    'KS': "Kansas", 'KY': "Kentucky", 'LA': "Louisiana", 'ME': "Maine", 'MD': "Maryland",
+    'MA': "Massachusetts", 'MI': "Michigan", 'MN': "Minnesota", 'MS': "Mississippi", 'MO': "Missouri",
+    'MT': "Montana", 'NE': "Nebraska", 'NV': "Nevada", 'NH': "New Hampshire", 'NJ': "New Jersey",
+    'NM': "New Mexico", 'NY': "New York", 'NC': "North Carolina", 'ND': "North Dakota", 'OH': "Ohio",
+    'OK': "Oklahoma", 'OR': "Oregon", 'PA': "Pennsylvania", 'RI': "Rhode Island", 'SC': "South Carolina",
+    'SD': "South Dakota", 'TN': "Tennessee", 'TX': "Texas", 'UT': "Utah", 'VT': "Vermont",
+    'VA': "Virginia", 'WA': "Washington", 'WV': "West Virginia", 'WI': "Wisconsin", 'WY': "Wyoming",
+    'DC': "District of Columbia", 'PR': "Puerto Rico", 'GU': "Guam", 'VI': "U.S. Virgin Islands",
+    'AS': "American Samoa", 'MP': "Northern Mariana Islands",
+}
+
+_STATE_NAMES = {name.lower(): name for name in US_STATE_ABBREVIATIONS.values()}
+_STATE_NAMES.update({'washington dc': "District of Columbia", 'washington d.c.': "District of Columbia", 'd.c.': "District of Columbia"})
+_US_NAMES = {'us', 'usa', 'u.s', 'u.s.a', 'united states', 'united states of america', 'america'}
+
+# Traditional (AP style and older) abbreviations, without their dots
+_TRADITIONAL_ABBREVIATIONS = {
+    'ala': 'AL', 'ariz': 'AZ', 'ark': 'AR', 'calif': 'CA', 'cal': 'CA', 'colo': 'CO', 'conn': 'CT',
+    'del': 'DE', 'fla': 'FL', 'ill': 'IL', 'ind': 'IN', 'kan': 'KS', 'kans': 'KS', 'mass': 'MA',
+    'mich': 'MI', 'minn': 'MN', 'miss': 'MS', 'mont': 'MT', 'neb': 'NE', 'nebr': 'NE', 'nev': 'NV',
+    'okla': 'OK', 'ore': 'OR', 'oreg': 'OR', 'penn': 'PA', 'penna': 'PA', 'tenn': 'TN', 'tex': 'TX',
+    'wash': 'WA', 'wva': 'WV', 'wis': 'WI', 'wisc': 'WI', 'wyo': 'WY',
+}
+
+# Postal codes that are also ISO 3166-1 country codes -> well-known cities of that country,
+# the only places where the code is read as the country
+_FOREIGN_CITIES = {
+    'AL': {'tirana'},
+    'AR': {'buenos aires', 'cordoba', 'córdoba', 'rosario', 'mendoza'},
+    'CA': {'toronto', 'montreal', 'montréal', 'vancouver', 'ottawa', 'calgary', 'edmonton', 'winnipeg',
+           'quebec', 'quebec city', 'halifax', 'victoria'},
+    'CO': {'bogota', 'bogotá', 'medellin', 'medellín', 'cali', 'cartagena', 'barranquilla'},
+    'DE': {'berlin', 'munich', 'münchen', 'hamburg', 'frankfurt', 'cologne', 'köln', 'stuttgart',
+           'düsseldorf', 'dusseldorf', 'dresden', 'leipzig', 'bonn', 'nuremberg'},
+    'ID': {'jakarta', 'surabaya', 'bandung', 'denpasar'},
+    'IL': {'jerusalem', 'tel aviv', 'haifa'},
+    'IN': {'mumbai', 'bombay', 'delhi', 'new delhi', 'bangalore', 'bengaluru', 'chennai', 'madras',
+           'kolkata', 'calcutta', 'hyderabad', 'pune', 'ahmedabad', 'jaipur'},
+    'LA': {'vientiane', 'luang prabang'},
+    'MA': {'casablanca', 'rabat', 'marrakesh', 'marrakech', 'fez', 'fes', 'tangier'},
+    'MD': {'chisinau', 'chișinău'},
+    'ME': {'podgorica'},
+    'MN': {'ulaanbaatar', 'ulan bator'},
+    'MT': {'valletta'},
+    'NE': {'niamey'},
+    'PA': {'colon', 'colón', 'david'},
+    'SD': {'khartoum'},
+    'TN': {'tunis', 'sfax'},
+    'VA': {'vatican city'},
+}
+
+_SPACES = re.compile(r'\s+')
+
+
+def _tidy(text):
+    """Collapses whitespace and drops stray punctuation around the text."""
+    return _SPACES.sub(' ', text).strip(' .,;')
+
+
+def _title_word(word):
+    if word.isupper() and 2 <= len(word.replace('.', '')) <= 3:
+        return word # An acronym: "UK", "BC", "NYC"
+    return word[:1].upper() + word[1:].lower()
+
+
+def _title(text):
+    """Capitalizes the first letter of each word and lowers the rest ("st. LOUIS" -> "St. Louis"), keeping acronyms."""
+    return ' '.join(_title_word(word) for word in text.split(' '))
+
+
+def _region(part):
+    """A region or country part that is not a U.S. state, tidied; two-letter codes are upper-cased ("bc" -> "BC")."""
+    code = part.replace('.', '')
+    return code.upper() if len(code) == 2 and code.isalpha() else _title(part)
+
+
+def _us_state(part):
+    """The full state name for a state name or abbreviation in any case, else None."""
+    lowered = part.lower()
+    if lowered in _STATE_NAMES:
+        return _STATE_NAMES[lowered]
+    undotted = lowered.replace('.', '').replace(' ', '')
+    code = _TRADITIONAL_ABBREVIATIONS.get(undotted, undotted.upper())
+    return US_STATE_ABBREVIATIONS.get(code)
+
+
+def _is_foreign_city(city, code):
+    return city.lower() in _FOREIGN_CITIES.get(code.replace('.', '').upper(), ())
+
+
+def canonical_locality(city, state_country):
+    """
+    Returns (city, region) in canonical form, or None unless both are given. Used as the
+    cache key for local history and in the prompt that generates it.
+    """
+    city = _tidy(city or '')
+    parts = [_tidy(part) for part in (state_country or '').split(',')]
+    parts = [part for part in parts if part]
+    if not city or not parts:
+        return None
+    if len(parts) > 1 and parts[-1].lower() in _US_NAMES:
+        parts = parts[:-1] # "USA" only confirms the state, when there is one
+        state = _us_state(parts[0]) if len(parts) == 1 else None
+        region = state or ', '.join(_region(part) for part in parts + ['USA'])
+    elif len(parts) == 1:
+        state = None if _is_foreign_city(city, parts[0]) else _us_state(parts[0])
+        region = state or _region(parts[0])
+    else:
+        region = ', '.join(_region(part) for part in parts)
+    return _title(city), region
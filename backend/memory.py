@@ -0,0 +1,61 @@
+"""
+Per-session memory accounting.
+
+session_memory_report measures what one session's state holds on to: the deep size of each
+session_state key, following dicts, lists, tuples, sets and objects with __slots__. An
+object reachable from several keys is counted once, under the first key that reaches it.
+Generated content lives in the shared content store (backend/content_store.py) and session
+state only holds its keys, so it is counted once per process by content_store.stats()
+rather than once per session here.
+"""
+import sys
+
+_ATOMIC_TYPES = (str, bytes, int, float, complex, bool, type(None))
+
+
+def _slot_values(obj):
+    for cls in type(obj).__mro__:
+        for name in cls.__dict__.get('__slots__', ()):
+            if hasattr(obj, name):
+                yield getattr(obj, name)
+
+
+def deep_sizeof(value, seen=None):
+    """
+    Bytes held by value and everything it contains. Objects whose id is in seen are skipped,
+    and every object counted is added to it. Objects other than containers and __slots__
+    records are counted shallowly.
+    """
+    if seen is None:
+        seen = set()
+    total = 0
+    stack = [value]
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj)
+        if isinstance(obj, _ATOMIC_TYPES):
+            continue
+        if isinstance(obj, dict):
+            stack.extend(obj.keys())
+            stack.extend(obj.values())
+        elif isinstance(obj, (list, tuple, set, frozenset)):
+            stack.extend(obj)
+        elif hasattr(type(obj), '__slots__'):
+            stack.extend(_slot_values(obj))
+    return total
+
+
+def session_memory_report(state):
+    """
+    {'total_bytes': int, 'keys': {key: bytes}} for a session's state (e.g.
+    st.session_state.to_dict()), with the keys largest first.
+    """
+    seen = set()
+    sizes = {key: deep_sizeof(value, seen) for key, value in state.items()}
+    return {
+        'total_bytes': sum(sizes.values()),
+        'keys': dict(sorted(sizes.items(), key=lambda item: item[1], reverse=True)),
+    }
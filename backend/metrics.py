@@ -0,0 +1,204 @@
+"""
+OpenAI call instrumentation.
+
+The public AI helpers are wrapped with @instrumented. Every model call made inside one
+(through clients.chat_completion) is recorded against the innermost instrumented helper
+with its latency, prompt and completion tokens and estimated cost. A helper call that
+finishes without any model call (served from a cache, the question bank or another
+session's in-flight generation) is counted as a cache hit.
+
+Per-function totals and latency histograms are kept in process memory for the admin page
+and can be exported as Prometheus text or as JSON lines of the most recent calls. Set
+OPENAI_CALL_LOG_PATH to also append every call to a JSON-lines file.
+"""
+import contextvars
+import functools
+import json
+import threading
+import time
+from collections import deque
+
+from backend.config import AI_MODEL, OPENAI_CALL_LOG_PATH
+
+# USD per 1,000 tokens: (prompt, completion)
+MODEL_PRICES = {
+    'gpt-3.5-turbo': (0.0005, 0.0015),
+    'gpt-4o-mini': (0.00015, 0.0006),
+    'gpt-4o': (0.0025, 0.01),
+}
+
+LATENCY_BUCKETS = (0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0, float('inf')) # Upper bounds, seconds
+RECENT_CALLS = 1000
+
+_current_frame = contextvars.ContextVar('instrumented_function', default=None)
+
+
+class _Frame:
+    def __init__(self, name, parent):
+        self.name = name
+        self.parent = parent
+        self.model_calls = 0
+
+
+def estimate_cost(prompt_tokens, completion_tokens, model=AI_MODEL):
+    prompt_price, completion_price = MODEL_PRICES.get(model, (0.0, 0.0))
+    return (prompt_tokens * prompt_price + completion_tokens * completion_price) / 1000
+
+
+class _FunctionStats:
+    def __init__(self):
+        self.calls = 0
+        self.cache_hits = 0
+        self.model_calls = 0
+        self.errors = 0
+        self.latency_sum = 0.0
+        self.latency_buckets = [0] * len(LATENCY_BUCKETS)
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.cost = 0.0
+
+
+class CallMetrics:
+    """Thread-safe per-function aggregates of model calls, plus a ring buffer of recent calls."""
+
+    def __init__(self, log_path=None):
+        self._functions = {} # function name -> _FunctionStats
+        self._recent = deque(maxlen=RECENT_CALLS)
+        self._log_path = log_path
+        self._lock = threading.Lock()
+
+    def _stats(self, name):
+        if name not in self._functions:
+            self._functions[name] = _FunctionStats()
+        return self._functions[name]
+
+    def record_helper_call(self, name, cache_hit):
+        with self._lock:
+            stats = self._stats(name)
+            stats.calls += 1
+            stats.cache_hits += cache_hit
+
+    def record_model_call(self, name, latency_seconds, prompt_tokens, completion_tokens, error=None):
+        cost = estimate_cost(prompt_tokens, completion_tokens)
+        record = {
+            'time': round(time.time(), 3), 'function': name, 'model': AI_MODEL,
+            'latency_seconds': round(latency_seconds, 4), 'prompt_tokens': prompt_tokens,
+            'completion_tokens': completion_tokens, 'cost_usd': round(cost, 6),
+            'error': type(error).__name__ if error is not None else None,
+        }
+        with self._lock:
+            stats = self._stats(name)
+            stats.model_calls += 1
+            stats.errors += error is not None
+            stats.latency_sum += latency_seconds
+            stats.latency_buckets[next(i for i, bound in enumerate(LATENCY_BUCKETS) if latency_seconds <= bound)] += 1
+            stats.prompt_tokens += prompt_tokens
+            stats.completion_tokens += completion_tokens
+            stats.cost += cost
+            self._recent.append(record)
+            if self._log_path:
+                try:
+                    with open(self._log_path, 'a', encoding='utf-8') as log_file:
+                        log_file.write(json.dumps(record) + "\n")
+                except OSError as e:
+                    print(f"ERROR: Could not write OpenAI call log: {e}") # Log to console for debugging
+
+    def summary(self):
+        """Returns {function: {...totals, 'latency_histogram': {bucket label: count}, 'p50'/'p95' estimates}}."""
+        with self._lock:
+            return {name: self._summarize(stats) for name, stats in sorted(self._functions.items())}
+
+    @staticmethod
+    def _summarize(stats):
+        def quantile(q):
+            target, seen = q * stats.model_calls, 0
+            for bound, count in zip(LATENCY_BUCKETS, stats.latency_buckets):
+                seen += count
+                if stats.model_calls and seen >= target:
+                    return bound
+            return None
+
+        return {
+            'calls': stats.calls,
+            'cache_hits': stats.cache_hits,
+            'model_calls': stats.model_calls,
+            'errors': stats.errors,
+            'mean_latency_seconds': stats.latency_sum / stats.model_calls if stats.model_calls else 0.0,
+            'p50_latency_seconds': quantile(0.5),
+            'p95_latency_seconds': quantile(0.95),
+            'prompt_tokens': stats.prompt_tokens,
+            'completion_tokens': stats.completion_tokens,
+            'cost_usd': stats.cost,
+            'latency_histogram': {f"≤{bound:g}s" if bound != float('inf') else f">{LATENCY_BUCKETS[-2]:g}s": count
+                                  for bound, count in zip(LATENCY_BUCKETS, stats.latency_buckets)},
+        }
+
+    def to_json_lines(self):
+        with self._lock:
+            return "".join(json.dumps(record) + "\n" for record in self._recent)
+
+    def to_prometheus(self):
+        """Prometheus text exposition format."""
+        lines = [
+            "# HELP tdih_ai_helper_calls_total Calls to instrumented AI helpers.",
+            "# TYPE tdih_ai_helper_calls_total counter",
+            "# HELP tdih_ai_cache_hits_total AI helper calls answered without a model call.",
+            "# TYPE tdih_ai_cache_hits_total counter",
+            "# HELP tdih_openai_errors_total Model calls that raised.",
+            "# TYPE tdih_openai_errors_total counter",
+            "# HELP tdih_openai_tokens_total Tokens used by model calls.",
+            "# TYPE tdih_openai_tokens_total counter",
+            "# HELP tdih_openai_cost_usd_total Estimated cost of model calls.",
+            "# TYPE tdih_openai_cost_usd_total counter",
+            "# HELP tdih_openai_latency_seconds Model call latency.",
+            "# TYPE tdih_openai_latency_seconds histogram",
+        ]
+        with self._lock:
+            for name, stats in sorted(self._functions.items()):
+                label = f'function="{name}"'
+                lines.append(f"tdih_ai_helper_calls_total{{{label}}} {stats.calls}")
+                lines.append(f"tdih_ai_cache_hits_total{{{label}}} {stats.cache_hits}")
+                lines.append(f"tdih_openai_errors_total{{{label}}} {stats.errors}")
+                lines.append(f'tdih_openai_tokens_total{{{label},kind="prompt"}} {stats.prompt_tokens}')
+                lines.append(f'tdih_openai_tokens_total{{{label},kind="completion"}} {stats.completion_tokens}')
+                lines.append(f"tdih_openai_cost_usd_total{{{label}}} {stats.cost:.6f}")
+                cumulative = 0
+                for bound, count in zip(LATENCY_BUCKETS, stats.latency_buckets):
+                    cumulative += count
+                    le = "+Inf" if bound == float('inf') else f"{bound:g}"
+                    lines.append(f'tdih_openai_latency_seconds_bucket{{{label},le="{le}"}} {cumulative}')
+                lines.append(f"tdih_openai_latency_seconds_sum{{{label}}} {stats.latency_sum:.4f}")
+                lines.append(f"tdih_openai_latency_seconds_count{{{label}}} {stats.model_calls}")
+        return "\n".join(lines) + "\n"
+
+    def reset(self):
+        with self._lock:
+            self._functions.clear()
+            self._recent.clear()
+
+
+call_metrics = CallMetrics(OPENAI_CALL_LOG_PATH)
+
+
+def instrumented(fn):
+    """Attributes model calls made inside fn to it, and counts calls to fn that needed none."""
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        frame = _Frame(fn.__name__, _current_frame.get())
+        token = _current_frame.set(frame)
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            _current_frame.reset(token)
+            call_metrics.record_helper_call(frame.name, cache_hit=frame.model_calls == 0)
+            if frame.parent is not None:
+                frame.parent.model_calls += frame.model_calls
+    return wrapper
+
+
+def record_model_call(latency_seconds, prompt_tokens, completion_tokens, error=None):
+    """Records a model call against the innermost instrumented helper on this thread."""
+    frame = _current_frame.get()
+    if frame is not None:
+        frame.model_calls += 1
+    call_metrics.record_model_call(frame.name if frame is not None else 'unattributed', latency_seconds, prompt_tokens, completion_tokens, error)
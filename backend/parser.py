@@ -0,0 +1,233 @@
+"""
+Parsing of the model's free-text responses into structured content.
+
+A daily-content completion is tokenized once: a single precompiled heading pattern finds
+the section headings, and each section's body runs to the next heading. The heading
+variants the model actually produces are accepted: "1. Event Article:", "1) Event
+Article -", markdown "**1. Event Article:**" or "### Event Article", unnumbered headings,
+and a bold heading immediately repeated as a plain one (see the variant responses in
+benchmarks/recorded_responses.json, and benchmarks/parse_corpus.py for checking a corpus
+of saved responses).
+
+Each section also gets a parse confidence between 0 and 1 in 'parse_confidence': 0 means
+the section was missing and holds placeholder text, 1 means a correctly numbered heading
+with a complete body. Misnumbered or unnumbered headings, and short trivia, "Did You Know?"
+or memory-prompt lists, score in between.
+"""
+import re
+
+# (key, expected heading number, heading pattern)
+SECTIONS = (
+    ('event_article', 1, r'Event(?:\s+Article)?'),
+    ('born_article', 2, r'Born\s+on\s+(?:this|the)\s+Day(?:\s+Article)?'),
+    ('fun_fact_section', 3, r'Fun\s+Fact'),
+    ('trivia_section', 4, r'Trivia(?:\s+Questions?)?'),
+    ('did_you_know_section', 5, r'Did\s+You\s+Know\??'),
+    ('memory_prompt_section', 6, r'Memory\s+Prompts?'),
+    ('local_history_section', 7, r'Local\s+History(?:\s+Fact)?'),
+)
+CORE_SECTIONS = ('event_article', 'born_article') # Content without these is not worth keeping
+
+_MARKUP = r'(?:\*\*|__)?'
+_HEADING = re.compile(
+    rf'^[ \t]*(?:#{{1,6}}[ \t]*)?{_MARKUP}[ \t]*(?:(?P<number>\d)[ \t]*[.):][ \t]*)?{_MARKUP}[ \t]*'
+    + '(?:' + '|'.join(f'(?P<s{index}>{pattern})' for index, (_, _, pattern) in enumerate(SECTIONS)) + ')'
+    + rf'[ \t]*{_MARKUP}[ \t]*(?P<separator>[:\-–—])?[ \t]*{_MARKUP}[ \t]*',
+    re.IGNORECASE | re.MULTILINE,
+)
+
+# Trivia entries and list items: "a. ", "B) ", "1. ", "2 - ", or a bullet
+_ITEM_MARKER = re.compile(r'^[ \t]*(?:[-*•][ \t]+)?(?:(?:[a-eA-E]|\d{1,2})[ \t]*[.):\-][ \t]+|[-*•][ \t]+)', re.MULTILINE)
+_HINT_PREFIX = re.compile(r'(?:Hint|Indice|Pista)\s*:\s*', re.IGNORECASE)
+_ANSWER_PREFIX = re.compile(r'(?:Answer|R[eé]ponse|Respuesta)\s*:\s*', re.IGNORECASE)
+_ANSWER_LINE = re.compile(r'(?:Answer|R[eé]ponse|Respuesta)\s*:\s*([^\n\[]*)', re.IGNORECASE)
+_QUESTION_PREFIX = re.compile(r'^(?:Question|Pregunta)\s*:\s*', re.IGNORECASE)
+_NOT_A_QUESTION = ("sabías que", "did you know", "disparadores de memoria", "memory prompts")
+_EMPTY_ANSWER_MARKER = re.compile(r'\s*\(Answer:\)\s*')
+_DIFFICULTY_HEADING = re.compile(r'^\s*(?:#+\s*)?\**(Easy|Medium|Hard)(?:\s+Questions?)?\s*:?\**\s*:?\s*$', re.IGNORECASE | re.MULTILINE)
+
+PLACEHOLDERS = {
+    'event_article': "No event article found.",
+    'born_article': "No birth article found.",
+    'fun_fact_section': "No fun fact found.",
+    'did_you_know_section': ["No 'Did You Know?' facts available for today. Please try again or adjust preferences."],
+    'memory_prompt_section': [
+        "No memory prompts available.",
+        "Consider your favorite childhood memory.",
+        "What's a happy moment from your past week?"
+    ],
+    'local_history_section': "Could not generate local history fact.",
+}
+
+
+def parse_single_trivia_entry(entry_string):
+    """
+    Parses a single raw trivia entry string into its question, answer, and hint components.
+    Assumes the structure: "Question (Answer) [Hint]", optionally with an "a. " / "1) "
+    prefix, "Answer:" / "Hint:" labels instead of the brackets, or labels inside them.
+    """
+    text = _ITEM_MARKER.sub('', entry_string.strip(), count=1).strip()
+    has_label = ':' in text # Labels are rare; skip their patterns when there can't be one
+
+    # 1. Hint: the last [...] group, else everything after a "Hint:" label
+    hint = ""
+    close = text.rfind(']')
+    open_ = text.rfind('[', 0, close) if close != -1 else -1
+    if open_ != -1:
+        hint = text[open_ + 1:close]
+        if has_label:
+            hint = _HINT_PREFIX.sub('', hint, count=1)
+        text = text[:open_] + text[close + 1:]
+    elif has_label:
+        label = _HINT_PREFIX.search(text)
+        if label:
+            hint = text[label.end():]
+            text = text[:label.start()]
+
+    # 2. Answer: an "Answer:" label outside parentheses, else the last (...) group
+    answer = ""
+    close = text.rfind(')')
+    open_ = text.rfind('(', 0, close) if close != -1 else -1
+    label = _ANSWER_LINE.search(text) if has_label else None
+    if label and not (open_ < label.start() < close):
+        answer = label.group(1)
+        text = text[:label.start()] + text[label.end():]
+    elif open_ != -1:
+        answer = text[open_ + 1:close]
+        if has_label:
+            answer = _ANSWER_PREFIX.sub('', answer, count=1)
+        text = text[:open_] + text[close + 1:]
+
+    # 3. Whatever remains is the question; only its first line counts
+    question = _QUESTION_PREFIX.sub('', text.strip(), count=1).split('\n', 1)[0].strip()
+    lowered = question.lower()
+    if any(phrase in lowered for phrase in _NOT_A_QUESTION):
+        question = ""
+
+    return {
+        'question': question or "No question found.",
+        'answer': answer.strip() or "No answer found.",
+        'hint': hint.strip() or "No hint found.",
+    }
+
+
+def _split_items(block):
+    """Splits a block into items at list markers; lines without a marker continue the item above."""
+    markers = list(_ITEM_MARKER.finditer(block))
+    if not markers:
+        return [line for line in block.split('\n') if line.strip()]
+    items = [block[:markers[0].start()]] if block[:markers[0].start()].strip() else []
+    for index, marker in enumerate(markers):
+        end = markers[index + 1].start() if index + 1 < len(markers) else len(block)
+        items.append(block[marker.start():end])
+    return items
+
+
+def parse_trivia_block(raw_trivia_block):
+    """
+    Splits a block of lettered/numbered trivia lines into parsed entries (at most five),
+    skipping entries that do not parse into a real question.
+    """
+    trivia_questions = []
+    for entry_text in _split_items(raw_trivia_block.strip()):
+        parsed_item = parse_single_trivia_entry(entry_text)
+        if parsed_item['question'] != "No question found.":
+            trivia_questions.append(parsed_item)
+        if len(trivia_questions) >= 5: # Limit to 5 questions explicitly
+            break
+    return trivia_questions
+
+
+def split_trivia_by_difficulty(content):
+    """
+    Splits a multi-difficulty trivia completion ("Easy:", "Medium:", "Hard:" headings)
+    into {difficulty: raw_block}. Difficulties whose heading is missing are left out.
+    """
+    blocks = {}
+    headings = list(_DIFFICULTY_HEADING.finditer(content))
+    for index, heading in enumerate(headings):
+        end = headings[index + 1].start() if index + 1 < len(headings) else len(content)
+        blocks[heading.group(1).capitalize()] = content[heading.end():end]
+    return blocks
+
+
+def _tokenize_sections(content):
+    """
+    Returns {section key: (body, heading number or None)} from one pass over the headings.
+    A heading counts if it is numbered, followed by a separator, or alone on its line. The
+    first heading of each section wins, except that an empty section is taken over by a
+    repeat of its heading (e.g. "**1. Event Article:**" followed by "1. Event Article: ...").
+    """
+    claimed = [] # [key, heading match], in order
+    for match in _HEADING.finditer(content):
+        line_end = content.find('\n', match.end())
+        alone_on_line = not content[match.end():line_end if line_end != -1 else len(content)].strip()
+        if not (match.group('number') or match.group('separator') or alone_on_line):
+            continue
+        key = next(SECTIONS[index][0] for index in range(len(SECTIONS)) if match.group(f's{index}') is not None)
+        previous = next((entry for entry in claimed if entry[0] == key), None)
+        if previous is None:
+            claimed.append([key, match])
+        elif previous is claimed[-1] and not content[previous[1].end():match.start()].strip():
+            previous[1] = match
+    sections = {}
+    for index, (key, match) in enumerate(claimed):
+        end = claimed[index + 1][1].start() if index + 1 < len(claimed) else len(content)
+        number = match.group('number')
+        sections[key] = (content[match.end():end].strip(), int(number) if number else None)
+    return sections
+
+
+def _list_lines(body):
+    lines = []
+    for line in body.split('\n'):
+        cleaned = _EMPTY_ANSWER_MARKER.sub('', _ITEM_MARKER.sub('', line, count=1)).strip()
+        if cleaned:
+            lines.append(cleaned)
+    return lines
+
+
+def parse_fact_list(content):
+    """Splits a numbered or bulleted list with one fact per line into the facts."""
+    return _list_lines(content)
+
+
+def _memory_prompts(body):
+    # Split by double newlines to get distinct paragraphs/prompts, else by single newlines
+    paragraphs = [p.strip() for p in body.split('\n\n') if p.strip()]
+    if len(paragraphs) < 2 and '\n' in body:
+        paragraphs = [p.strip() for p in body.split('\n') if p.strip()]
+    prompts = (_ITEM_MARKER.sub('', p, count=1).strip() for p in paragraphs)
+    return [prompt for prompt in prompts if prompt]
+
+
+def parse_history_response(content):
+    """
+    Parses the full 'This Day in History' completion into its sections, with a confidence
+    per section in 'parse_confidence'. The trivia list is returned as parsed (up to five
+    entries); callers decide how to pad it. Missing sections get placeholder text.
+    """
+    sections = _tokenize_sections(content)
+    parsed, confidence = {}, {}
+    for key, expected_number, _ in SECTIONS:
+        body, number = sections.get(key, ("", None))
+        heading_score = 1.0 if number == expected_number else 0.8 if key in sections else 0.0
+        if key == 'trivia_section':
+            value = parse_trivia_block(body) if body else []
+            complete = sum(1 for item in value if item['answer'] != "No answer found." and item['hint'] != "No hint found.")
+            body_score = complete / 5
+        elif key == 'did_you_know_section':
+            value = _list_lines(body)
+            body_score = min(len(value), 3) / 3
+        elif key == 'memory_prompt_section':
+            value = _memory_prompts(body)
+            body_score = min(len(value), 2) / 2
+        else:
+            value = body
+            body_score = 1.0 if body else 0.0
+        if not value and key in PLACEHOLDERS:
+            value = PLACEHOLDERS[key]
+        parsed[key] = value
+        confidence[key] = round(heading_score * body_score, 2)
+    parsed['parse_confidence'] = confidence
+    return parsed
@@ -0,0 +1,408 @@
+"""PDF rendering for the daily 'This Day in History' worksheet."""
+import io
+import os
+import zipfile
+
+import fpdf
+from fpdf import FPDF
+
+from backend.ai import translate_text_checked
+from backend.cache import content_fingerprint, get_or_refresh, pdf_cache
+from backend.config import LOGO_URL, PDF_FONT_CACHE_DIR, PDF_UNICODE_FONT_PATHS
+from backend.profiling import in_phase
+from backend.render_pool import render_pool
+from backend.text import clean_text_for_latin1, is_latin1, normalize_text
+
+UNICODE_FONT_FAMILY = "UnicodeSans"
+
+# Fixed text printed on every page, translated along with the content
+PAGE_LABELS = {
+    'masthead': "The Daily Resense Register",
+    'on_this_date': "On This Date",
+    'fun_fact': "Fun Fact:",
+    'quote_title': "Quote of the Day",
+    'quote': '"The only way to do great work is to love what you do."',
+    'quote_author': "- Unknown",
+    'happy_birthday': "Happy Birthday!",
+    'did_you_know': "Did You Know?",
+    'memory_prompt': "Memory Prompt?",
+    'local_history': "Local History:",
+    'about_us_title': "Learn More About US! Mindful Libraries - A Dementia-Inclusive Reading Program",
+    'about_us_text': """Mindful Libraries is a collaborative initiative between Resense, Nana's Books, and Mirador
+Magazine, designed to bring adaptive, nostalgic reading experiences to individuals living
+with dementia. This innovative program provides:
+- Curated Libraries of dementia-friendly newspapers, books, and magazines
+- Staff Training accredited by NCCAP, focusing on reminiscence, person-centered care,
+and meaningful engagement
+- Digital Access Tools like downloadable discussion guides, activity templates, and reading
+prompts
+- Partnerships with Long-Term Care Communities to build inclusive, life-enriching
+environments
+Mindful Libraries empowers care teams to reconnect residents with their pasts, spark joyful conversation, and foster dignity through storytelling and memory-based engagement.""",
+    'learn_more': "Learn more about our program at www.mindfullibraries.com",
+    'contact': "Contact Information",
+    'email': "Email: thisdayinhistoryapp@gmail.com",
+    'website': "Website: ThisDayInHistoryApp.com (Coming Soon!)",
+    'program_site': "www.mindfullibraries.com",
+    'phone': "Phone: 412-212-6701 (For Support)",
+}
+
+_missing_font_reported = False
+
+
+def _needs_unicode_font(drawn_texts):
+    """Whether any of the texts drawn on the page (translated, as printed) is beyond the core fonts."""
+    return not all(is_latin1(normalize_text(text)) for text in drawn_texts if text)
+
+
+def _add_unicode_font(pdf):
+    """
+    Registers the configured TTF fonts on pdf (fpdf embeds only the glyphs used) and returns
+    the family name, or None if the regular font file is missing. Font metrics are parsed
+    once and kept in PDF_FONT_CACHE_DIR.
+    """
+    global _missing_font_reported
+    regular = PDF_UNICODE_FONT_PATHS['']
+    if not os.path.exists(regular):
+        if not _missing_font_reported:
+            _missing_font_reported = True
+            print(f"ERROR: PDF Unicode font {regular} not found; non-Latin text will print as '?'") # Log to console for debugging
+        return None
+    os.makedirs(PDF_FONT_CACHE_DIR, exist_ok=True)
+    fpdf.set_global("FPDF_CACHE_MODE", 2) # Metrics cache in FPDF_CACHE_DIR rather than next to the font
+    fpdf.set_global("FPDF_CACHE_DIR", PDF_FONT_CACHE_DIR)
+    for style in ('', 'B', 'I'):
+        path = PDF_UNICODE_FONT_PATHS[style]
+        pdf.add_font(UNICODE_FONT_FAMILY, style, path if path and os.path.exists(path) else regular, uni=True)
+    return UNICODE_FONT_FAMILY
+
+
+def _for_core_fonts(text):
+    return text if is_latin1(text) else clean_text_for_latin1(text)
+
+
+def _page_texts(data, user_info, custom_masthead_text=None):
+    """Every text generate_full_history_pdf translates for this page."""
+    masthead = custom_masthead_text if custom_masthead_text and custom_masthead_text.strip() else PAGE_LABELS['masthead']
+    texts = [masthead] + [label for key, label in PAGE_LABELS.items() if key != 'masthead'] + [f"Generated for {user_info['name']}"]
+    texts += [data.get(key, '') for key in ('event_article', 'fun_fact_section', 'born_article')]
+    if not data.get('local_history_section', '').startswith("Could not generate local history fact."): # Left off the page
+        texts.append(data.get('local_history_section', ''))
+    texts += [item or '' for item in data.get('did_you_know_section') or []]
+    texts += [item or '' for item in (data.get('memory_prompt_section') or [])[:3]]
+    return texts
+
+
+def translate_page_texts(data, user_info, current_language="English", custom_masthead_text=None):
+    """
+    ({text: translation} for every text on the page, whether any of them fell back to
+    English), for rendering with generate_full_history_pdf(translations=...).
+    """
+    translations, fell_back = {}, False
+    for text in _page_texts(data, user_info, custom_masthead_text):
+        translations[text], text_fell_back = translate_text_checked(text, current_language)
+        fell_back = fell_back or text_fell_back
+    return translations, fell_back
+
+
+@in_phase('pdf')
+def generate_full_history_pdf(data, today_date_str, user_info, current_language="English", custom_masthead_text=None, translations=None):
+    """
+    Generates a PDF of 'This Day in History' facts, formatted over two pages.
+    Page 1: Two-column layout with daily content.
+    Page 2: About Us, Logo, and Contact Information.
+    Every text is translated before layout starts (translate_page_texts), unless translations
+    from it are given, in which case rendering makes no model calls at all.
+    """
+    if translations is None:
+        translations, _ = translate_page_texts(data, user_info, current_language, custom_masthead_text)
+
+    def translate(text):
+        return translations.get(text, text)
+
+    pdf = FPDF(unit="mm", format="A4") # Use mm for better control
+
+    # Content and translations are normalized at ingest, so a page whose drawn text all fits
+    # Latin-1 prints it as is; anything else switches every font to the Unicode TTF family
+    unicode_family = None
+    if _needs_unicode_font([today_date_str.upper(), *translations.values()]):
+        unicode_family = _add_unicode_font(pdf)
+    serif_font, sans_font = (unicode_family, unicode_family) if unicode_family else ("Times", "Arial")
+    prepare_text = normalize_text if unicode_family else _for_core_fonts
+    pdf.add_page() # Start with the first page
+    pdf.set_auto_page_break(True, margin=15) # Enable auto page break with a margin
+
+    # Define dimensions for A4 and columns (in mm)
+    page_width = pdf.w
+    left_margin = 15
+    right_margin = 15
+    content_width = page_width - left_margin - right_margin
+    col_width = (content_width - 10) / 2 # 10mm gutter between columns
+    
+    # Font sizes (now fixed for normal mode, as dementia mode is removed)
+    title_font_size = 36
+    date_font_size = 10
+    section_title_font_size = 12
+    article_text_font_size = 10
+    line_height_normal = 5
+    section_spacing_normal = 5
+
+    # Define page 2 margins at the beginning
+    left_margin_p2 = 25
+    right_margin_p2 = 25
+    content_width_p2 = page_width - left_margin_p2 - right_margin_p2
+
+    # --- Masthead (Page 1) ---
+    pdf.set_y(10) # Start from top
+    pdf.set_x(left_margin)
+    pdf.set_font(serif_font, "B", title_font_size) # Large, bold font for the title
+    
+    # Use custom masthead text if provided, otherwise default
+    masthead_to_display = custom_masthead_text if custom_masthead_text and custom_masthead_text.strip() else PAGE_LABELS['masthead']
+    # The masthead text is specifically translated AND cleaned here.
+    pdf.cell(0, 15, prepare_text(translate(masthead_to_display)), align='C') # Removed client_ai
+    pdf.ln(15)
+
+    # Separator line
+    pdf.set_line_width(0.5)
+    pdf.line(left_margin, pdf.get_y(), page_width - right_margin, pdf.get_y())
+    pdf.ln(8)
+
+    pdf.set_font(sans_font, "", date_font_size)
+    pdf.cell(0, 5, prepare_text(today_date_str.upper()), align='C') # Date below the title
+    pdf.ln(15)
+
+    pdf.set_line_width(0.2) # Thinner line for content sections
+    pdf.line(left_margin, pdf.get_y(), page_width - right_margin, pdf.get_y())
+    pdf.ln(8)
+
+    # --- Two-Column Layout for Page 1 ---
+    # Store initial Y for content columns to ensure they start at the same height
+    start_y_content = pdf.get_y()
+    
+    # Track current Y for each column
+    current_y_col1 = start_y_content
+    current_y_col2 = start_y_content
+
+    # Column 1 (Left Column)
+    pdf.set_left_margin(left_margin)
+    pdf.set_right_margin(page_width / 2 + 5) # Right margin for left column = page_width / 2 + half_gutter
+    pdf.set_x(left_margin) # Set X for the first column
+    pdf.set_y(current_y_col1) # Start content at the same Y level
+
+    # On This Date (Event Article)
+    pdf.set_font(sans_font, "B", section_title_font_size)
+    pdf.multi_cell(col_width, line_height_normal, prepare_text(translate(PAGE_LABELS['on_this_date']))) # Removed client_ai
+    current_y_col1 += line_height_normal # Update Y after title
+    pdf.set_font(sans_font, "", article_text_font_size) # Ensure font is not bold for article text
+    # Translate content explicitly before adding to PDF
+    translated_event_article = prepare_text(translate(data.get('event_article', ''))) # Removed client_ai
+    pdf.multi_cell(col_width, line_height_normal, translated_event_article)
+    current_y_col1 = pdf.get_y() + section_spacing_normal # Update Y and add spacing
+
+    pdf.set_y(current_y_col1) # Ensure position is updated
+
+    # Fun Fact
+    pdf.set_font(sans_font, "B", section_title_font_size)
+    pdf.multi_cell(col_width, line_height_normal, prepare_text(translate(PAGE_LABELS['fun_fact']))) # Translated # Removed client_ai
+    current_y_col1 += line_height_normal
+    pdf.set_font(sans_font, "", article_text_font_size) # Ensure font is not bold for article text
+    # Translate content explicitly before adding to PDF
+    translated_fun_fact = prepare_text(translate(data.get('fun_fact_section', ''))) # Removed client_ai
+    pdf.multi_cell(col_width, line_height_normal, translated_fun_fact)
+    current_y_col1 = pdf.get_y() + section_spacing_normal # Update Y and add spacing
+    pdf.set_y(current_y_col1)
+
+    # Removed: Daily Trivia section for PDF (as per user request)
+
+    current_y_col1 += section_spacing_normal # Spacing after content section
+    pdf.set_y(current_y_col1)
+
+
+    # Column 2 (Right Column)
+    pdf.set_xy(page_width / 2 + 5, current_y_col2) # X start for right column, Y at same level as left
+    pdf.set_right_margin(right_margin)
+    pdf.set_left_margin(page_width / 2 + 5) # Left margin for right column
+
+    # Quote of the Day
+    pdf.set_font(sans_font, "B", section_title_font_size)
+    pdf.multi_cell(col_width, line_height_normal, prepare_text(translate(PAGE_LABELS['quote_title'])), align='C') # Translated # Removed client_ai
+    current_y_col2 += line_height_normal
+    quote_text = prepare_text(translate(PAGE_LABELS['quote'])) # Placeholder quote # Removed client_ai
+    quote_author = prepare_text(translate(PAGE_LABELS['quote_author'])) # Placeholder author # Removed client_ai
+    pdf.set_font(serif_font, "I", article_text_font_size) # Italic for quote
+    pdf.multi_cell(col_width, line_height_normal, quote_text, align='C')
+    pdf.multi_cell(col_width, line_height_normal, quote_author, align='C')
+    current_y_col2 = pdf.get_y() + section_spacing_normal # Update Y and add spacing
+    pdf.set_y(current_y_col2)
+
+    # Happy Birthday! (Born on this Day Article)
+    pdf.set_font(sans_font, "B", section_title_font_size)
+    pdf.multi_cell(col_width, line_height_normal, prepare_text(translate(PAGE_LABELS['happy_birthday'])), align='C') # Translated # Removed client_ai
+    current_y_col2 += line_height_normal
+    pdf.set_font(sans_font, "", article_text_font_size) # Ensure font is not bold for article text
+    # Translate content explicitly before adding to PDF
+    translated_born_article = prepare_text(translate(data.get('born_article', ''))) # Removed client_ai
+    pdf.multi_cell(col_width, line_height_normal, translated_born_article)
+    current_y_col2 = pdf.get_y() + section_spacing_normal # Update Y and add spacing
+    pdf.set_y(current_y_col2)
+
+    # Did You Know?
+    if data.get('did_you_know_section'): # Use .get() to check if 'did_you_know_section' key exists and is not empty/None
+        pdf.set_font(sans_font, "B", section_title_font_size)
+        pdf.multi_cell(col_width, line_height_normal, prepare_text(translate(PAGE_LABELS['did_you_know'])), align='C') # Translated # Removed client_ai
+        current_y_col2 += line_height_normal
+        pdf.set_font(sans_font, "", article_text_font_size)
+        for item in data['did_you_know_section']:
+            # Translate each item explicitly before adding to PDF
+            translated_item = prepare_text(translate(item if item is not None else '')) # Removed client_ai
+            pdf.multi_cell(col_width, line_height_normal, prepare_text(f"- {translated_item}")) # Ensure the whole f-string is cleaned
+            current_y_col2 = pdf.get_y() # Update Y after each fact line
+        current_y_col2 += section_spacing_normal # Spacing after section
+        pdf.set_y(current_y_col2)
+
+    # Memory Prompt?
+    if data.get('memory_prompt_section'): # Use .get() to check if key exists and is not empty/None
+        pdf.set_font(sans_font, "B", section_title_font_size)
+        pdf.multi_cell(col_width, line_height_normal, prepare_text(translate(PAGE_LABELS['memory_prompt'])), align='C') # Translated # Removed client_ai
+        current_y_col2 += line_height_normal
+        pdf.set_font(sans_font, "", article_text_font_size)
+        # Iterate and display up to the first 3 memory prompts for PDF
+        for prompt_text in data['memory_prompt_section'][:3]: # Limit to first 3 prompts
+            # Translate each prompt explicitly before adding to PDF
+            translated_prompt = prepare_text(translate(prompt_text if prompt_text is not None else '')) # Removed client_ai
+            pdf.multi_cell(col_width, line_height_normal, translated_prompt)
+            pdf.ln(2) # Small line break between prompts
+            current_y_col2 = pdf.get_y() # Update Y after each prompt line
+        current_y_col2 += section_spacing_normal # Spacing after section
+        pdf.set_y(current_y_col2)
+
+    # Local History (if available) - This section will now rely on auto_page_break
+    # It will only be displayed if it's not one of the "not found" messages.
+    local_history_content = data.get('local_history_section', '')
+    if local_history_content and \
+       not local_history_content.startswith("Could not generate local history fact."): # Simplified check
+        pdf.set_font(sans_font, "B", section_title_font_size)
+        
+        # Calculate available space in each column.
+        current_y_after_main_content = max(current_y_col1, current_y_col2) # Get the lowest point of content in either column
+        
+        # Temporarily save current margins and x to restore after local history section
+        original_left_margin = pdf.l_margin
+        original_right_margin = pdf.r_margin
+        original_x = pdf.x
+
+        # Reset margins for single column local history display
+        pdf.set_left_margin(left_margin)
+        pdf.set_right_margin(right_margin)
+        pdf.set_x(left_margin) # Reset X to left margin
+
+        # Set Y to the max of current column Ys, then add some spacing
+        pdf.set_y(current_y_after_main_content + section_spacing_normal) 
+
+        pdf.multi_cell(content_width, line_height_normal, prepare_text(translate(PAGE_LABELS['local_history']))) # Translated # Removed client_ai
+        pdf.set_font(sans_font, "", article_text_font_size)
+        # Translate content explicitly before adding to PDF
+        translated_local_history = prepare_text(translate(local_history_content)) # Removed client_ai
+        pdf.multi_cell(content_width, line_height_normal, translated_local_history)
+        
+        # Restore original margins for subsequent content (Page 2)
+        pdf.set_left_margin(original_left_margin)
+        pdf.set_right_margin(original_right_margin)
+        pdf.set_x(original_x)
+
+
+    # --- Page 2 Content ---
+    # ALWAYS add a new page before starting the "About Us" section to ensure it's on page 2
+    # and is distinctly separate from any main content that may have flowed across pages.
+    pdf.add_page()
+
+    # Set margins and starting Y for the new page (Page 2)
+    pdf.set_left_margin(left_margin_p2)
+    pdf.set_right_margin(right_margin_p2)
+    pdf.set_x(left_margin_p2) # Start content at the new left margin
+    pdf.set_y(20) # Start further down on the new page
+
+    # About Us Title
+    pdf.set_font(sans_font, "B", 18) # Slightly smaller font for longer title
+    new_about_us_title = prepare_text(translate(PAGE_LABELS['about_us_title'])) # Removed client_ai
+    pdf.multi_cell(content_width_p2, 10, new_about_us_title, 0, 'C') # Using multi_cell for title as it's long
+    pdf.ln(5) # Smaller line break after title
+
+    # About Us Text
+    pdf.set_font(sans_font, "", 11) # Slightly smaller font for better fit
+    new_about_us_text = prepare_text(translate(PAGE_LABELS['about_us_text'])) # Removed client_ai
+    pdf.multi_cell(content_width_p2, 6, new_about_us_text, 0, 'L') # Left align for readability
+    pdf.ln(5) # Add space after About Us text
+
+    # New line for learning more
+    pdf.set_font(sans_font, "B", 12) # Set font to bold for this line
+    pdf.multi_cell(content_width_p2, 7, prepare_text(translate(PAGE_LABELS['learn_more'])), 0, 'C') # Centered and bold # Removed client_ai
+    pdf.set_font(sans_font, "", 12) # Reset font to normal
+    pdf.ln(10) # More space after this line
+
+    # Logo - still centered horizontally on the page
+    logo_width = 70
+    logo_height = 70
+    logo_x = (page_width - logo_width) / 2 # Still calculated based on full page width for centering
+    pdf.image(LOGO_URL, x=logo_x, y=pdf.get_y(), w=logo_width, h=logo_height)
+    pdf.ln(logo_height + 15) # Add space after logo
+
+    # Contact Information - still centered horizontally on the page
+    pdf.set_font(sans_font, "B", 16)
+    pdf.multi_cell(0, 10, prepare_text(translate(PAGE_LABELS['contact'])), 0, 'C') # Translated # Removed client_ai
+    pdf.ln(5)
+    pdf.set_font(sans_font, "", 12)
+    pdf.multi_cell(0, 7, prepare_text(translate(PAGE_LABELS['email'])), 0, 'C') # Translated # Removed client_ai
+    pdf.multi_cell(0, 7, prepare_text(translate(PAGE_LABELS['website'])), 0, 'C') # Translated # Removed client_ai
+    
+    # Original bold website URL, keep if intended to have two website mentions
+    pdf.set_font(sans_font, "B", 12) # Set font to bold
+    pdf.multi_cell(0, 7, prepare_text(translate(PAGE_LABELS['program_site'])), 0, 'C') # Translated # Removed client_ai
+    pdf.set_font(sans_font, "", 12) # Reset font to normal
+
+    pdf.multi_cell(0, 7, prepare_text(translate(PAGE_LABELS['phone'])), 0, 'C') # Translated # Removed client_ai
+    pdf.ln(10)
+
+    # User info at the very bottom of the second page, aligned right
+    pdf.set_font(sans_font, "I", 8)
+    # Reset margins for a full width cell to align right
+    pdf.set_left_margin(left_margin_p2) # Revert to page 2 margins
+    pdf.set_right_margin(right_margin_p2)
+    pdf.set_x(left_margin_p2)
+    pdf.set_y(pdf.h - 15) # Position near bottom of the page
+    pdf.multi_cell(content_width_p2, 4, prepare_text(translate(f"Generated for {user_info['name']}")), align='R') # Translated # Removed client_ai
+        
+    return pdf.output(dest='S').encode('latin-1')
+
+
+def build_pdf_zip(named_pdfs):
+    """Returns a ZIP archive (bytes) holding the given (file name, PDF bytes) pairs."""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, 'w', zipfile.ZIP_DEFLATED) as zipf:
+        for file_name, pdf_bytes in named_pdfs:
+            zipf.writestr(file_name, pdf_bytes)
+    return buffer.getvalue()
+
+
+def get_history_pdf(data, today_date_str, user_info, current_language="English", custom_masthead_text=None, pooled=False):
+    """
+    generate_full_history_pdf through the shared pdf_cache, keyed on the content and on
+    everything else printed on the page, and served stale-while-revalidate. A PDF in which
+    some translation fell back to English is returned but not cached. With pooled (batch
+    jobs), the page is translated here and laid out in a render_pool process, so that
+    several PDFs render on several cores at once.
+    """
+    cache_key = (content_fingerprint(data), today_date_str, user_info['name'], current_language, custom_masthead_text or '')
+
+    def render():
+        # Translated here rather than inside generate_full_history_pdf, to know whether any text fell back
+        translations, fell_back = translate_page_texts(data, user_info, current_language, custom_masthead_text)
+        if pooled:
+            pdf_bytes = render_pool.render(data, today_date_str, user_info, current_language, custom_masthead_text, translations)
+        else:
+            pdf_bytes = generate_full_history_pdf(data, today_date_str, user_info, current_language, custom_masthead_text, translations=translations)
+        return pdf_bytes, fell_back
+
+    pdf_bytes, _ = get_or_refresh(pdf_cache, cache_key, render, should_store=lambda rendered: not rendered[1])
+    return pdf_bytes
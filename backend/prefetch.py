@@ -0,0 +1,103 @@
+"""
+Speculative prefetch of the content a user is likely to ask for next.
+
+Users often step the main page's date a day forward or back, or switch language, and each
+time wait for a full generation or translation. With PREFETCH_ENABLED, serving the main
+page queues background work that warms the shared caches first:
+
+- the daily content for the PREFETCH_ADJACENT_DAYS days either side of the selected date,
+  with the same content preferences, translated if the user reads another language; this
+  also covers tomorrow's page before midnight, and
+- the selected day's content translated into each of PREFETCH_LANGUAGES.
+
+Jobs run one at a time on a background thread at the rate limiter's BATCH priority, so
+they only use budget that page loads leave over, and go through the same caches and
+single-flight locks as page loads: a user who asks while a prefetch is in flight waits for
+it rather than starting another generation. A job whose content can't be generated is
+dropped, not translated, and counted as failed. Pages rerun often, so a job is queued at most
+once per PREFETCH_DEDUP_SECONDS, and while PREFETCH_QUEUE_SIZE jobs are waiting new ones
+are dropped.
+"""
+import queue
+import threading
+from datetime import timedelta
+
+from backend.ai import fetch_daily_content, translate_content
+from backend.cache import TTLCache
+from backend.config import (
+    PREFETCH_ADJACENT_DAYS,
+    PREFETCH_DEDUP_SECONDS,
+    PREFETCH_ENABLED,
+    PREFETCH_LANGUAGES,
+    PREFETCH_QUEUE_SIZE,
+)
+from backend.ratelimit import BATCH, request_priority
+
+class Prefetcher:
+    def __init__(self, enabled, languages, adjacent_days, dedup_seconds, queue_size):
+        self.enabled = enabled
+        self.languages = languages
+        self.adjacent_days = adjacent_days
+        self._queue = queue.Queue(maxsize=queue_size)
+        self._recent = TTLCache(dedup_seconds, max_entries=4096) # Jobs queued recently
+        self._worker = None
+        self._lock = threading.Lock()
+        self._counts = {'queued': 0, 'skipped': 0, 'dropped': 0, 'done': 0, 'failed': 0}
+
+    def after_daily_page(self, selected_date, language, preferred_decade=None, topic=None, difficulty='Medium',
+                         local_city=None, local_state_country=None):
+        """Queues the prefetches for a main page just served with these settings."""
+        if not self.enabled:
+            return
+        preferences = (preferred_decade, topic, difficulty, local_city, local_state_country)
+        jobs = []
+        for distance in range(1, self.adjacent_days + 1):
+            jobs += [(selected_date + timedelta(days=distance), language), (selected_date - timedelta(days=distance), language)]
+        jobs += [(selected_date, other) for other in self.languages if other != language]
+        for day, job_language in jobs:
+            self._submit((day.month, day.day, job_language) + preferences)
+
+    def _submit(self, job):
+        with self._lock:
+            if self._recent.get(job) is not None:
+                self._counts['skipped'] += 1
+                return
+            try:
+                self._queue.put_nowait(job)
+            except queue.Full:
+                self._counts['dropped'] += 1
+                return
+            self._recent.set(job, True)
+            self._counts['queued'] += 1
+            if self._worker is None:
+                self._worker = threading.Thread(target=self._run, daemon=True)
+                self._worker.start()
+
+    def _run(self):
+        while True:
+            job = self._queue.get()
+            try:
+                with request_priority(BATCH):
+                    self._prefetch(*job)
+                outcome = 'done'
+            except Exception as e:
+                print(f"ERROR: Prefetch of {job} failed: {e}") # Log to console for debugging
+                outcome = 'failed'
+            with self._lock:
+                self._counts[outcome] += 1
+
+    @staticmethod
+    def _prefetch(month, day, language, preferred_decade, topic, difficulty, local_city, local_state_country):
+        content = fetch_daily_content(day, month, preferred_decade=preferred_decade, topic=topic, difficulty=difficulty,
+                                      local_city=local_city, local_state_country=local_state_country)
+        if 'parse_confidence' not in content:
+            # Archive content stands in while generation fails; don't spend the budget translating it
+            raise RuntimeError("daily content could not be generated")
+        translate_content(content, language) # Fills the translation cache; a no-op for English
+
+    def stats(self):
+        with self._lock:
+            return dict(self._counts, enabled=self.enabled, waiting=self._queue.qsize())
+
+
+prefetcher = Prefetcher(PREFETCH_ENABLED, PREFETCH_LANGUAGES, PREFETCH_ADJACENT_DAYS, PREFETCH_DEDUP_SECONDS, PREFETCH_QUEUE_SIZE)
@@ -0,0 +1,170 @@
+"""
+Opt-in per-rerun profiling.
+
+When enabled (PROFILE_RERUNS=1, or the toggle on the admin page), app.py wraps each script
+run in profile_rerun: a background thread samples the script thread's stack every few
+milliseconds, and wall time is split into AI, Sheets, PDF and UI phases (UI being whatever
+is not spent in the other three). Reruns slower than PROFILE_SLOW_RERUN_SECONDS have their
+samples written in the folded-stack format read by flamegraph.pl and speedscope, and the
+slowest reruns are kept in a ring buffer with their page and session context for the admin
+page. When profiling is off, profile_rerun and phase cost a context-variable lookup.
+"""
+import contextvars
+import functools
+import heapq
+import os
+import sys
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+from datetime import datetime
+
+from backend.config import PROFILE_DIR, PROFILE_RERUNS, PROFILE_SAMPLE_INTERVAL_SECONDS, PROFILE_SLOW_RERUN_SECONDS
+
+PHASES = ('ai', 'sheets', 'pdf', 'ui')
+SLOWEST_RERUNS = 20
+
+_current_run = contextvars.ContextVar('profiled_rerun', default=None)
+
+
+class _StackSampler(threading.Thread):
+    """Counts the target thread's stacks, sampled every interval seconds, as folded 'outer;...;inner' strings."""
+
+    def __init__(self, thread_id, interval):
+        super().__init__(daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.samples = Counter()
+        self._stop_event = threading.Event()
+
+    def run(self):
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            stack = []
+            while frame is not None:
+                code = frame.f_code
+                stack.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+                frame = frame.f_back
+            if stack:
+                self.samples[";".join(reversed(stack))] += 1
+
+    def stop(self):
+        self._stop_event.set()
+        self.join()
+
+
+class _RerunProfile:
+    def __init__(self):
+        self.phase_seconds = dict.fromkeys(PHASES, 0.0)
+        self._stack = [] # [phase, started, seconds spent in nested phases]
+        self._lock = threading.Lock() # Phases can also be entered from helper threads
+
+
+class RerunProfiler:
+    """Process-wide profiler settings and the ring buffer of the slowest profiled reruns."""
+
+    def __init__(self, enabled, slow_rerun_seconds, sample_interval, output_dir):
+        self.enabled = enabled
+        self.slow_rerun_seconds = slow_rerun_seconds
+        self.sample_interval = sample_interval
+        self.output_dir = output_dir
+        self._slowest = [] # min-heap of (total_seconds, sequence, record)
+        self._sequence = 0
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def profile_rerun(self, page, context):
+        """Profiles the enclosed script run if profiling is enabled."""
+        if not self.enabled:
+            yield
+            return
+        profile = _RerunProfile()
+        token = _current_run.set(profile)
+        sampler = _StackSampler(threading.get_ident(), self.sample_interval)
+        sampler.start()
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            total = time.perf_counter() - started
+            sampler.stop()
+            _current_run.reset(token)
+            self._record(page, context, total, profile, sampler.samples)
+
+    def _record(self, page, context, total, profile, samples):
+        phases = {name: round(seconds, 4) for name, seconds in profile.phase_seconds.items()}
+        phases['ui'] = round(max(0.0, total - sum(profile.phase_seconds.values())), 4)
+        record = {
+            'time': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            'page': page,
+            'context': context,
+            'total_seconds': round(total, 4),
+            'phase_seconds': phases,
+            'samples': sum(samples.values()),
+            'flamegraph_path': None,
+        }
+        if total >= self.slow_rerun_seconds and samples:
+            record['flamegraph_path'] = self._write_folded(page, samples)
+        with self._lock:
+            self._sequence += 1
+            entry = (total, self._sequence, record)
+            if len(self._slowest) < SLOWEST_RERUNS:
+                heapq.heappush(self._slowest, entry)
+            elif total > self._slowest[0][0]:
+                heapq.heapreplace(self._slowest, entry)
+
+    def _write_folded(self, page, samples):
+        try:
+            os.makedirs(self.output_dir, exist_ok=True)
+            path = os.path.join(self.output_dir, f"{datetime.now().strftime('%Y%m%d-%H%M%S-%f')}-{page}.folded")
+            with open(path, 'w', encoding='utf-8') as folded_file:
+                folded_file.writelines(f"{stack} {count}\n" for stack, count in samples.most_common())
+            return path
+        except OSError as e:
+            print(f"ERROR: Could not write rerun profile: {e}") # Log to console for debugging
+            return None
+
+    def slowest_reruns(self):
+        """The slowest profiled reruns, slowest first."""
+        with self._lock:
+            return [record for _, _, record in sorted(self._slowest, reverse=True)]
+
+    def clear(self):
+        with self._lock:
+            self._slowest.clear()
+
+
+rerun_profiler = RerunProfiler(PROFILE_RERUNS, PROFILE_SLOW_RERUN_SECONDS, PROFILE_SAMPLE_INTERVAL_SECONDS, PROFILE_DIR)
+
+
+@contextmanager
+def phase(name):
+    """Attributes the enclosed time to a phase of the profiled rerun, exclusive of nested phases."""
+    profile = _current_run.get()
+    if profile is None:
+        yield
+        return
+    entry = [name, time.perf_counter(), 0.0]
+    with profile._lock:
+        profile._stack.append(entry)
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - entry[1]
+        with profile._lock:
+            profile._stack.remove(entry)
+            profile.phase_seconds[name] += elapsed - entry[2]
+            if profile._stack:
+                profile._stack[-1][2] += elapsed
+
+
+def in_phase(name):
+    """Decorator form of phase."""
+    def decorator(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with phase(name):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
@@ -0,0 +1,101 @@
+"""
+Durable per-user trivia progress.
+
+The trivia page saves its state for the day (questions, answers, attempts, hints used,
+explanations and score) after every change, and restores it when a session opens the
+page, so a reconnect or a new tab resumes where the user left off without any model call.
+
+Saves are write-behind: they update the latest copy at once, and a background thread
+writes the latest snapshot of each changed user and day to the 'TriviaProgress' worksheet
+every TRIVIA_PROGRESS_FLUSH_SECONDS, in a few Sheets calls. The worksheet keeps one row per
+user and day, overwritten in place, and each flush deletes the rows of days before
+yesterday, which no session restores any more. A failed flush keeps its snapshots for the
+next one, and whatever is pending is flushed when the process exits. Loads are
+served from the latest copy when this server (or, with a shared cache backend, any
+replica) has already seen the user's progress or it is still waiting to be flushed,
+otherwise from the sheet.
+"""
+import atexit
+import json
+import threading
+import time
+from datetime import date, datetime, timedelta
+
+from backend.cache import make_cache
+from backend.config import TRIVIA_PROGRESS_FLUSH_SECONDS
+from backend.sheets import load_trivia_progress, write_trivia_progress_rows
+
+
+class TriviaProgressStore:
+    def __init__(self, flush_seconds, max_entries=10000):
+        self.flush_seconds = flush_seconds
+        self._latest = make_cache('trivia_progress', ttl_seconds=2 * 24 * 60 * 60, max_entries=max_entries) # (username, key) -> state JSON
+        self._pending = {} # (username, key) -> (timestamp, state JSON), not yet in the sheet
+        self._flusher = None
+        self._lock = threading.Lock()
+
+    def save(self, username, progress_key, state):
+        """Records the user's progress for progress_key. Returns False if it had not changed."""
+        state_json = json.dumps(state, sort_keys=True)
+        key = (username, progress_key)
+        if self._latest.get(key) == state_json:
+            return False
+        self._latest.set(key, state_json)
+        with self._lock:
+            self._pending[key] = (datetime.now().strftime("%Y-%m-%d %H:%M:%S"), state_json)
+            if self._flusher is None:
+                self._flusher = threading.Thread(target=self._flush_periodically, daemon=True)
+                self._flusher.start()
+        return True
+
+    def load(self, username, progress_key):
+        """The user's saved progress for progress_key, or None if there is none or it can't be read."""
+        key = (username, progress_key)
+        state_json = self._latest.get(key)
+        if state_json is None:
+            with self._lock:
+                snapshot = self._pending.get(key) # Evicted from the latest copy before it reached the sheet
+            if snapshot is not None:
+                state_json = snapshot[1]
+                self._latest.set(key, state_json)
+                return json.loads(state_json)
+            try:
+                state_json = load_trivia_progress(username, progress_key)
+            except Exception as e:
+                print(f"ERROR: Could not load trivia progress for '{username}': {e}") # Log to console for debugging
+                return None
+            if not state_json:
+                return None
+            self._latest.set(key, state_json)
+        return json.loads(state_json)
+
+    def flush(self):
+        """Writes all pending snapshots to the sheet. Returns how many were written."""
+        with self._lock:
+            batch, self._pending = self._pending, {}
+        if not batch:
+            return 0
+        rows = [[timestamp, username, progress_key, state_json] for (username, progress_key), (timestamp, state_json) in batch.items()]
+        try:
+            # Yesterday's progress is kept for sessions still open across midnight
+            write_trivia_progress_rows(rows, prune_before=(date.today() - timedelta(days=1)).isoformat())
+        except Exception as e:
+            print(f"ERROR: Could not save trivia progress, will retry: {e}") # Log to console for debugging
+            with self._lock:
+                for key, snapshot in batch.items():
+                    self._pending.setdefault(key, snapshot) # A newer save made meanwhile wins
+            return 0
+        return len(rows)
+
+    def _flush_periodically(self):
+        while True:
+            time.sleep(self.flush_seconds)
+            self.flush()
+
+    def pending_count(self):
+        with self._lock:
+            return len(self._pending)
+
+
+trivia_progress = TriviaProgressStore(TRIVIA_PROGRESS_FLUSH_SECONDS)
+atexit.register(trivia_progress.flush)
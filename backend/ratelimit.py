@@ -0,0 +1,129 @@
+"""
+Process-wide OpenAI rate limiter.
+
+Every model call waits here for a request and its estimated tokens from two token buckets
+(requests per minute and tokens per minute) shared by all sessions, so a weekly planner run
+or a pre-generation job cannot use up the account's limit and push interactive page loads
+into 429s. Waiting calls are granted in priority order: INTERACTIVE work (page content,
+translations, answer checks) goes ahead of BATCH work (the weekly planner, background
+cache refreshes and prefetches, offline jobs) whenever both are queued.
+"""
+import contextvars
+import heapq
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+
+from backend.config import OPENAI_REQUESTS_PER_MINUTE, OPENAI_TOKENS_PER_MINUTE
+
+INTERACTIVE = 0
+BATCH = 1
+PRIORITY_NAMES = {INTERACTIVE: 'interactive', BATCH: 'batch'}
+
+_current_priority = contextvars.ContextVar('openai_priority', default=INTERACTIVE)
+
+
+@contextmanager
+def request_priority(priority):
+    """Runs the model calls made inside the block (on this thread) at the given priority."""
+    token = _current_priority.set(priority)
+    try:
+        yield
+    finally:
+        _current_priority.reset(token)
+
+
+def current_priority():
+    return _current_priority.get()
+
+
+class RateLimiter:
+    """
+    Token-bucket limiter for requests and tokens per minute. Both buckets start full and
+    refill continuously; a call takes one request and its estimated tokens, and the estimate
+    is corrected with the actual usage once the response arrives.
+    """
+
+    def __init__(self, requests_per_minute, tokens_per_minute):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self._requests = float(requests_per_minute)
+        self._tokens = float(tokens_per_minute)
+        self._updated = time.monotonic()
+        self._queue = [] # heap of (priority, sequence) tickets
+        self._sequence = itertools.count()
+        self._cond = threading.Condition()
+        self._granted = {priority: 0 for priority in PRIORITY_NAMES}
+        self._wait_seconds = {priority: 0.0 for priority in PRIORITY_NAMES}
+        self._max_queue_depth = 0
+
+    def _refill(self):
+        now = time.monotonic()
+        elapsed_minutes = (now - self._updated) / 60
+        self._updated = now
+        self._requests = min(self.requests_per_minute, self._requests + elapsed_minutes * self.requests_per_minute)
+        self._tokens = min(self.tokens_per_minute, self._tokens + elapsed_minutes * self.tokens_per_minute)
+
+    def _seconds_until_available(self, tokens):
+        request_deficit = max(0.0, 1 - self._requests) / self.requests_per_minute
+        token_deficit = max(0.0, tokens - self._tokens) / self.tokens_per_minute
+        return max(request_deficit, token_deficit) * 60
+
+    def acquire(self, tokens, priority=None):
+        """Blocks until a request and tokens are available and no higher-priority call is waiting."""
+        priority = current_priority() if priority is None else priority
+        tokens = min(tokens, self.tokens_per_minute) # A call larger than the bucket still has to run
+        started = time.monotonic()
+        with self._cond:
+            ticket = (priority, next(self._sequence))
+            heapq.heappush(self._queue, ticket)
+            self._max_queue_depth = max(self._max_queue_depth, len(self._queue))
+            self._cond.notify_all() # A higher-priority arrival takes over the head of the queue
+            try:
+                while True:
+                    self._refill()
+                    if self._queue[0] == ticket:
+                        wait = self._seconds_until_available(tokens)
+                        if wait <= 0:
+                            heapq.heappop(self._queue)
+                            self._requests -= 1
+                            self._tokens -= tokens
+                            self._granted[priority] += 1
+                            self._wait_seconds[priority] += time.monotonic() - started
+                            return
+                        self._cond.wait(timeout=wait)
+                    else:
+                        self._cond.wait()
+            finally:
+                if ticket in self._queue: # Interrupted while waiting
+                    self._queue.remove(ticket)
+                    heapq.heapify(self._queue)
+                self._cond.notify_all()
+
+    def record_usage(self, estimated_tokens, actual_tokens):
+        """Returns over-estimated tokens to the bucket (or takes the shortfall) once usage is known."""
+        with self._cond:
+            self._refill()
+            self._tokens = min(self.tokens_per_minute, self._tokens + estimated_tokens - actual_tokens)
+            self._cond.notify_all()
+
+    def stats(self):
+        """Queue depth per priority, calls granted, mean wait and current bucket levels."""
+        with self._cond:
+            self._refill()
+            waiting = {name: 0 for name in PRIORITY_NAMES.values()}
+            for priority, _ in self._queue:
+                waiting[PRIORITY_NAMES[priority]] += 1
+            return {
+                'queue_depth': waiting,
+                'max_queue_depth': self._max_queue_depth,
+                'granted': {PRIORITY_NAMES[p]: count for p, count in self._granted.items()},
+                'mean_wait_seconds': {PRIORITY_NAMES[p]: (self._wait_seconds[p] / self._granted[p] if self._granted[p] else 0.0)
+                                      for p in PRIORITY_NAMES},
+                'requests_available': round(self._requests, 1),
+                'tokens_available': round(self._tokens),
+            }
+
+
+openai_limiter = RateLimiter(OPENAI_REQUESTS_PER_MINUTE, OPENAI_TOKENS_PER_MINUTE)
@@ -0,0 +1,213 @@
+"""
+Redis-backed shared caches and single-flight locks, for running several replicas.
+
+With CACHE_BACKEND_URL set (see backend/cache.py), the daily-content, translation, trivia,
+PDF and trivia-progress caches live in Redis instead of in each process, and
+generation_flights takes a Redis lock per key, so every replica behind the load balancer
+shares one generation of each piece of content instead of making its own.
+
+- RedisTTLCache has TTLCache's interface. Entries expire in Redis after their fresh and
+  stale windows; Redis' own maxmemory policy, not max_entries, bounds the size. Values are
+  stored as the same compressed JSON blobs as in-process caches, so nothing read from Redis
+  is ever run as code.
+- RedisSingleFlight coalesces calls within the process first, then across replicas: the
+  caller that takes the key's lock runs the computation and publishes its result for a
+  short while; callers on other replicas wait for the lock to go, then take that result.
+  While the computation runs, a heartbeat thread renews the lock every third of
+  CACHE_LOCK_TIMEOUT_SECONDS, however long the model's retries take, so the timeout only
+  bounds how long a replica that died holding the lock blocks the others. If there is no
+  result (the computation failed, or the lock expired first), waiters compute it themselves.
+
+If Redis is unreachable, cache reads are misses, writes are skipped and flights are only
+coalesced within the process; errors are logged and the app keeps working as a single
+replica would.
+
+Any Redis-protocol server works. For local runs, "fakeredis://" uses an in-process
+fakeredis server, and benchmarks/fake_redis.py serves one over TCP for several replicas.
+"""
+import hashlib
+import json
+import threading
+import time
+import uuid
+
+from backend.cache import decode_value, encode_value
+
+_RESULT_TTL_MS = 60 * 1000 # How long a flight's result waits for callers on other replicas
+_POLL_SECONDS = 0.05
+
+
+def connect(url):
+    """A Redis client for url; "fakeredis://" gives an in-process stand-in."""
+    if url.startswith("fakeredis://"):
+        import fakeredis
+        return fakeredis.FakeRedis()
+    import redis
+    return redis.Redis.from_url(url, socket_timeout=5, socket_connect_timeout=5)
+
+
+def _redis_errors():
+    import redis
+    return (redis.RedisError, OSError)
+
+
+def _digest(key):
+    return hashlib.sha256(json.dumps(key, sort_keys=True, default=str).encode('utf-8')).hexdigest()
+
+
+class RedisTTLCache:
+    """TTLCache stored in Redis under "<prefix><name>:<digest of key>"."""
+
+    def __init__(self, client, prefix, name, ttl_seconds, max_entries=1024, stale_ttl_seconds=0):
+        self.client = client
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self.stale_ttl_seconds = stale_ttl_seconds
+        self.max_entries = max_entries # Unused: Redis' maxmemory policy evicts instead
+        self._prefix = f"{prefix}{name}:"
+        self._counts = {'hits': 0, 'misses': 0}
+
+    def get_entry(self, key):
+        """Returns (value, is_fresh) for key, or None if it is missing or past its stale window."""
+        try:
+            payload = self.client.get(self._prefix + _digest(key))
+        except _redis_errors() as e:
+            print(f"ERROR: Redis cache '{self.name}' read failed, treating as a miss: {e}") # Log to console for debugging
+            return None
+        if payload is None:
+            self._counts['misses'] += 1
+            return None
+        self._counts['hits'] += 1
+        fresh_until, value = decode_value(payload)
+        return value, fresh_until >= time.time()
+
+    def get(self, key, default=None):
+        """Returns the cached value for key, or default if it is missing or no longer fresh."""
+        entry = self.get_entry(key)
+        if entry is None or not entry[1]:
+            return default
+        return entry[0]
+
+    def set(self, key, value):
+        """Stores value under key, fresh for ttl_seconds."""
+        payload, _ = encode_value((time.time() + self.ttl_seconds, value))
+        try:
+            self.client.set(self._prefix + _digest(key), payload, px=int((self.ttl_seconds + self.stale_ttl_seconds) * 1000))
+        except _redis_errors() as e:
+            print(f"ERROR: Redis cache '{self.name}' write failed: {e}") # Log to console for debugging
+
+    def values(self):
+        """The values of all fresh entries; none if Redis can't be read."""
+        values = []
+        now = time.time()
+        try:
+            for redis_key in self.client.scan_iter(match=self._prefix + "*", count=500):
+                payload = self.client.get(redis_key)
+                if payload is not None:
+                    fresh_until, value = decode_value(payload)
+                    if fresh_until >= now:
+                        values.append(value)
+        except _redis_errors() as e:
+            print(f"ERROR: Redis cache '{self.name}' scan failed, returning no values: {e}") # Log to console for debugging
+            return []
+        return values
+
+    def stats(self):
+        """This replica's hits and misses; sizes and evictions are Redis' own (see INFO)."""
+        return dict(self._counts)
+
+    def clear(self):
+        try:
+            for redis_key in self.client.scan_iter(match=self._prefix + "*", count=500):
+                self.client.delete(redis_key)
+        except _redis_errors() as e:
+            print(f"ERROR: Redis cache '{self.name}' clear failed: {e}") # Log to console for debugging
+
+
+class RedisSingleFlight:
+    """SingleFlight across replicas, layered on an in-process SingleFlight (see the module docstring)."""
+
+    def __init__(self, client, prefix, local, lock_timeout_seconds):
+        self.client = client
+        self.local = local
+        self.lock_timeout_ms = int(lock_timeout_seconds * 1000)
+        self._prefix = f"{prefix}flight:"
+
+    def is_in_flight(self, key):
+        if self.local.is_in_flight(key):
+            return True
+        try:
+            return bool(self.client.exists(self._prefix + _digest(key) + ":lock"))
+        except _redis_errors():
+            return False
+
+    def do(self, key, fn):
+        """Returns fn() for the first caller with key on any replica, or waits for that caller's result."""
+        return self.local.do(key, lambda: self._do_shared(key, fn))
+
+    def _do_shared(self, key, fn):
+        lock_key = self._prefix + _digest(key) + ":lock"
+        result_key = self._prefix + _digest(key) + ":result"
+        token = uuid.uuid4().hex
+        try:
+            while not self.client.set(lock_key, token, nx=True, px=self.lock_timeout_ms):
+                # Another replica is computing it: wait for its result
+                while self.client.exists(lock_key):
+                    time.sleep(_POLL_SECONDS)
+                payload = self.client.get(result_key)
+                if payload is not None:
+                    return decode_value(payload)
+            payload = self.client.get(result_key) # Finished elsewhere just before this caller got the lock
+        except _redis_errors() as e:
+            print(f"ERROR: Redis lock for a generation failed, computing it on this replica: {e}") # Log to console for debugging
+            return fn()
+        try:
+            if payload is not None:
+                return decode_value(payload)
+            stop_heartbeat = threading.Event()
+            threading.Thread(target=self._renew, args=(lock_key, token, stop_heartbeat), daemon=True).start()
+            try:
+                result = fn()
+            finally:
+                stop_heartbeat.set()
+            try:
+                self.client.set(result_key, encode_value(result)[0], px=_RESULT_TTL_MS)
+            except _redis_errors() as e:
+                print(f"ERROR: Could not publish a generation to other replicas: {e}") # Log to console for debugging
+            return result
+        finally:
+            self._release(lock_key, token)
+
+    def _renew(self, lock_key, token, stop):
+        """Extends the lock while this caller still holds it, until stop is set."""
+        import redis
+        while not stop.wait(self.lock_timeout_ms / 3000):
+            try:
+                with self.client.pipeline() as pipe:
+                    pipe.watch(lock_key)
+                    if pipe.get(lock_key) != token.encode():
+                        return # Expired and taken over; the other holder renews its own
+                    pipe.multi()
+                    pipe.pexpire(lock_key, self.lock_timeout_ms)
+                    pipe.execute()
+            except redis.WatchError:
+                return
+            except _redis_errors() as e:
+                print(f"ERROR: Could not renew a generation lock, will retry: {e}") # Log to console for debugging
+
+    def _release(self, lock_key, token):
+        """Deletes the lock if this caller still holds it (it may have expired and been taken over)."""
+        import redis
+        try:
+            with self.client.pipeline() as pipe:
+                pipe.watch(lock_key)
+                if pipe.get(lock_key) == token.encode():
+                    pipe.multi()
+                    pipe.delete(lock_key)
+                    pipe.execute()
+                else:
+                    pipe.unwatch()
+        except redis.WatchError:
+            pass # Taken over meanwhile; not ours to delete
+        except _redis_errors() as e:
+            print(f"ERROR: Could not release a generation lock; it expires on its own: {e}") # Log to console for debugging
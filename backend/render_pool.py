@@ -0,0 +1,72 @@
+"""
+Worker processes that lay out PDFs for batch jobs.
+
+FPDF layout is pure Python and CPU-bound, so PDFs rendered on threads, as bulk exports do
+(see backend/export.py), take turns on one core under the GIL however fast their content
+arrives. For batch jobs, get_history_pdf(pooled=True) translates the page in the calling
+thread, where the model client, the caches and the rate limiter live, and sends a bundle of
+the content, the page settings and the translations to one of PDF_RENDER_PROCESSES worker
+processes. The worker lays it out with generate_full_history_pdf(translations=...), which
+makes no model calls, and sends back the PDF bytes.
+
+Workers are started on first use with "spawn" rather than fork, since the server process
+runs threads, and import the backend once each. With PDF_RENDER_PROCESSES=0 (the default
+on a single core), or after the pool breaks (a worker was killed), PDFs are laid out in
+the calling thread as before; a broken pool is replaced on the next render.
+"""
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from backend.config import PDF_RENDER_PROCESSES
+
+
+def _render_bundle(bundle):
+    from backend.pdf import generate_full_history_pdf # Here, not at the top: backend.pdf imports this module
+    data, today_date_str, user_info, current_language, custom_masthead_text, translations = bundle
+    return generate_full_history_pdf(data, today_date_str, user_info, current_language, custom_masthead_text, translations=translations)
+
+
+class RenderPool:
+    def __init__(self, processes):
+        self.processes = processes
+        self._executor = None
+        self._lock = threading.Lock()
+        self._counts = {'pooled': 0, 'in_thread': 0, 'pool_failures': 0}
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None and self.processes > 0:
+                self._executor = ProcessPoolExecutor(max_workers=self.processes, mp_context=multiprocessing.get_context('spawn'))
+            return self._executor
+
+    def render(self, data, today_date_str, user_info, current_language, custom_masthead_text, translations):
+        """PDF bytes for a page whose texts are already translated (see backend.pdf.translate_page_texts)."""
+        bundle = (data, today_date_str, user_info, current_language, custom_masthead_text, translations)
+        executor = self._get_executor()
+        if executor is not None:
+            try:
+                pdf_bytes = executor.submit(_render_bundle, bundle).result()
+                self._count('pooled')
+                return pdf_bytes
+            except BrokenProcessPool as e:
+                print(f"ERROR: PDF render pool broke, rendering in this process instead: {e}") # Log to console for debugging
+                with self._lock:
+                    if self._executor is executor:
+                        self._executor = None
+                self._count('pool_failures')
+        pdf_bytes = _render_bundle(bundle)
+        self._count('in_thread')
+        return pdf_bytes
+
+    def _count(self, outcome):
+        with self._lock:
+            self._counts[outcome] += 1
+
+    def stats(self):
+        with self._lock:
+            return dict(self._counts, processes=self.processes)
+
+
+render_pool = RenderPool(PDF_RENDER_PROCESSES)
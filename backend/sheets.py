@@ -0,0 +1,262 @@
+"""Google Sheets helpers: user accounts, login/download logs, scores and feedback."""
+import re
+from datetime import datetime, date
+
+import gspread
+import streamlit as st
+
+from backend.cache import leaderboard_cache
+from backend.clients import get_spreadsheet
+from backend.profiling import in_phase
+
+
+@in_phase('sheets')
+def log_event(event_type, username):
+    """Logs an event (e.g., login, registration) to the 'LoginLogs' worksheet."""
+    try:
+        sheet = get_spreadsheet()
+        try:
+            ws = sheet.worksheet("LoginLogs")
+        except gspread.exceptions.WorksheetNotFound:
+            ws = sheet.add_worksheet(title="LoginLogs", rows="100", cols="3")
+            ws.append_row(["Timestamp", "EventType", "Username"])  # Add headers if new sheet
+        
+        ws.append_row([
+            datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            event_type,
+            username
+        ])
+    except Exception as e:
+        st.warning(f"⚠️ Could not log event '{event_type}' for '{username}': {e}")
+
+
+@in_phase('sheets')
+def save_new_user_to_sheet(username, password, email):
+    """Saves new user credentials to the 'Users' worksheet."""
+    try:
+        sheet = get_spreadsheet()
+        try:
+            ws = sheet.worksheet("Users")
+        except gspread.exceptions.WorksheetNotFound:
+            ws = sheet.add_worksheet(title="Users", rows="100", cols="3")
+            ws.append_row(["Username", "Password", "Email"]) # Add headers if new sheet
+        ws.append_row([username, password, email])
+        return True
+    except Exception as e:
+        st.warning(f"⚠️ Could not register user '{username}': {e}")
+        return False
+
+
+@in_phase('sheets')
+def get_users_from_sheet():
+    """Retrieves all users from the 'Users' worksheet as a dictionary."""
+    print("Attempting to get users from sheet...") # Debugging print
+    try:
+        sheet = get_spreadsheet()
+        try:
+            ws = sheet.worksheet("Users")
+            print("Found 'Users' worksheet.") # Debugging print
+        except gspread.exceptions.WorksheetNotFound:
+            print("❌ 'Users' worksheet not found. Creating it now.") # Debugging print
+            st.warning("⚠️ The 'Users' database was not found. Creating it now. Please retry your registration if this is your first time.")
+            ws = sheet.add_worksheet(title="Users", rows="100", cols="3")
+            ws.append_row(["Username", "Password", "Email"])  # Add headers if new sheet
+            return {} # Return empty dict as no users existed before this operation
+        
+        users_data = ws.get_all_records(head=1)
+        users_dict = {row['Username']: row['Password'] for row in users_data if 'Username' in row and 'Password' in row}
+        print(f"Retrieved users: {list(users_dict.keys())}") # Debugging print
+        return users_dict
+    except Exception as e:
+        print(f"ERROR: Error retrieving users from Google Sheet: {e}") # Debugging print
+        st.error(f"❌ Error retrieving users from Google Sheet: {e}")
+        return {}
+
+
+@in_phase('sheets')
+def log_trivia_score(username, score):
+    """Logs a user's trivia score to the 'History' worksheet."""
+    try:
+        sheet = get_spreadsheet()
+        try:
+            ws = sheet.worksheet("History")
+        except gspread.exceptions.WorksheetNotFound:
+            ws = sheet.add_worksheet(title="History", rows="100", cols="3")
+            ws.append_row(["Username", "Score", "Timestamp"]) # Add headers if new sheet
+        
+        ws.append_row([
+            username,
+            score,
+            datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        ])
+        leaderboard_cache.clear() # The new score may change the top three
+        return True
+    except Exception as e:
+        st.warning(f"⚠️ Could not log trivia score for '{username}': {e}")
+        return False
+
+
+def get_leaderboard_data():
+    """
+    Retrieves and processes scores for the leaderboard. The result is shared through
+    leaderboard_cache for LEADERBOARD_CACHE_SECONDS, so page reruns don't each read the sheet.
+    """
+    leaderboard = leaderboard_cache.get('top')
+    if leaderboard is None:
+        leaderboard = _read_leaderboard()
+        if leaderboard: # Errors and an empty sheet are read again next time
+            leaderboard_cache.set('top', leaderboard)
+    return leaderboard
+
+
+@in_phase('sheets')
+def _read_leaderboard():
+    try:
+        sheet = get_spreadsheet()
+        try:
+            ws = sheet.worksheet("History")
+        except gspread.exceptions.WorksheetNotFound:
+            return {} # No history sheet, no leaderboard
+        
+        scores_data = ws.get_all_records(head=1)
+        
+        user_highest_scores = {}
+        for entry in scores_data:
+            username = entry.get('Username')
+            score = entry.get('Score')
+            
+            # Ensure score is a number and update highest score for this user
+            if username and score is not None:
+                try:
+                    score = int(score) # Convert score to integer
+                    if username not in user_highest_scores or score > user_highest_scores[username]:
+                        user_highest_scores[username] = score
+                except ValueError:
+                    # Handle cases where score might not be a valid integer
+                    continue 
+        
+        # Sort users by highest score in descending order
+        return sorted(user_highest_scores.items(), key=lambda item: item[1], reverse=True)[:3]
+    except Exception as e:
+        st.error(f"❌ Error retrieving leaderboard data: {e}")
+        return {}
+
+
+@in_phase('sheets')
+def log_feedback(username, feedback_message):
+    """Logs user feedback to the 'Feedback' worksheet."""
+    try:
+        sheet = get_spreadsheet()
+        try:
+            ws = sheet.worksheet("Feedback")
+        except gspread.exceptions.WorksheetNotFound:
+            ws = sheet.add_worksheet(title="Feedback", rows="100", cols="3")
+            ws.append_row(["Timestamp", "Username/Contact", "Feedback"]) # Add headers if new sheet
+        
+        ws.append_row([
+            datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            username,
+            feedback_message
+        ])
+        return True
+    except Exception as e:
+        st.warning(f"⚠️ Could not log feedback: {e}")
+        return False
+
+
+@in_phase('sheets')
+def log_pdf_download(username, filename, download_date):
+    """Logs a PDF download event to the 'PDFLogs' worksheet."""
+    try:
+        sheet = get_spreadsheet()
+        try:
+            ws = sheet.worksheet("PDFLogs")
+        except gspread.exceptions.WorksheetNotFound:
+            ws = sheet.add_worksheet(title="PDFLogs", rows="100", cols="4")
+            ws.append_row(["Timestamp", "Username", "Filename", "DownloadDate"]) # Add headers if new sheet
+        
+        ws.append_row([
+            datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            username,
+            filename,
+            download_date.strftime("%Y-%m-%d") if isinstance(download_date, date) else str(download_date)
+        ])
+        # Removed st.success here to manage feedback more centrally with session state
+        return True
+    except Exception as e:
+        # Removed st.warning here to manage feedback more centrally with session state
+        print(f"ERROR: Could not log PDF download for '{username}': {e}") # Log to console for debugging
+        return False
+
+
+_DATED_KEY = re.compile(r'\d{4}-\d{2}-\d{2}')
+
+
+@in_phase('sheets')
+def write_trivia_progress_rows(rows, prune_before=None):
+    """
+    Writes [timestamp, username, progress key, state JSON] rows to the 'TriviaProgress'
+    worksheet, which holds one row per username and progress key: a key's existing row is
+    overwritten and a new key is appended. Rows whose progress key is dated (it starts with
+    YYYY-MM-DD) before prune_before, and older duplicates of a key, are deleted, so the sheet
+    only ever holds recent days. At most five Sheets calls, however many rows. Raises on
+    failure, so the caller can keep the rows and retry.
+    """
+    sheet = get_spreadsheet()
+    try:
+        ws = sheet.worksheet("TriviaProgress")
+    except gspread.exceptions.WorksheetNotFound:
+        ws = sheet.add_worksheet(title="TriviaProgress", rows="100", cols="4")
+        ws.append_row(["Timestamp", "Username", "ProgressKey", "State"]) # Add headers if new sheet
+
+    row_numbers, unwanted = {}, set() # (username, progress key) -> row number; rows to delete
+    for row_number, row in enumerate(ws.get("B:C"), start=1):
+        if row_number == 1 or len(row) < 2:
+            continue
+        key = (row[0], row[1])
+        if key in row_numbers:
+            unwanted.add(row_numbers[key]) # Left by the append-only format; the last row is the latest
+        row_numbers[key] = row_number
+        if prune_before and _DATED_KEY.match(row[1]) and row[1][:10] < prune_before:
+            unwanted.add(row_number)
+
+    updates, new_rows = [], []
+    for row in rows:
+        row_number = row_numbers.get((row[1], row[2]))
+        if row_number is None:
+            new_rows.append(row)
+        else:
+            updates.append({'range': f"A{row_number}:D{row_number}", 'values': [row]})
+            unwanted.discard(row_number) # Still being played, whatever its date
+    if updates:
+        ws.batch_update(updates)
+    if new_rows:
+        ws.append_rows(new_rows)
+    if unwanted:
+        # Bottom up, so each deletion leaves the row numbers of the ones still to go unchanged
+        sheet.batch_update({'requests': [
+            {'deleteDimension': {'range': {'sheetId': ws.id, 'dimension': 'ROWS', 'startIndex': row_number - 1, 'endIndex': row_number}}}
+            for row_number in sorted(unwanted, reverse=True)
+        ]})
+
+
+@in_phase('sheets')
+def load_trivia_progress(username, progress_key):
+    """
+    Returns the saved state JSON for the user and progress key from the 'TriviaProgress'
+    worksheet, or None if there is none. Raises on failure. Only the Username and
+    ProgressKey columns are read to find the row (the sheet holds one per key, and only
+    recent days; see write_trivia_progress_rows), and then only that row's state.
+    """
+    sheet = get_spreadsheet()
+    try:
+        ws = sheet.worksheet("TriviaProgress")
+    except gspread.exceptions.WorksheetNotFound:
+        return None
+    latest_row = None
+    for row_number, row in enumerate(ws.get("B:C"), start=1):
+        if row_number > 1 and row[:2] == [username, progress_key]:
+            latest_row = row_number # Rows written before keys had one row each: the last is the latest
+    if latest_row is None:
+        return None
+    return ws.acell(f"D{latest_row}").value
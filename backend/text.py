@@ -0,0 +1,73 @@
+"""
+Text helpers shared by the PDF renderer and the trivia page.
+
+Content is normalized once, when it enters the app: normalize_content runs over each
+parsed or fallback daily-content bundle before it is cached, and translations are
+normalized before they are cached. Normalizing maps the typographic punctuation the model
+likes (smart quotes, dashes, ellipses, non-breaking spaces) to plain equivalents with a
+single table-driven regex pass and composes accents (NFC). The PDF renderer checks the
+texts it is about to draw, after translation: a page that fits the PDF core fonts (Latin-1)
+is drawn as is, and anything else switches to the configured TTF font instead of
+printing "?".
+"""
+import re
+import unicodedata
+
+_TYPOGRAPHIC_REPLACEMENTS = {
+    '\u2018': "'", '\u2019': "'", '\u201a': "'", '\u201b': "'", '\u2032': "'", # Single quotes, prime
+    '\u201c': '"', '\u201d': '"', '\u201e': '"', '\u201f': '"', '\u2033': '"', # Double quotes, double prime
+    '\u2010': '-', '\u2011': '-', '\u2012': '-', '\u2013': '-', '\u2212': '-', # Hyphens, en dash, minus
+    '\u2014': '--', '\u2015': '--', # Em dash, horizontal bar
+    '\u2026': '...', # Ellipsis
+    '\u2022': '-', '\u2023': '-', '\u2043': '-', # Bullets
+    '\u00a0': ' ', '\u2007': ' ', '\u2009': ' ', '\u202f': ' ', '\u200a': ' ', # Non-breaking and thin spaces
+    '\u200b': '', '\u200c': '', '\u200d': '', '\ufeff': '', # Zero-width characters
+}
+# One pass over the text; about ten times faster than str.translate with the same table, which
+# looks up every character (see the typographic_* stages of benchmarks/run.py)
+_TYPOGRAPHIC_CHARS = re.compile('[' + ''.join(_TYPOGRAPHIC_REPLACEMENTS) + ']')
+
+
+def _replace_typographic(match):
+    return _TYPOGRAPHIC_REPLACEMENTS[match.group()]
+
+
+def normalize_text(text):
+    """Maps typographic punctuation to plain equivalents and composes accents. Non-strings are returned as is."""
+    if not isinstance(text, str) or text.isascii():
+        return text
+    return unicodedata.normalize('NFC', _TYPOGRAPHIC_CHARS.sub(_replace_typographic, text))
+
+
+def is_latin1(text):
+    """Whether a string can be drawn with the PDF core fonts."""
+    try:
+        text.encode('latin-1')
+        return True
+    except UnicodeEncodeError:
+        return False
+
+
+def _normalize_value(value):
+    if isinstance(value, str):
+        return normalize_text(value)
+    if isinstance(value, list):
+        return [_normalize_value(item) for item in value]
+    if isinstance(value, dict):
+        return {key: _normalize_value(item) for key, item in value.items()}
+    return value
+
+
+def normalize_content(data):
+    """Returns a render-ready copy of a daily-content bundle, with every string normalized."""
+    return {key: _normalize_value(value) for key, value in data.items()}
+
+
+def clean_text_for_latin1(text):
+    """Normalizes text and replaces anything still outside Latin-1 with '?', for the PDF core fonts."""
+    if not isinstance(text, str):
+        return text # Return as is if not a string (e.g., list or None)
+    text = normalize_text(text)
+    if is_latin1(text):
+        return text
+    return text.encode('latin-1', errors='replace').decode('latin-1')
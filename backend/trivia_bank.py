@@ -0,0 +1,146 @@
+"""
+Persistent trivia question bank (SQLite), keyed by month-day, difficulty and topic.
+
+The bank is filled offline by scripts/build_trivia_bank.py. Every stored question has
+passed is_quality_question and a near-duplicate check, so the trivia page can draw a
+full set with one indexed query and never waits on the model or shows placeholders.
+"""
+import os
+import random
+import re
+import sqlite3
+from datetime import datetime
+
+from backend.config import TRIVIA_BANK_PATH
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS trivia_questions (
+    id INTEGER PRIMARY KEY,
+    month_day TEXT NOT NULL,         -- 'MM-DD'
+    difficulty TEXT NOT NULL,        -- 'Easy' | 'Medium' | 'Hard'
+    topic TEXT NOT NULL DEFAULT '',  -- '' for general questions
+    question TEXT NOT NULL,
+    answer TEXT NOT NULL,
+    hint TEXT NOT NULL,
+    normalized TEXT NOT NULL,        -- normalize_question(question), used for de-duplication
+    created_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_trivia_bucket ON trivia_questions (month_day, difficulty, topic);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_trivia_unique ON trivia_questions (month_day, normalized);
+"""
+
+_PLACEHOLDERS = {"no question found.", "no question available.", "no answer found.", "no answer available.",
+                 "no hint found.", "no hint available."}
+_STOPWORDS = {"a", "an", "the", "of", "in", "on", "at", "to", "for", "by", "was", "is", "were", "what", "which",
+              "who", "whom", "when", "where", "did", "does", "this", "that", "day", "and", "or", "as", "his", "her"}
+NEAR_DUPLICATE_THRESHOLD = 0.75 # Jaccard similarity of question word sets
+
+
+def month_day_key(month, day):
+    return f"{month:02d}-{day:02d}"
+
+
+def normalize_question(text):
+    """Lowercases, strips punctuation and stopwords; two phrasings of one question normalize alike."""
+    words = re.findall(r"[a-z0-9]+", text.lower())
+    return " ".join(sorted({word for word in words if word not in _STOPWORDS}))
+
+
+def _similarity(normalized_a, normalized_b):
+    words_a, words_b = set(normalized_a.split()), set(normalized_b.split())
+    if not words_a or not words_b:
+        return 0.0
+    return len(words_a & words_b) / len(words_a | words_b)
+
+
+def is_quality_question(item):
+    """Rejects placeholders, empty or overlong fields, and questions that give away their answer."""
+    question = (item.get('question') or '').strip()
+    answer = (item.get('answer') or '').strip()
+    hint = (item.get('hint') or '').strip()
+    if not question or not answer or not hint:
+        return False
+    if {question.lower(), answer.lower(), hint.lower()} & _PLACEHOLDERS:
+        return False
+    if not 10 <= len(question) <= 300 or len(answer) > 120:
+        return False
+    if len(answer) > 3 and answer.lower() in question.lower():
+        return False
+    return hint.lower() != answer.lower()
+
+
+def connect(path=TRIVIA_BANK_PATH, create=False):
+    """Opens the bank. Returns None if it does not exist yet and create is False."""
+    if not create:
+        try:
+            return sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+        except sqlite3.OperationalError:
+            return None
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def add_questions(conn, month, day, difficulty, topic, questions):
+    """
+    Inserts quality-checked questions, skipping any that nearly duplicate a question already
+    banked for the same month-day (any difficulty or topic). Returns the number inserted.
+    """
+    month_day = month_day_key(month, day)
+    existing = [row[0] for row in conn.execute("SELECT normalized FROM trivia_questions WHERE month_day = ?", (month_day,))]
+    inserted = 0
+    for item in questions:
+        if not is_quality_question(item):
+            continue
+        normalized = normalize_question(item['question'])
+        if any(_similarity(normalized, other) >= NEAR_DUPLICATE_THRESHOLD for other in existing):
+            continue
+        conn.execute(
+            "INSERT OR IGNORE INTO trivia_questions (month_day, difficulty, topic, question, answer, hint, normalized, created_at) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (month_day, difficulty, topic or '', item['question'].strip(), item['answer'].strip(), item['hint'].strip(),
+             normalized, datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+        )
+        existing.append(normalized)
+        inserted += 1
+    conn.commit()
+    return inserted
+
+
+def count_questions(conn, month, day, difficulty, topic=None):
+    return conn.execute(
+        "SELECT COUNT(*) FROM trivia_questions WHERE month_day = ? AND difficulty = ? AND topic = ?",
+        (month_day_key(month, day), difficulty, topic or '')
+    ).fetchone()[0]
+
+
+def draw_questions(current_date, difficulty, topic=None, count=5, path=TRIVIA_BANK_PATH):
+    """
+    Draws count questions for the date's month-day and difficulty, or returns [] if the bank
+    cannot supply a full set. Topic questions come first, topped up with general ones.
+    The draw is seeded by the full date, so every user gets the same set on a given day
+    (keeping the leaderboard fair) while the same month-day gets a fresh set each year.
+    """
+    conn = connect(path)
+    if conn is None:
+        return []
+    try:
+        month_day = month_day_key(current_date.month, current_date.day)
+        rng = random.Random(f"{current_date.isoformat()}|{difficulty}|{topic or ''}")
+        chosen = []
+        for bucket_topic in ([topic, ''] if topic else ['']):
+            rows = conn.execute(
+                "SELECT question, answer, hint FROM trivia_questions WHERE month_day = ? AND difficulty = ? AND topic = ? ORDER BY id",
+                (month_day, difficulty, bucket_topic)
+            ).fetchall()
+            rng.shuffle(rows)
+            chosen.extend(rows[:count - len(chosen)])
+            if len(chosen) == count:
+                return [{'question': q, 'answer': a, 'hint': h} for q, a, h in chosen]
+        return []
+    except sqlite3.Error as e:
+        print(f"ERROR: Could not read trivia bank: {e}") # Log to console for debugging
+        return []
+    finally:
+        conn.close()
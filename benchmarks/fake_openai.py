@@ -0,0 +1,121 @@
+"""
+Local stand-in for the OpenAI chat completions endpoint, for load tests and offline runs.
+
+Answers from benchmarks/recorded_responses.json by prompt type (daily content, trivia,
+trivia for all difficulties, local history, translation, yes/no answer checks), after a configurable
+latency, and rejects a configurable share of requests with 429 so the client's retries,
+the rate limiter and the circuit breaker are exercised. Point the app at it with
+OPENAI_BASE_URL=http://127.0.0.1:<port>/v1.
+
+    python -m benchmarks.fake_openai --port 8765 --latency 0.8 --jitter 0.3 --rate-429 0.05
+"""
+import argparse
+import itertools
+import json
+import os
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+RECORDED_RESPONSES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "recorded_responses.json")
+
+
+class FakeOpenAIServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, port=0, latency=0.0, jitter=0.0, rate_429=0.0, seed=0):
+        super().__init__(('127.0.0.1', port), _Handler)
+        with open(RECORDED_RESPONSES_PATH, encoding='utf-8') as recorded_file:
+            recorded = json.load(recorded_file)
+        self.full_responses = itertools.cycle(recorded['full_responses'])
+        self.trivia_block = re.search(r"4\. Trivia Questions:\s*(.*?)\n\s*5\. Did You Know", recorded['full_responses'][0], re.DOTALL).group(1)
+        self.all_difficulties_response = recorded['all_difficulties_response']
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_429 = rate_429
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.counts = {'requests': 0, 'rate_limited': 0}
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}/v1"
+
+    def start(self):
+        """Serves on a daemon thread; returns self."""
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def reply_for(self, prompt):
+        if prompt.startswith("Translate the following text"):
+            target = re.match(r"Translate the following text to (\w+)", prompt).group(1)
+            return f"[{target}] {prompt.split(chr(10) * 2, 1)[-1]}"
+        if 'Respond with "Yes" or "No"' in prompt:
+            return "No"
+        if "each difficulty level" in prompt:
+            return self.all_difficulties_response
+        if "writing trivia" in prompt:
+            return self.trivia_block
+        if "general historical facts about" in prompt:
+            count, place = re.search(r"Provide (\d+) different general historical facts about (.+?) \(", prompt).groups()
+            return "\n".join(f"{index}. In {1800 + 10 * index}, {place} saw an event recorded for offline testing." for index in range(1, int(count) + 1))
+        if "concise, educational article" in prompt:
+            return "This answer is explained by the events of the day, recorded for offline testing."
+        with self.lock:
+            return next(self.full_responses)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def _send_json(self, status, payload, headers=()):
+        body = json.dumps(payload).encode('utf-8')
+        self.send_response(status)
+        self.send_header('content-type', 'application/json')
+        self.send_header('content-length', str(len(body)))
+        for name, value in headers:
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_POST(self):
+        server = self.server
+        request = json.loads(self.rfile.read(int(self.headers.get('content-length', 0))))
+        prompt = request['messages'][-1]['content']
+        with server.lock:
+            server.counts['requests'] += 1
+            rate_limited = server.random.random() < server.rate_429
+            delay = max(0.0, server.latency + server.random.uniform(-server.jitter, server.jitter))
+            if rate_limited:
+                server.counts['rate_limited'] += 1
+        if rate_limited:
+            self._send_json(429, {'error': {'message': 'Rate limit reached (fake server)', 'type': 'requests', 'code': 'rate_limit_exceeded'}},
+                            headers=(('retry-after-ms', '200'),))
+            return
+        time.sleep(delay)
+        reply = server.reply_for(prompt)
+        prompt_tokens, completion_tokens = len(prompt) // 4, len(reply) // 4
+        self._send_json(200, {
+            'id': 'chatcmpl-fake', 'object': 'chat.completion', 'created': int(time.time()), 'model': request['model'],
+            'choices': [{'index': 0, 'message': {'role': 'assistant', 'content': reply}, 'finish_reason': 'stop'}],
+            'usage': {'prompt_tokens': prompt_tokens, 'completion_tokens': completion_tokens, 'total_tokens': prompt_tokens + completion_tokens},
+        })
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds before each reply")
+    parser.add_argument("--jitter", type=float, default=0.0, help="+/- seconds added to the latency at random")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="share of requests rejected with 429, 0..1")
+    args = parser.parse_args()
+    server = FakeOpenAIServer(args.port, args.latency, args.jitter, args.rate_429)
+    print(f"Fake OpenAI listening on {server.base_url}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
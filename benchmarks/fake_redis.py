@@ -0,0 +1,33 @@
+"""
+Local stand-in Redis server for trying the shared cache backend with several replicas.
+
+Serves fakeredis (pip install fakeredis) over TCP; point every replica at it with
+CACHE_BACKEND_URL=redis://127.0.0.1:<port>/0. Nothing is persisted.
+
+    python -m benchmarks.fake_redis --port 6380
+"""
+import argparse
+import threading
+
+
+def start_fake_redis(port=0):
+    """Starts the server on a background thread; returns (server, URL for CACHE_BACKEND_URL)."""
+    from fakeredis import TcpFakeServer
+
+    server = TcpFakeServer(('127.0.0.1', port))
+    server.daemon_threads = True # Don't keep the process alive for open replica connections
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"redis://127.0.0.1:{server.server_address[1]}/0"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=6380)
+    args = parser.parse_args()
+    server, url = start_fake_redis(args.port)
+    print(f"Fake Redis listening on {url}")
+    threading.Event().wait()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+In-memory stand-in for the gspread Spreadsheet used by backend/sheets.py, for load tests.
+
+Implements just the calls the app makes (worksheet, add_worksheet, append_row, append_rows,
+get_all_records, whole-column get, acell, batch_update and row deletion) with an optional
+per-call latency, so Sheets traffic costs roughly what it would without touching a real
+spreadsheet.
+"""
+import itertools
+import threading
+import time
+
+import gspread
+from gspread.utils import a1_range_to_grid_range, a1_to_rowcol
+
+_sheet_ids = itertools.count(1)
+
+
+class FakeWorksheet:
+    def __init__(self, spreadsheet, title):
+        self.title = title
+        self.id = next(_sheet_ids)
+        self._spreadsheet = spreadsheet
+        self._rows = []
+
+    def append_row(self, values, **kwargs):
+        self._spreadsheet.simulate_call()
+        with self._spreadsheet.lock:
+            self._rows.append(list(values))
+
+    def append_rows(self, values, **kwargs):
+        self._spreadsheet.simulate_call()
+        with self._spreadsheet.lock:
+            self._rows.extend(list(row) for row in values)
+
+    def get_all_records(self, head=1, **kwargs):
+        self._spreadsheet.simulate_call()
+        with self._spreadsheet.lock:
+            if len(self._rows) < head:
+                return []
+            header = self._rows[head - 1]
+            return [dict(zip(header, row)) for row in self._rows[head:]]
+
+    def get(self, range_name, **kwargs):
+        """Values of a range such as "B:C" or "A2:D2", as strings, with trailing empty cells dropped like the API."""
+        self._spreadsheet.simulate_call()
+        grid = a1_range_to_grid_range(range_name)
+        with self._spreadsheet.lock:
+            rows = self._rows[grid.get('startRowIndex', 0):grid.get('endRowIndex', len(self._rows))]
+            values = [[str(value) for value in row[grid.get('startColumnIndex', 0):grid.get('endColumnIndex')]] for row in rows]
+        for row in values:
+            while row and row[-1] == '':
+                row.pop()
+        return values
+
+    def acell(self, label, **kwargs):
+        self._spreadsheet.simulate_call()
+        row, col = a1_to_rowcol(label)
+        with self._spreadsheet.lock:
+            values = self._rows[row - 1] if row <= len(self._rows) else []
+            return gspread.cell.Cell(row, col, values[col - 1] if col <= len(values) else None)
+
+    def batch_update(self, data, **kwargs):
+        self._spreadsheet.simulate_call()
+        with self._spreadsheet.lock:
+            for update in data:
+                grid = a1_range_to_grid_range(update['range'])
+                for offset, values in enumerate(update['values']):
+                    row = self._rows[grid['startRowIndex'] + offset]
+                    start = grid.get('startColumnIndex', 0)
+                    row.extend([''] * (start + len(values) - len(row)))
+                    row[start:start + len(values)] = values
+
+
+class FakeSpreadsheet:
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.lock = threading.Lock()
+        self.calls = 0
+        self._worksheets = {}
+
+    def simulate_call(self):
+        with self.lock:
+            self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def batch_update(self, body):
+        """Supports the deleteDimension requests for rows that the app sends."""
+        self.simulate_call()
+        with self.lock:
+            worksheets = {worksheet.id: worksheet for worksheet in self._worksheets.values()}
+            for request in body['requests']:
+                grid = request['deleteDimension']['range']
+                del worksheets[grid['sheetId']]._rows[grid['startIndex']:grid['endIndex']]
+
+    def worksheet(self, title):
+        self.simulate_call()
+        with self.lock:
+            if title not in self._worksheets:
+                raise gspread.exceptions.WorksheetNotFound(title)
+            return self._worksheets[title]
+
+    def add_worksheet(self, title, rows=100, cols=26, **kwargs):
+        self.simulate_call()
+        with self.lock:
+            return self._worksheets.setdefault(title, FakeWorksheet(self, title))
@@ -0,0 +1,251 @@
+"""
+Concurrent-session load test.
+
+Drives N simulated sessions of the real app through Streamlit's AppTest, each on its own
+thread, against benchmarks/fake_openai.py (configurable latency and 429 rate) and the
+in-memory Sheets stand-in in benchmarks/fake_sheets.py. Every session logs in, then reruns
+randomly chosen pages, answering a trivia question now and then. Reports rerun latency
+percentiles per page, throughput, process memory, per-session state size, cache sizes and
+hit rates, and what the fake backends, the rate limiter and the circuit breaker saw.
+
+With --replicas, that many server processes run the sessions side by side against one fake
+OpenAI, sharing their caches and generation locks through a local fake Redis (see
+benchmarks/fake_redis.py), or through --cache-backend; --cache-backend none gives each
+replica its own caches, for comparison.
+
+    python -m benchmarks.load --sessions 20 --reruns 10 --latency 0.8 --rate-429 0.05
+    python -m benchmarks.load --replicas 3 --sessions 5
+"""
+import argparse
+import os
+import random
+import resource
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+
+from PIL import Image # Installed with Streamlit
+
+from benchmarks.fake_openai import FakeOpenAIServer
+from benchmarks.fake_redis import start_fake_redis
+from benchmarks.fake_sheets import FakeSpreadsheet
+
+APP_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app.py")
+PAGES = ('main_app', 'trivia_page')
+
+
+def percentiles(samples):
+    if len(samples) < 2:
+        return {'p50': samples[0] if samples else 0.0, 'p95': samples[0] if samples else 0.0, 'p99': samples[0] if samples else 0.0}
+    cuts = statistics.quantiles(samples, n=100, method='inclusive')
+    return {'p50': cuts[49], 'p95': cuts[94], 'p99': cuts[98]}
+
+
+def current_rss_mib():
+    try:
+        with open('/proc/self/statm') as statm:
+            return int(statm.read().split()[1]) * os.sysconf('SC_PAGE_SIZE') / 2**20
+    except (OSError, ValueError):
+        return None
+
+
+def share_test_runtime(secrets):
+    """
+    AppTest installs a mock Runtime and its own st.secrets for the length of each run and
+    resets both afterwards, which races when sessions run on parallel threads. Install one
+    mock runtime and one set of secrets for the whole process instead, and give AppTest a
+    throwaway Runtime class to assign to.
+    """
+    from unittest.mock import MagicMock
+
+    import streamlit as st
+    import streamlit.testing.v1.app_test as app_test
+    from streamlit.components.v2.component_manager import BidiComponentManager
+    from streamlit.runtime import Runtime
+    from streamlit.runtime.dataframe_source_manager import DataframeSourceManager
+    from streamlit.runtime.caching.storage.dummy_cache_storage import MemoryCacheStorageManager
+    from streamlit.runtime.media_file_manager import MediaFileManager
+    from streamlit.runtime.memory_media_file_storage import MemoryMediaFileStorage
+    from streamlit.runtime.secrets import Secrets
+
+    shared_runtime = MagicMock(spec=Runtime)
+    shared_runtime.media_file_mgr = MediaFileManager(MemoryMediaFileStorage("/mock/media"))
+    shared_runtime.cache_storage_manager = MemoryCacheStorageManager()
+    shared_runtime.dataframe_source_mgr = DataframeSourceManager()
+    shared_runtime.bidi_component_registry = BidiComponentManager()
+    Runtime._instance = shared_runtime
+    app_test.Runtime = type('PerRunRuntime', (), {'_instance': None})
+    st.secrets = Secrets()
+    st.secrets._secrets = dict(secrets)
+
+
+def run_session(index, args, results, errors, sessions):
+    from streamlit.testing.v1 import AppTest
+
+    rng = random.Random(args.seed + index)
+    at = AppTest.from_file(APP_PATH, default_timeout=args.timeout)
+    sessions.append(at)
+    at.session_state['is_authenticated'] = True
+    at.session_state['logged_in_username'] = f"load-user-{index}"
+    at.session_state['preferred_language'] = rng.choice(args.languages)
+    last_page = None
+    for rerun in range(args.reruns):
+        page = rng.choice(args.pages)
+        at.session_state['current_page'] = page
+        started = time.perf_counter()
+        try:
+            answer_boxes = [box for box in at.text_input if box.key == "input_trivia_q_0"] if page == last_page == 'trivia_page' else []
+            check_buttons = [button for button in at.button if button.key == "check_btn_trivia_q_0" and not button.disabled]
+            if answer_boxes and check_buttons and rng.random() < 0.5:
+                answer_boxes[0].input(rng.choice(["The Wright brothers", "No idea"]))
+                check_buttons[0].click().run()
+            else:
+                at.run()
+        except Exception as e:
+            errors.append(f"session {index} rerun {rerun} ({page}): {e}")
+            continue
+        elapsed = time.perf_counter() - started
+        if at.exception:
+            errors.append(f"session {index} rerun {rerun} ({page}): {at.exception[0].message}")
+        results.append((page, elapsed))
+        last_page = page
+
+
+def run_replicas(args):
+    """Runs args.replicas copies of this harness as separate processes against one fake OpenAI."""
+    fake_openai = FakeOpenAIServer(0, args.latency, args.jitter, args.rate_429, args.seed).start()
+    cache_backend = args.cache_backend
+    if cache_backend is None:
+        _, cache_backend = start_fake_redis()
+    env = dict(os.environ, CACHE_BACKEND_URL='' if cache_backend == 'none' else cache_backend)
+    commands = [[sys.executable, "-m", "benchmarks.load", "--openai-base-url", fake_openai.base_url,
+                 "--sessions", str(args.sessions), "--reruns", str(args.reruns), "--pages", ",".join(args.pages),
+                 "--languages", ",".join(args.languages), "--sheets-latency", str(args.sheets_latency),
+                 "--timeout", str(args.timeout), "--seed", str(args.seed + replica * 1000)]
+                for replica in range(args.replicas)]
+    started = time.perf_counter()
+    replicas = [subprocess.Popen(command, env=env, stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True) for command in commands]
+    outputs = [replica.communicate()[0] for replica in replicas]
+    wall = time.perf_counter() - started
+    for index, output in enumerate(outputs):
+        print(f"--- replica {index} ---")
+        report_start = output.find(f"{args.sessions} sessions x") # Skip Streamlit's log lines before the report
+        print(output[report_start:].strip() if report_start != -1 else output.strip())
+    print(f"\n{args.replicas} replicas x {args.sessions} sessions in {wall:.1f}s, cache backend: {cache_backend}")
+    print(f"Fake OpenAI: {fake_openai.counts['requests']} requests from all replicas, {fake_openai.counts['rate_limited']} answered 429")
+    fake_openai.shutdown()
+    return max(replica.returncode for replica in replicas)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=10, help="concurrent simulated sessions")
+    parser.add_argument("--reruns", type=int, default=8, help="reruns per session")
+    parser.add_argument("--pages", default=",".join(PAGES), help="comma-separated pages to visit")
+    parser.add_argument("--languages", default="English,Spanish", help="comma-separated languages, one picked per session")
+    parser.add_argument("--latency", type=float, default=0.5, help="fake OpenAI seconds per reply")
+    parser.add_argument("--jitter", type=float, default=0.2, help="fake OpenAI +/- latency jitter")
+    parser.add_argument("--rate-429", type=float, default=0.0, help="share of fake OpenAI requests answered with 429")
+    parser.add_argument("--sheets-latency", type=float, default=0.05, help="seconds per fake Sheets call")
+    parser.add_argument("--timeout", type=float, default=300, help="seconds allowed per rerun")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--replicas", type=int, default=1, help="server processes to run the sessions in, each with --sessions sessions")
+    parser.add_argument("--cache-backend", help="CACHE_BACKEND_URL shared by the replicas (default: a local fake Redis; 'none' for per-process caches)")
+    parser.add_argument("--openai-base-url", help=argparse.SUPPRESS) # Set for replica processes: use this fake OpenAI
+    args = parser.parse_args()
+    args.pages = [page.strip() for page in args.pages.split(",") if page.strip()]
+    args.languages = [language.strip() for language in args.languages.split(",") if language.strip()]
+    if args.replicas > 1:
+        return run_replicas(args)
+
+    fake_openai = None
+    if args.openai_base_url:
+        os.environ['OPENAI_BASE_URL'] = args.openai_base_url
+    else:
+        fake_openai = FakeOpenAIServer(0, args.latency, args.jitter, args.rate_429, args.seed).start()
+        os.environ['OPENAI_BASE_URL'] = fake_openai.base_url # Read when the shared client is first built
+
+    # Swap in the in-memory spreadsheet and a local logo; both are looked up at call time.
+    import backend.pdf
+    import backend.sheets
+    fake_sheets = FakeSpreadsheet(args.sheets_latency)
+    backend.sheets.get_spreadsheet = lambda: fake_sheets
+    workdir = tempfile.mkdtemp(prefix="tdih-load-")
+    backend.pdf.LOGO_URL = os.path.join(workdir, "logo.png")
+    Image.new('RGB', (400, 120), (40, 80, 160)).save(backend.pdf.LOGO_URL)
+
+    share_test_runtime({'OPENAI_API_KEY': 'sk-load-test', 'GOOGLE_SERVICE_JSON': '{}'})
+
+    from backend.breaker import openai_breaker
+    from backend.cache import cache_stats
+    from backend.content_store import content_store
+    from backend.memory import session_memory_report
+    from backend.metrics import call_metrics
+    from backend.ratelimit import openai_limiter
+
+    results, errors, sessions = [], [], []
+    rss_before = current_rss_mib()
+    threads = [threading.Thread(target=run_session, args=(index, args, results, errors, sessions)) for index in range(args.sessions)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    wall = time.perf_counter() - started
+
+    by_page = defaultdict(list)
+    for page, elapsed in results:
+        by_page[page].append(elapsed)
+    if fake_openai is not None:
+        print(f"{args.sessions} sessions x {args.reruns} reruns, fake OpenAI {args.latency}s ±{args.jitter}s, 429 rate {args.rate_429:.0%}")
+    else:
+        print(f"{args.sessions} sessions x {args.reruns} reruns, OpenAI at {args.openai_base_url}")
+    print(f"{'page':<16}{'reruns':>8}{'p50 s':>9}{'p95 s':>9}{'p99 s':>9}{'max s':>9}")
+    for page, samples in sorted(by_page.items()) + [('all', [elapsed for _, elapsed in results])]:
+        stats = percentiles(samples)
+        print(f"{page:<16}{len(samples):>8}{stats['p50']:>9.3f}{stats['p95']:>9.3f}{stats['p99']:>9.3f}{max(samples, default=0.0):>9.3f}")
+    print(f"\nThroughput: {len(results) / wall:.2f} reruns/s over {wall:.1f}s")
+    rss_after = current_rss_mib()
+    if rss_after is not None:
+        print(f"Process RSS: {rss_before:.0f} MiB before, {rss_after:.0f} MiB after, "
+              f"{resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024:.0f} MiB peak")
+    reports = [session_memory_report(at.session_state.to_dict()) for at in sessions]
+    if reports:
+        totals = [report['total_bytes'] for report in reports]
+        largest = defaultdict(int)
+        for report in reports:
+            for key, size in report['keys'].items():
+                largest[key] += size
+        print(f"Session state: {statistics.mean(totals) / 1024:.1f} KiB mean, {max(totals) / 1024:.1f} KiB max per session; largest keys (mean KiB): "
+              + ", ".join(f"{key} {size / len(reports) / 1024:.1f}" for key, size in sorted(largest.items(), key=lambda item: item[1], reverse=True)[:4]))
+    store = content_store.stats()
+    print(f"Shared content store: {store['entries']} entries, {store['bytes'] / 1024:.1f} KiB")
+    print("Caches: " + "; ".join(
+        f"{name} {stats['hits']}/{stats['hits'] + stats['misses']} hits"
+        + (f", {stats['entries']} entries, {stats['bytes'] / 1024:.1f} KiB, x{stats['compression_ratio']} compressed, {stats['evictions']} evicted"
+           if stats.get('bytes') is not None else "")
+        for name, stats in cache_stats().items()))
+    if fake_openai is not None:
+        print(f"Fake OpenAI: {fake_openai.counts['requests']} requests, {fake_openai.counts['rate_limited']} answered 429")
+    print(f"Fake Sheets: {fake_sheets.calls} calls")
+    summary = call_metrics.summary()
+    print(f"AI helper calls: {sum(s['calls'] for s in summary.values())}, "
+          f"served without a model call: {sum(s['cache_hits'] for s in summary.values())}, "
+          f"model calls: {sum(s['model_calls'] for s in summary.values())}")
+    print(f"Rate limiter: {openai_limiter.stats()}")
+    print(f"Circuit breaker: {openai_breaker.stats()}")
+    if errors:
+        print(f"\n{len(errors)} errors; first few:")
+        for error in errors[:5]:
+            print(f"  {error}")
+    if fake_openai is not None:
+        fake_openai.shutdown()
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
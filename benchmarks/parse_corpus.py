@@ -0,0 +1,65 @@
+"""
+Runs the daily-content parser over a corpus of saved model responses and reports each
+section's parse confidence, to find heading and list variants the parser misses.
+
+The corpus is the full and variant responses in benchmarks/recorded_responses.json, plus
+the daily-content replies in any cassette files given (see backend/cassette.py).
+
+    python -m benchmarks.parse_corpus
+    python -m benchmarks.parse_corpus data/cassettes/openai.jsonl --show 5
+"""
+import argparse
+import json
+import os
+import sys
+
+from backend.parser import SECTIONS, parse_history_response
+
+RECORDED_RESPONSES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "recorded_responses.json")
+DAILY_CONTENT_PROMPT = "generating 'This Day in History' facts"
+
+
+def load_corpus(cassette_paths):
+    """Returns [(source, response text)]."""
+    with open(RECORDED_RESPONSES_PATH, encoding='utf-8') as recorded_file:
+        recorded = json.load(recorded_file)
+    corpus = [(f"recorded:{group}[{index}]", response)
+              for group in ('full_responses', 'variant_responses')
+              for index, response in enumerate(recorded.get(group, []))]
+    for path in cassette_paths:
+        with open(path, encoding='utf-8') as cassette_file:
+            for line_number, line in enumerate(cassette_file, 1):
+                if line.strip():
+                    entry = json.loads(line)
+                    if DAILY_CONTENT_PROMPT in entry['prompt']:
+                        corpus.append((f"{path}:{line_number}", entry['reply']))
+    return corpus
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("cassettes", nargs="*", help="cassette JSON-lines files to include")
+    parser.add_argument("--show", type=int, default=3, help="how many of the lowest-scoring responses to list")
+    parser.add_argument("--threshold", type=float, default=0.5, help="confidence below which a section counts as weak")
+    args = parser.parse_args()
+
+    results = [(source, parse_history_response(response)['parse_confidence']) for source, response in load_corpus(args.cassettes)]
+    if not results:
+        print("No daily-content responses found.")
+        return 1
+    print(f"{len(results)} responses")
+    print(f"{'section':<24}{'mean':>8}{'min':>8}{'weak':>8}{'missing':>9}")
+    for key, _, _ in SECTIONS:
+        scores = [confidence[key] for _, confidence in results]
+        print(f"{key:<24}{sum(scores) / len(scores):>8.2f}{min(scores):>8.2f}"
+              f"{sum(score < args.threshold for score in scores):>8}{sum(score == 0 for score in scores):>9}")
+    if args.show:
+        print("\nLowest-scoring responses:")
+        for source, confidence in sorted(results, key=lambda result: sum(result[1].values()))[:args.show]:
+            weak = ", ".join(f"{key} {score}" for key, score in confidence.items() if score < args.threshold) or "none weak"
+            print(f"  {source}: {weak}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
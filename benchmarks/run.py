@@ -0,0 +1,150 @@
+"""
+Benchmarks for the CPU-bound paths: trivia entry parsing, the daily-response section regexes,
+Latin-1 text cleaning, PDF rendering and the weekly ZIP. The typographic_* stages time
+backend/text.py's regex replacement of typographic punctuation against str.translate with the
+same table, the alternative it was chosen over.
+
+Every stage runs offline on the recorded model responses in benchmarks/recorded_responses.json.
+Translation is replaced by a lookup of recorded strings and the logo by a local image, so no
+OpenAI, Google Sheets or network access is needed. Each stage reports throughput (best of
+--repeat runs) and peak traced memory, and is compared against benchmarks/baseline.json:
+the run fails if a stage is more than --tolerance slower or uses that much more memory.
+
+    python -m benchmarks.run                      # compare against the baseline
+    python -m benchmarks.run --update-baseline    # record this machine's numbers as the baseline
+    python -m benchmarks.run --stage pdf_english  # run selected stages only
+"""
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from PIL import Image # Installed with Streamlit
+
+import backend.pdf
+from backend.parser import parse_history_response, parse_single_trivia_entry
+from backend.text import _TYPOGRAPHIC_CHARS, _TYPOGRAPHIC_REPLACEMENTS, _replace_typographic, clean_text_for_latin1, normalize_content
+
+BENCHMARK_DIR = os.path.dirname(os.path.abspath(__file__))
+RECORDED_RESPONSES_PATH = os.path.join(BENCHMARK_DIR, "recorded_responses.json")
+BASELINE_PATH = os.path.join(BENCHMARK_DIR, "baseline.json")
+
+USER_INFO = {'name': 'Benchmark User', 'jobs': '', 'hobbies': '', 'decade': '', 'life_experiences': '', 'college_chapter': ''}
+
+
+def _install_offline_stubs(recorded, workdir):
+    """Points the PDF renderer at recorded translations and a local logo instead of the network."""
+    labels = recorded['spanish_labels']
+    backend.pdf.translate_text_checked = lambda text, language: (text if language == 'English' else labels.get(text, text), False)
+    logo_path = os.path.join(workdir, "logo.png")
+    Image.new('RGB', (400, 120), (40, 80, 160)).save(logo_path)
+    backend.pdf.LOGO_URL = logo_path
+
+
+def build_stages(recorded):
+    """Returns {stage name: (function running one batch, items per batch, unit)}."""
+    responses = recorded['full_responses']
+    trivia_lines = recorded['trivia_lines']
+    daily_contents = [normalize_content(parse_history_response(response)) for response in responses]
+    texts = [text for content in daily_contents for text in (content['event_article'], content['born_article'], content['fun_fact_section'])]
+    texts += recorded['unicode_samples']
+    raw_texts = responses + recorded['unicode_samples'] # As the model wrote them, before normalization
+    typographic_table = str.maketrans(_TYPOGRAPHIC_REPLACEMENTS)
+
+    def render_week(language):
+        return [(f"This_Day_in_History_{index}.pdf",
+                 backend.pdf.generate_full_history_pdf(daily_contents[index % len(daily_contents)], "December 17, 1903", USER_INFO, language))
+                for index in range(7)]
+
+    week = render_week('English')
+    return {
+        'parse_single_trivia_entry': (lambda: [parse_single_trivia_entry(line) for line in trivia_lines], len(trivia_lines), "entries"),
+        'parse_history_response': (lambda: [parse_history_response(response) for response in responses], len(responses), "responses"),
+        'clean_text_for_latin1': (lambda: [clean_text_for_latin1(text) for text in texts], len(texts), "strings"),
+        'typographic_regex': (lambda: [_TYPOGRAPHIC_CHARS.sub(_replace_typographic, text) for text in raw_texts], len(raw_texts), "strings"),
+        'typographic_translate': (lambda: [text.translate(typographic_table) for text in raw_texts], len(raw_texts), "strings"),
+        'pdf_english': (lambda: backend.pdf.generate_full_history_pdf(daily_contents[0], "December 17, 1903", USER_INFO, 'English'), 1, "PDFs"),
+        'pdf_translated': (lambda: backend.pdf.generate_full_history_pdf(daily_contents[0], "December 17, 1903", USER_INFO, 'Spanish'), 1, "PDFs"),
+        'weekly_zip': (lambda: backend.pdf.build_pdf_zip(week), 1, "archives"),
+        'weekly_render_and_zip': (lambda: backend.pdf.build_pdf_zip(render_week('English')), 1, "weeks"),
+    }
+
+
+def measure(run_batch, items_per_batch, repeat, min_seconds=0.2):
+    """Best-of-repeat throughput (items/s) and peak traced memory (KiB) of one batch."""
+    run_batch() # Warm-up: regex caches, font metrics, imports
+    best = float('inf')
+    for _ in range(repeat):
+        batches, started = 0, time.perf_counter()
+        while True:
+            run_batch()
+            batches += 1
+            elapsed = time.perf_counter() - started
+            if elapsed >= min_seconds:
+                break
+        best = min(best, elapsed / batches)
+    tracemalloc.start()
+    run_batch()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return items_per_batch / best, peak / 1024
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--stage", action="append", help="run only this stage (repeatable)")
+    parser.add_argument("--repeat", type=int, default=5, help="timed runs per stage; the best one counts")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="allowed slowdown or memory growth, as a fraction")
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--update-baseline", action="store_true", help="write this run's results as the new baseline")
+    args = parser.parse_args()
+
+    with open(RECORDED_RESPONSES_PATH, encoding='utf-8') as recorded_file:
+        recorded = json.load(recorded_file)
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding='utf-8') as baseline_file:
+            baseline = json.load(baseline_file)
+
+    with tempfile.TemporaryDirectory() as workdir:
+        _install_offline_stubs(recorded, workdir)
+        stages = build_stages(recorded)
+        unknown = set(args.stage or ()) - set(stages)
+        if unknown:
+            parser.error(f"unknown stage(s): {', '.join(sorted(unknown))}; choose from {', '.join(stages)}")
+
+        results, regressions = {}, []
+        print(f"{'stage':<28}{'throughput':>22}{'peak memory':>14}{'vs baseline':>14}")
+        for name, (run_batch, items_per_batch, unit) in stages.items():
+            if args.stage and name not in args.stage:
+                continue
+            throughput, peak_kib = measure(run_batch, items_per_batch, args.repeat)
+            results[name] = {'throughput': round(throughput, 2), 'unit': f"{unit}/s", 'peak_kib': round(peak_kib, 1)}
+            comparison = ""
+            if name in baseline:
+                ratio = throughput / baseline[name]['throughput']
+                comparison = f"{ratio:.2f}x"
+                if ratio < 1 - args.tolerance:
+                    regressions.append(f"{name}: {throughput:.1f} {unit}/s is {1 - ratio:.0%} below the baseline {baseline[name]['throughput']}")
+                if peak_kib > baseline[name]['peak_kib'] * (1 + args.tolerance):
+                    regressions.append(f"{name}: peak memory {peak_kib:.0f} KiB is above the baseline {baseline[name]['peak_kib']} KiB")
+            print(f"{name:<28}{throughput:>14.1f} {unit + '/s':<10}{peak_kib:>9.0f} KiB{comparison:>14}")
+
+    if args.update_baseline:
+        baseline.update(results)
+        with open(args.baseline, 'w', encoding='utf-8') as baseline_file:
+            json.dump(baseline, baseline_file, indent=2)
+            baseline_file.write("\n")
+        print(f"Baseline written to {args.baseline}")
+        return 0
+    if regressions:
+        print("\nRegressions:\n" + "\n".join(f"  {regression}" for regression in regressions))
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+"""
+Offline job that builds the local "on this day" knowledge base (see backend/knowledge_base.py)
+from the Wikimedia "On this day" feed.
+
+For every month-day in the range it downloads the day's selected events, events and births,
+keeps those inside the year ranges the app asks for, and stores each with a one-line
+summary and the extract of its main linked article. Re-running adds new facts only.
+
+    python -m scripts.build_knowledge_base --start 01-01 --end 12-31
+"""
+import argparse
+import json
+import time
+import urllib.request
+
+from backend.config import KNOWLEDGE_BASE_PATH
+from backend.knowledge_base import BIRTH_YEARS, EVENT_YEARS, add_facts, connect
+from scripts.build_trivia_bank import iter_month_days
+
+FEED_URL = "https://api.wikimedia.org/feed/v1/wikipedia/en/onthisday/all/{month:02d}/{day:02d}"
+USER_AGENT = "this-day-in-history-kb-builder/1.0"
+
+
+def fetch_day(month, day):
+    """Returns the parsed feed for a month-day."""
+    request = urllib.request.Request(FEED_URL.format(month=month, day=day), headers={"User-Agent": USER_AGENT})
+    with urllib.request.urlopen(request, timeout=30) as response:
+        return json.load(response)
+
+
+def to_facts(entries, year_range):
+    """Converts feed entries to fact dicts, dropping those outside year_range."""
+    facts = []
+    for entry in entries:
+        year = entry.get('year')
+        if not isinstance(year, int) or not year_range[0] <= year <= year_range[1]:
+            continue
+        pages = entry.get('pages') or []
+        detail = pages[0].get('extract', '') if pages else ''
+        facts.append({'year': year, 'text': entry['text'].strip(), 'detail': detail.strip()})
+    return facts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--start", default="01-01", help="first month-day, MM-DD")
+    parser.add_argument("--end", default="12-31", help="last month-day, MM-DD")
+    parser.add_argument("--db", default=KNOWLEDGE_BASE_PATH)
+    parser.add_argument("--pause", type=float, default=0.5, help="seconds between feed requests")
+    args = parser.parse_args()
+
+    conn = connect(args.db, create=True)
+    try:
+        for month, day in iter_month_days(args.start, args.end):
+            try:
+                feed = fetch_day(month, day)
+            except Exception as e:
+                print(f"{month:02d}-{day:02d}: download failed: {e}")
+                time.sleep(args.pause * 4)
+                continue
+            events = to_facts(feed.get('selected', []) + feed.get('events', []), EVENT_YEARS)
+            births = to_facts(feed.get('births', []), BIRTH_YEARS)
+            added_events = add_facts(conn, month, day, 'event', events)
+            added_births = add_facts(conn, month, day, 'birth', births)
+            print(f"{month:02d}-{day:02d}: added {added_events} events, {added_births} births")
+            time.sleep(args.pause)
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Offline batch job that fills the trivia question bank (see backend/trivia_bank.py).
+
+For every month-day in the range it asks the model for all three difficulties in one call,
+then stores the questions that pass the quality check and are not near-duplicates of
+questions already banked for that month-day. Re-running tops buckets up; it never
+deletes anything.
+
+    python -m scripts.build_trivia_bank --start 01-01 --end 12-31 --topics None,Sports,Music --target 15
+
+The OpenAI key is read from .streamlit/secrets.toml, as for the app.
+"""
+import argparse
+import time
+from datetime import date, timedelta
+
+from backend.ai import generate_trivia_for_all_difficulties
+from backend.config import DIFFICULTIES, TOPICS, TRIVIA_BANK_PATH
+from backend.trivia_bank import add_questions, connect, count_questions
+
+
+def iter_month_days(start, end):
+    """Yields (month, day) from start to end inclusive ('MM-DD'), using a leap year so 02-29 is covered."""
+    current = date(2024, *map(int, start.split('-')))
+    last = date(2024, *map(int, end.split('-')))
+    while current <= last:
+        yield current.month, current.day
+        current += timedelta(days=1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--start", default="01-01", help="first month-day, MM-DD")
+    parser.add_argument("--end", default="12-31", help="last month-day, MM-DD")
+    parser.add_argument("--topics", default="None", help=f"comma-separated topics from {TOPICS}")
+    parser.add_argument("--target", type=int, default=15, help="stop generating for a bucket once it holds this many questions")
+    parser.add_argument("--max-rounds", type=int, default=4, help="generation attempts per month-day and topic")
+    parser.add_argument("--db", default=TRIVIA_BANK_PATH)
+    parser.add_argument("--pause", type=float, default=0.5, help="seconds between API calls")
+    args = parser.parse_args()
+
+    topics = [None if topic == "None" else topic for topic in args.topics.split(",")]
+    conn = connect(args.db, create=True)
+    try:
+        for month, day in iter_month_days(args.start, args.end):
+            for topic in topics:
+                for _ in range(args.max_rounds):
+                    if all(count_questions(conn, month, day, level, topic) >= args.target for level in DIFFICULTIES):
+                        break
+                    try:
+                        generated = generate_trivia_for_all_difficulties(day, month, topic)
+                    except Exception as e:
+                        print(f"{month:02d}-{day:02d} {topic or 'general'}: generation failed: {e}")
+                        time.sleep(args.pause * 4)
+                        continue
+                    inserted = {level: add_questions(conn, month, day, level, topic, questions) for level, questions in generated.items()}
+                    print(f"{month:02d}-{day:02d} {topic or 'general'}: added {inserted}")
+                    time.sleep(args.pause)
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""
+Offline bulk export of a date range to one ZIP of daily PDFs (see backend/export.py).
+
+The same export as the weekly planner page, without its EXPORT_MAX_DAYS limit, for a
+whole quarter or year at once. Re-running the same command resumes it: days already in
+the archive are skipped. Prints each day as it lands and the throughput at the end.
+
+    python -m scripts.export_range --start 2025-10-01 --end 2025-12-31 --language Spanish --workers 8
+
+The OpenAI key is read from .streamlit/secrets.toml, as for the app.
+"""
+import argparse
+import time
+from datetime import date
+
+from backend.config import DIFFICULTIES, EXPORT_WORKERS, LANGUAGES
+from backend.export import archive_path, export_date_range
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--start", required=True, help="first day, YYYY-MM-DD")
+    parser.add_argument("--end", required=True, help="last day, YYYY-MM-DD")
+    parser.add_argument("--name", default="Activity Director", help="name printed on the pages")
+    parser.add_argument("--language", default="English", choices=LANGUAGES)
+    parser.add_argument("--masthead", default=None, help="custom masthead text")
+    parser.add_argument("--topic", default=None)
+    parser.add_argument("--decade", default=None)
+    parser.add_argument("--difficulty", default="Medium", choices=DIFFICULTIES)
+    parser.add_argument("--city", default=None)
+    parser.add_argument("--state-country", default=None)
+    parser.add_argument("--workers", type=int, default=EXPORT_WORKERS, help="days processed at once")
+    parser.add_argument("--output", default=None, help="archive path (default: under EXPORT_DIR, named after the settings)")
+    args = parser.parse_args()
+
+    start, end = date.fromisoformat(args.start), date.fromisoformat(args.end)
+    user_info = {'name': args.name, 'jobs': '', 'hobbies': '', 'decade': '', 'life_experiences': '', 'college_chapter': ''}
+    preferences = {'topic': args.topic, 'preferred_decade': args.decade, 'difficulty': args.difficulty,
+                   'local_city': args.city, 'local_state_country': args.state_country}
+    path = args.output or archive_path(start, end, user_info, args.language, args.masthead, **preferences)
+
+    counts = {'resumed': 0, 'exported': 0, 'failed': 0}
+    started = time.monotonic()
+    for day, outcome, error in export_date_range(path, start, end, user_info, args.language, args.masthead, workers=args.workers, **preferences):
+        counts[outcome] += 1
+        print(f"{day}: {outcome}{f' ({error})' if error else ''}")
+    elapsed = time.monotonic() - started
+    print(f"{path}: {counts['exported']} exported, {counts['resumed']} already there, {counts['failed']} failed "
+          f"in {elapsed:.1f}s ({counts['exported'] / elapsed * 60:.0f} pages/min)")
+
+
+if __name__ == "__main__":
+    main()
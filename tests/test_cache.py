@@ -0,0 +1,144 @@
+import pytest
+
+import backend.cache
+from backend.cache import MemoryBudget, TTLCache, decode_value, encode_value
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(backend.cache.time, 'monotonic', fake)
+    return fake
+
+
+def _entry_size(value):
+    """The bytes one entry with this value (and a one-letter key) charges to a budget."""
+    budget = MemoryBudget(10 ** 9)
+    TTLCache(60, budget=budget).set('k', value)
+    return budget.used_bytes
+
+
+@pytest.mark.parametrize("value", [
+    "plain text",
+    "ünïcödé — “quotes”",
+    {'trivia_section': [{'question': "Q?", 'answer': "A", 'hint': "H"}], 'parse_confidence': {'event_article': 0.8}},
+    b"%PDF-1.3 binary \x00\xff",
+    ("pool", 3, None, True),
+    ["x" * 5000], # Compressed
+])
+def test_values_round_trip(value):
+    blob, serialized_size = encode_value(value)
+    assert decode_value(blob) == value
+    assert serialized_size > 0
+
+
+def test_large_values_are_compressed():
+    blob, serialized_size = encode_value("history " * 2000)
+    assert blob[:1] == b'z'
+    assert len(blob) < serialized_size
+
+
+def test_dicts_with_non_string_keys_are_refused():
+    with pytest.raises(TypeError):
+        encode_value({1: "one"})
+
+
+def test_entries_expire_after_their_stale_window(clock):
+    cache = TTLCache(10, stale_ttl_seconds=5)
+    cache.set('k', "v")
+    clock.now += 9
+    assert cache.get('k') == "v"
+    clock.now += 2
+    assert cache.get('k') is None # No longer fresh
+    assert cache.get_entry('k') == ("v", False)
+    clock.now += 5
+    assert cache.get_entry('k') is None
+    assert cache.stats()['expirations'] == 1
+
+
+def test_max_entries_evicts_the_least_recently_used(clock):
+    cache = TTLCache(60, max_entries=2)
+    cache.set('a', 1)
+    cache.set('b', 2)
+    cache.get('a')
+    cache.set('c', 3)
+    assert cache.get('b') is None
+    assert (cache.get('a'), cache.get('c')) == (1, 3)
+    assert cache.stats()['evictions'] == 1
+
+
+def test_cached_values_are_copies_with_a_budget(clock):
+    cache = TTLCache(60, budget=MemoryBudget(10 ** 6))
+    cache.set('k', ["a"])
+    cache.get('k').append("b")
+    assert cache.get('k') == ["a"]
+
+
+def test_lru_budget_evicts_across_caches(clock):
+    size = _entry_size("x" * 100)
+    budget = MemoryBudget(3 * size, policy='lru')
+    pdfs, translations = TTLCache(60, budget=budget), TTLCache(60, budget=budget)
+    pdfs.set('p', "x" * 100)
+    clock.now += 1
+    translations.set('t', "x" * 100)
+    clock.now += 1
+    pdfs.set('q', "x" * 100)
+    clock.now += 1
+    translations.set('u', "x" * 100) # Over budget: the oldest entry of either cache goes
+    assert pdfs.get('p') is None
+    assert translations.get('t') == "x" * 100
+    assert budget.used_bytes <= budget.max_bytes
+
+
+def test_lfu_budget_keeps_hot_entries(clock):
+    size = _entry_size("x" * 100)
+    budget = MemoryBudget(2 * size, policy='lfu')
+    labels, pdfs = TTLCache(60, budget=budget), TTLCache(60, budget=budget)
+    labels.set('l', "x" * 100)
+    for _ in range(5):
+        labels.get('l')
+    clock.now += 1
+    pdfs.set('p', "x" * 100)
+    clock.now += 1
+    pdfs.set('q', "x" * 100) # 'l' is the least recent, but the most used
+    assert labels.get('l') == "x" * 100
+    assert pdfs.get('p') is None
+    assert pdfs.get('q') == "x" * 100
+
+
+def test_budget_evicts_expired_entries_first(clock):
+    size = _entry_size("x" * 100)
+    budget = MemoryBudget(2 * size + size // 2, policy='lfu') # Room for two entries, whatever their keys
+    short, long = TTLCache(5, budget=budget), TTLCache(60, budget=budget)
+    long.set('old', "x" * 100)
+    clock.now += 1
+    short.set('expiring', "x" * 100)
+    for _ in range(5):
+        short.get('expiring')
+    clock.now += 10
+    long.set('new', "x" * 100)
+    assert long.get('old') == "x" * 100
+    assert short.get_entry('expiring') is None
+
+
+def test_removed_entries_are_refunded_to_the_budget(clock):
+    budget = MemoryBudget(10 ** 6)
+    cache = TTLCache(60, budget=budget)
+    cache.set('k', "v" * 100)
+    cache.set('k', "w" * 100)
+    assert budget.used_bytes == _entry_size("v" * 100)
+    cache.clear()
+    assert budget.used_bytes == 0
+
+
+def test_unknown_eviction_policy_is_refused():
+    with pytest.raises(ValueError):
+        MemoryBudget(1024, policy='fifo')
@@ -0,0 +1,46 @@
+import pytest
+
+from backend.localities import canonical_locality
+
+
+@pytest.mark.parametrize("city, state_country, expected", [
+    ("pittsburgh", "pennsylvania", ("Pittsburgh", "Pennsylvania")),
+    ("Pittsburgh ", " Pennsylvania, USA", ("Pittsburgh", "Pennsylvania")),
+    ("PITTSBURGH", "P.A., u.s.a.", ("Pittsburgh", "Pennsylvania")),
+    ("austin", "tx", ("Austin", "Texas")),
+    ("Austin", "Texas, United States", ("Austin", "Texas")),
+    ("st.  louis", "Missouri", ("St. Louis", "Missouri")),
+    ("Washington", "d.c.", ("Washington", "District of Columbia")),
+    ("pittsburgh", "pa", ("Pittsburgh", "Pennsylvania")),
+    ("Pittsburgh", "Penn.", ("Pittsburgh", "Pennsylvania")),
+    ("Los Angeles", "Calif.", ("Los Angeles", "California")),
+    ("Boston", "MA", ("Boston", "Massachusetts")),
+    ("Charleston", "W. Va.", ("Charleston", "West Virginia")),
+    ("Paris", "IN", ("Paris", "Indiana")),
+])
+def test_us_spellings_share_one_locality(city, state_country, expected):
+    assert canonical_locality(city, state_country) == expected
+
+
+@pytest.mark.parametrize("city, state_country, expected", [
+    ("Berlin", "DE", ("Berlin", "DE")),
+    ("Mumbai", "in", ("Mumbai", "IN")),
+    ("Toronto", "CA", ("Toronto", "CA")),
+    ("Paris", "France", ("Paris", "France")),
+    ("Vancouver", "BC, Canada", ("Vancouver", "BC, Canada")),
+    ("vancouver", "bc, canada", ("Vancouver", "BC, Canada")),
+    ("London", "UK", ("London", "UK")),
+    ("Toronto", "ontario, canada", ("Toronto", "Ontario, Canada")),
+])
+def test_other_places_are_not_taken_for_us_states(city, state_country, expected):
+    assert canonical_locality(city, state_country) == expected
+
+
+def test_state_code_shares_the_spelled_out_key():
+    assert canonical_locality("pittsburgh", "pa") == canonical_locality("Pittsburgh", "Pennsylvania")
+    assert canonical_locality("Pittsburgh", "P.A.") == canonical_locality("Pittsburgh", "PA, USA")
+
+
+@pytest.mark.parametrize("city, state_country", [("Pittsburgh", ""), ("", "PA"), (None, None), ("  ", " , ")])
+def test_incomplete_locality_is_none(city, state_country):
+    assert canonical_locality(city, state_country) is None
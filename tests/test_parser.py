@@ -0,0 +1,113 @@
+import json
+import os
+
+import pytest
+
+from backend.parser import (PLACEHOLDERS, parse_history_response, parse_single_trivia_entry, parse_trivia_block,
+                            split_trivia_by_difficulty)
+
+RECORDED_RESPONSES_PATH = os.path.join(os.path.dirname(__file__), os.pardir, "benchmarks", "recorded_responses.json")
+
+with open(RECORDED_RESPONSES_PATH, encoding='utf-8') as recorded_file:
+    RECORDED = json.load(recorded_file)
+
+SECTION_KEYS = ('event_article', 'born_article', 'fun_fact_section', 'trivia_section', 'did_you_know_section',
+                'memory_prompt_section', 'local_history_section')
+
+
+@pytest.mark.parametrize("response", RECORDED['full_responses'])
+def test_full_responses_parse_with_full_confidence(response):
+    parsed = parse_history_response(response)
+    assert parsed['parse_confidence'] == dict.fromkeys(SECTION_KEYS, 1.0)
+    assert len(parsed['trivia_section']) == 5
+    assert all(not item['question'][0].islower() for item in parsed['trivia_section'])
+
+
+def test_markdown_headings_are_recognized():
+    # "### 1. Event Article" and bold headings
+    parsed = parse_history_response(RECORDED['variant_responses'][0])
+    assert parsed['parse_confidence'] == dict.fromkeys(SECTION_KEYS, 1.0)
+
+
+def test_unnumbered_headings_are_recognized_with_lower_confidence():
+    # "Event Article:" on its own line, "Born on this Day - ...", no numbers
+    parsed = parse_history_response(RECORDED['variant_responses'][1])
+    assert parsed['event_article'].startswith("On July 20, 1969")
+    assert parsed['born_article'].startswith("Sir Edmund Hillary")
+    assert parsed['fun_fact_section'].startswith("On July 20, 1976")
+    assert parsed['parse_confidence']['event_article'] == 0.8
+    assert parsed['parse_confidence']['memory_prompt_section'] == 0.4 # One prompt of the two expected
+
+
+def test_answer_and_hint_lines_belong_to_their_question():
+    parsed = parse_history_response(RECORDED['variant_responses'][1])
+    assert [item['question'] for item in parsed['trivia_section']] == [
+        "Who was the first person to walk on the Moon?",
+        "What was the name of Apollo 11's lunar module?",
+        "Which mountain did Edmund Hillary first summit in 1953?",
+        "Which Viking lander touched down on Mars on July 20, 1976?",
+        "Which astronaut stayed in lunar orbit during the Apollo 11 landing?",
+    ]
+    assert parsed['trivia_section'][0] == {'question': "Who was the first person to walk on the Moon?",
+                                           'answer': "Neil Armstrong", 'hint': 'His first name rhymes with "heel"'}
+
+
+def test_short_response_scores_its_missing_parts():
+    parsed = parse_history_response(RECORDED['variant_responses'][2])
+    confidence = parsed['parse_confidence']
+    assert confidence['event_article'] == 1.0
+    assert len(parsed['trivia_section']) == 3
+    assert confidence['trivia_section'] == 0.4 # Three complete questions of five
+    assert confidence['local_history_section'] == 0.0
+    assert parsed['local_history_section'] == PLACEHOLDERS['local_history_section']
+
+
+def test_missing_sections_get_placeholders_and_zero_confidence():
+    parsed = parse_history_response("Nothing the parser can use.")
+    assert parsed['event_article'] == PLACEHOLDERS['event_article']
+    assert parsed['trivia_section'] == []
+    assert set(parsed['parse_confidence'].values()) == {0.0}
+
+
+@pytest.mark.parametrize("line", [line for line in RECORDED['trivia_lines'] if not line.startswith("Hint:")])
+def test_recorded_trivia_lines_keep_their_question(line):
+    parsed = parse_single_trivia_entry(line)
+    question = parsed['question']
+    assert question != "No question found."
+    assert question[0].isupper()
+    assert question in line
+    assert parsed['answer'] != "No answer found."
+
+
+@pytest.mark.parametrize("entry, question", [
+    ("a. Abraham Lincoln was born in which state? (Kentucky) [Bluegrass]", "Abraham Lincoln was born in which state?"),
+    ("Bell invented what? (The telephone) [It rings]", "Bell invented what?"),
+    ("Each Wright brother was born in which state? (Ohio) [Buckeye]", "Each Wright brother was born in which state?"),
+    ("E) Edison opened a lab in which town? (Menlo Park) [New Jersey]", "Edison opened a lab in which town?"),
+])
+def test_questions_starting_with_a_to_e_keep_their_first_letter(entry, question):
+    assert parse_single_trivia_entry(entry)['question'] == question
+
+
+def test_answer_label_is_parsed_as_the_answer():
+    parsed = parse_single_trivia_entry("b. Which ship rescued the Titanic's survivors? Answer: RMS Carpathia [A mountain range]")
+    assert parsed == {'question': "Which ship rescued the Titanic's survivors?", 'answer': "RMS Carpathia", 'hint': "A mountain range"}
+
+
+def test_answer_lines_are_not_entries_of_their_own():
+    block = "a. Who wrote Hamlet?\nAnswer: Shakespeare\nHint: The Bard\nb. Who painted the Mona Lisa?\nAnswer: Leonardo da Vinci\nHint: Renaissance man"
+    assert parse_trivia_block(block) == [
+        {'question': "Who wrote Hamlet?", 'answer': "Shakespeare", 'hint': "The Bard"},
+        {'question': "Who painted the Mona Lisa?", 'answer': "Leonardo da Vinci", 'hint': "Renaissance man"},
+    ]
+
+
+def test_trivia_block_stops_at_five_entries():
+    block = "\n".join(f"{index}. Question number {index}? (Answer {index}) [Hint {index}]" for index in range(1, 8))
+    assert len(parse_trivia_block(block)) == 5
+
+
+def test_all_difficulties_response_splits_into_three_sets():
+    blocks = split_trivia_by_difficulty(RECORDED['all_difficulties_response'])
+    assert set(blocks) == {'Easy', 'Medium', 'Hard'}
+    assert all(len(parse_trivia_block(block)) == 5 for block in blocks.values())
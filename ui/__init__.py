@@ -0,0 +1 @@
+"""Streamlit page views for the This Day in History app."""
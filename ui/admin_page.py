@@ -0,0 +1,141 @@
+"""Admin page: OpenAI latency, tokens and cost per AI helper, rate limiter, circuit breaker, prefetch, render pool and cache state, session memory, and rerun profiling.
+
+Shown in English only: it must keep working while the AI service (and so translation) is down.
+"""
+import os
+
+import pandas as pd
+import streamlit as st
+
+from backend.breaker import openai_breaker
+from backend.cache import cache_budget, cache_stats
+from backend.config import ADMIN_USERNAMES
+from backend.content_store import content_store
+from backend.memory import session_memory_report
+from backend.metrics import call_metrics
+from backend.prefetch import prefetcher
+from backend.profiling import rerun_profiler
+from backend.render_pool import render_pool
+from backend.ratelimit import openai_limiter
+from ui.common import set_page
+
+
+def show_admin_page():
+    st.title("🛠️ Admin: AI Usage")
+    if st.session_state['logged_in_username'] not in ADMIN_USERNAMES:
+        st.error("This page is only available to administrators.")
+        return
+
+    summary = call_metrics.summary()
+    st.subheader("OpenAI calls by function")
+    st.caption("Cache hits are helper calls answered without a model call (cache, question bank or another session's in-flight request).")
+    if not summary:
+        st.info("No AI helper calls recorded since the server started.")
+    else:
+        st.dataframe(pd.DataFrame([{
+            'Function': name,
+            'Calls': stats['calls'],
+            'Cache hits': stats['cache_hits'],
+            'Model calls': stats['model_calls'],
+            'Errors': stats['errors'],
+            'Mean latency (s)': round(stats['mean_latency_seconds'], 2),
+            'p50 ≤ (s)': stats['p50_latency_seconds'],
+            'p95 ≤ (s)': stats['p95_latency_seconds'],
+            'Prompt tokens': stats['prompt_tokens'],
+            'Completion tokens': stats['completion_tokens'],
+            'Est. cost (USD)': round(stats['cost_usd'], 4),
+        } for name, stats in summary.items()]), hide_index=True)
+        st.write(f"**Estimated total cost since start:** ${sum(stats['cost_usd'] for stats in summary.values()):.4f}")
+
+        st.subheader("Latency histograms")
+        for name, stats in summary.items():
+            if stats['model_calls']:
+                st.caption(name)
+                st.bar_chart(pd.DataFrame({'Model calls': stats['latency_histogram']}), height=180)
+
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        st.download_button("Prometheus metrics", call_metrics.to_prometheus(), file_name="openai_metrics.prom", mime="text/plain")
+    with col2:
+        st.download_button("Recent calls (JSON lines)", call_metrics.to_json_lines(), file_name="openai_calls.jsonl", mime="application/x-ndjson")
+    with col3:
+        if st.button("Reset metrics", key="admin_reset_metrics_btn"):
+            call_metrics.reset()
+            st.rerun()
+
+    st.markdown("---")
+    st.subheader("Rate limiter")
+    st.json(openai_limiter.stats())
+    st.subheader("Circuit breaker")
+    st.json(openai_breaker.stats())
+    st.subheader("Prefetch")
+    st.json(prefetcher.stats())
+    st.subheader("PDF render pool")
+    st.json(render_pool.stats())
+
+    st.markdown("---")
+    _show_caches()
+
+    st.markdown("---")
+    _show_session_memory()
+
+    st.markdown("---")
+    _show_rerun_profiling()
+
+    st.markdown("---")
+    st.button("⬅️ Back to Main App", on_click=lambda: set_page('main_app'))
+
+
+def _show_caches():
+    st.subheader("Caches")
+    budget = cache_budget.stats()
+    st.caption(f"In-process caches use {budget['used_bytes'] / 2**20:.1f} of {budget['max_bytes'] / 2**20:.0f} MiB "
+               f"({budget['policy'].upper()} eviction). With a Redis backend, sizes and evictions are Redis' own.")
+    st.dataframe(pd.DataFrame([{
+        'Cache': name,
+        'Entries': stats.get('entries'),
+        'Hits': stats['hits'],
+        'Misses': stats['misses'],
+        'Hit rate': round(stats['hits'] / (stats['hits'] + stats['misses']), 3) if stats['hits'] + stats['misses'] else None,
+        'KiB': round(stats['bytes'] / 1024, 1) if stats.get('bytes') is not None else None,
+        'Compression': stats.get('compression_ratio'),
+        'Evictions': stats.get('evictions'),
+        'Expirations': stats.get('expirations'),
+    } for name, stats in cache_stats().items()]), hide_index=True)
+
+
+def _show_session_memory():
+    st.subheader("Session memory")
+    report = session_memory_report(st.session_state.to_dict())
+    store = content_store.stats()
+    st.write(f"**This session's state:** {report['total_bytes'] / 1024:.1f} KiB. "
+             f"**Shared content store:** {store['entries']} entries, {store['bytes'] / 1024:.1f} KiB for all sessions.")
+    st.dataframe(pd.DataFrame([{'Key': key, 'KiB': round(size / 1024, 2)} for key, size in list(report['keys'].items())[:15]]), hide_index=True)
+
+
+def _show_rerun_profiling():
+    st.subheader("Rerun profiling")
+    rerun_profiler.enabled = st.toggle("Profile every rerun (all sessions)", value=rerun_profiler.enabled, key="admin_profile_reruns_toggle")
+    rerun_profiler.slow_rerun_seconds = st.number_input(
+        "Write a flamegraph for reruns slower than (seconds)", min_value=0.0, value=float(rerun_profiler.slow_rerun_seconds), step=1.0,
+        key="admin_slow_rerun_seconds")
+
+    slowest = rerun_profiler.slowest_reruns()
+    if not slowest:
+        st.info("No profiled reruns yet.")
+        return
+    st.dataframe(pd.DataFrame([{
+        'Time': record['time'],
+        'Page': record['page'],
+        'User': record['context'].get('logged_in_username'),
+        'Language': record['context'].get('preferred_language'),
+        'Total (s)': record['total_seconds'],
+        **{f"{name.upper() if name != 'sheets' else 'Sheets'} (s)": seconds for name, seconds in record['phase_seconds'].items()},
+        'Flamegraph': os.path.basename(record['flamegraph_path']) if record['flamegraph_path'] else '',
+    } for record in slowest]), hide_index=True)
+
+    profiles = [record['flamegraph_path'] for record in slowest if record['flamegraph_path'] and os.path.exists(record['flamegraph_path'])]
+    if profiles:
+        selected = st.selectbox("Folded stacks (open with speedscope or flamegraph.pl)", profiles, format_func=os.path.basename, key="admin_profile_select")
+        with open(selected, 'rb') as folded_file:
+            st.download_button("Download folded stacks", folded_file.read(), file_name=os.path.basename(selected), mime="text/plain")
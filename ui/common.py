@@ -0,0 +1,63 @@
+"""Navigation, feedback form and download callbacks shared by the pages."""
+import streamlit as st
+
+from backend.ai import translate_text_with_ai
+from backend.sheets import log_feedback, log_pdf_download
+
+
+def set_page(page_name):
+    """Sets the current page in session state."""
+    st.session_state['current_page'] = page_name
+    # Trivia progress is kept per day, difficulty and topic (see backend/progress.py); the trivia
+    # page starts fresh when any of those change, not when the user navigates away
+
+
+def show_feedback_form():
+    """Displays a feedback form and logs submissions to Google Sheets."""
+    st.markdown("---")
+    st.subheader(translate_text_with_ai("📧 Send us feedback", st.session_state['preferred_language'])) # Removed client_ai
+    st.markdown(translate_text_with_ai("We'd love to hear from you! Please share your thoughts below.", st.session_state['preferred_language'])) # Removed client_ai
+
+    with st.form("feedback_form", clear_on_submit=True):
+        feedback_text = st.text_area(translate_text_with_ai("Your Feedback", st.session_state['preferred_language']), help=translate_text_with_ai("Tell us what you think!", st.session_state['preferred_language']), key="feedback_text_area") # Removed client_ai
+        contact_info = st.text_input(translate_text_with_ai("Your Name or Email (Optional)", st.session_state['preferred_language']), help=translate_text_with_ai("So we can follow up, if needed.", st.session_state['preferred_language']), key="feedback_contact_info") # Removed client_ai
+        
+        submitted = st.form_submit_button(translate_text_with_ai("Submit Feedback", st.session_state['preferred_language'])) # Removed client_ai
+        if submitted:
+            if feedback_text.strip():
+                # Use logged-in username if available, otherwise use provided contact info
+                username_for_feedback = st.session_state.get('logged_in_username', 'Guest')
+                if contact_info.strip():
+                    username_for_feedback = contact_info.strip() # Override if user provides specific contact info
+                
+                if log_feedback(username_for_feedback, feedback_text.strip()):
+                    st.success(translate_text_with_ai("Thank you for your feedback! We appreciate it.", st.session_state['preferred_language'])) # Removed client_ai
+                else:
+                    st.error(translate_text_with_ai("Failed to submit feedback. Please try again later.", st.session_state['preferred_language'])) # Removed client_ai
+            else:
+                st.warning(translate_text_with_ai("Please enter some feedback before submitting.", st.session_state['preferred_language'])) # Removed client_ai
+    st.markdown("---")
+
+
+def handle_pdf_download_click(username, filename, selected_date):
+    """
+    Handles the PDF download button click event, logging the download
+    and setting a session state flag for persistent feedback.
+    """
+    success = log_pdf_download(username, filename, selected_date)
+    if success:
+        st.session_state['last_download_status'] = 'success'
+    else:
+        st.session_state['last_download_status'] = 'failure'
+
+
+def handle_weekly_pdf_download_click(username, filename, selected_date):
+    """
+    Handles the weekly PDF download button click event, logging the download
+    and setting a session state flag for persistent feedback.
+    """
+    success = log_pdf_download(username, filename, selected_date)
+    if success:
+        st.session_state['last_weekly_download_status'] = 'success'
+    else:
+        st.session_state['last_weekly_download_status'] = 'failure'
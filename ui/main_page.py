@@ -0,0 +1,203 @@
+"""The authenticated daily page: articles, facts and the printable PDF."""
+import base64 # Import base64 for encoding PDF content
+from datetime import datetime
+
+import streamlit as st
+
+from backend.ai import get_this_day_in_history_facts, translate_content, translate_text_with_ai
+from backend.config import INITIAL_EMPTY_DATA
+from backend.content_store import content_store
+from backend.pdf import get_history_pdf
+from backend.prefetch import prefetcher
+from ui.common import handle_pdf_download_click, show_feedback_form
+
+
+def show_main_app_page():
+    st.title(translate_text_with_ai("📅 This Day in History", st.session_state['preferred_language'])) # Removed client_ai
+
+    daily_page_label = translate_text_with_ai("Today's Daily Page", st.session_state['preferred_language'])
+    st.markdown(f"<p style='font-size:24px; font-weight:bold;'>{daily_page_label}</p>", unsafe_allow_html=True)
+
+
+    today = datetime.today()
+    
+    # --- Date Picker for Main Page Content ---
+    selected_date = st.date_input(translate_text_with_ai("Select a date", st.session_state['preferred_language']), value=today, key="date_picker_main_app") # Removed client_ai
+    day, month, year = selected_date.day, selected_date.month, selected_date.year
+
+    user_info = {
+        'name': st.session_state['logged_in_username'],
+        'jobs': '', 'hobbies': '', 'decade': '', 'life_experiences': '', 'college_chapter': ''
+    }
+
+    # Fetch daily data if not already fetched for the current day/user/preferences/language
+    current_data_key = f"{selected_date.strftime('%Y-%m-%d')}-{st.session_state['logged_in_username']}-" \
+                       f"{st.session_state.get('preferred_topic_main_app', 'None')}-" \
+                       f"{st.session_state.get('preferred_decade_main_app', 'None')}-" \
+                       f"trivia_difficulty_{st.session_state['difficulty']}-" \
+                       f"local_city_{st.session_state['local_city']}-" \
+                       f"local_state_country_{st.session_state['local_state_country']}-" \
+                       f"language_{st.session_state['preferred_language']}" # ADDED LANGUAGE TO KEY
+
+    # Session state only holds keys into the shared content store; the content itself is shared by
+    # every session showing the same day (see backend/content_store.py)
+    raw_data_for_pdf = content_store.get(st.session_state['daily_content_ref']) # The raw data for PDF generation
+    data = content_store.get(st.session_state['translated_content_ref']) # Translated if needed, for display
+    if st.session_state['last_fetched_date'] != current_data_key or raw_data_for_pdf is None or data is None:
+        with st.spinner(translate_text_with_ai("Fetching today's historical facts and generating content...", st.session_state['preferred_language'])): # Removed client_ai
+            # Fetch always in English first
+            fetched_raw_data = get_this_day_in_history_facts( # Renamed to avoid confusion with `raw_data` later
+                day, month, user_info,
+                topic=st.session_state.get('preferred_topic_main_app') if st.session_state.get('preferred_topic_main_app') != "None" else None,
+                preferred_decade=st.session_state.get('preferred_decade_main_app') if st.session_state.get('preferred_decade_main_app') != "None" else None,
+                difficulty=st.session_state['difficulty'], # Pass the selected difficulty to generate trivia
+                local_city=st.session_state['local_city'] if st.session_state['local_city'].strip() else None,
+                local_state_country=st.session_state['local_state_country'] if st.session_state['local_state_country'].strip() else None
+            )
+            
+            # Defensive check: Ensure fetched_raw_data is indeed a dictionary
+            if not isinstance(fetched_raw_data, dict):
+                st.error("Generated raw data was not a dictionary. Using default empty data.")
+                fetched_raw_data = INITIAL_EMPTY_DATA.copy()
+
+            # Store both raw and translated data, and keep their keys in session state
+            translated_data = translate_content(fetched_raw_data, st.session_state['preferred_language']) # Removed client_ai
+            st.session_state['daily_content_ref'] = content_store.put(fetched_raw_data)
+            st.session_state['translated_content_ref'] = content_store.put(translated_data) if translated_data is not fetched_raw_data else st.session_state['daily_content_ref']
+            st.session_state['last_fetched_date'] = current_data_key
+            raw_data_for_pdf, data = fetched_raw_data, translated_data
+
+    # Display content - Articles are back on the main page
+    st.subheader(translate_text_with_ai(f"✨ A Look Back at {selected_date.strftime('%B %d')}", st.session_state['preferred_language'])) # Removed client_ai
+
+    # New note for scrolling down to download/print at the top of the main page
+    st.info(
+        translate_text_with_ai(
+            """💡 Scroll down to download and print your This Day In History worksheet! 
+You can download each day's content as a printable PDF—perfect for sharing with your residents or using in group activities!
+Want to make it your own? You can even customize the masthead to match your community—try something fun like Arbor Courts Courts Gazette or The Morning Maple 🍁.
+
+🌍 Need another language? Use the left-hand menu to translate the entire page and your downloadable PDF.
+
+📅 Want to plan a week ahead? Click the Weekly Planner Button to generate a weeks worth of worksheets all at once!
+
+This is a free platform. 
+💬 We'd Love Your Support!
+Word of mouth goes a long way—if you enjoy using This Day In History, please share it with your friends, coworkers, or anyone who might benefit. Your support means the world to us!
+
+""",
+            st.session_state['preferred_language']
+        )
+    )
+
+
+    st.markdown("---")
+    st.subheader(translate_text_with_ai("🗓️ Significant Event", st.session_state['preferred_language'])) # Removed client_ai
+    st.write(data.get('event_article', "No event article found."))
+
+    st.markdown("---")
+    st.subheader(translate_text_with_ai("🎂 Born on this Day", st.session_state['preferred_language'])) # Removed client_ai
+    st.write(data.get('born_article', "No birth article found."))
+
+    st.markdown("---")
+    st.subheader(translate_text_with_ai("💡 Fun Fact", st.session_state['preferred_language'])) # Removed client_ai
+    st.write(data.get('fun_fact_section', "No fun fact found."))
+
+    # Display Local History if available and not the "not found" messages
+    local_history_display_content = data.get('local_history_section', '')
+    if local_history_display_content and \
+       not local_history_display_content.startswith("Could not generate local history fact."): # Simplified check
+        st.markdown("---")
+        st.subheader(translate_text_with_ai("📍 Local History", st.session_state['preferred_language'])) # Removed client_ai
+        st.write(local_history_display_content)
+    else: # This covers cases where local_city/state are not set, or AI failed to generate
+        st.markdown("---")
+        st.subheader(translate_text_with_ai("📍 Local History", st.session_state['preferred_language'])) # Removed client_ai
+        st.info(translate_text_with_ai("Could not retrieve a local history fact for your settings. Please try again with different inputs or leave blank for a general U.S. historical fact.", st.session_state['preferred_language'])) # Removed client_ai
+
+
+    st.markdown("---")
+    st.subheader(translate_text_with_ai("🌟 Did You Know?", st.session_state['preferred_language'])) # Changed to '?' # Removed client_ai
+    # Use .get() with an empty list as default for iteration
+    for i, fact in enumerate(data.get('did_you_know_section', [])):
+        st.write(f"- {fact}")
+
+    st.markdown("---")
+    st.subheader(translate_text_with_ai("💬 Memory Lane Prompt?", st.session_state['preferred_language'])) # Changed to '?' # Removed client_ai
+    # Iterate and display each memory prompt without hyphens, using .get() with an empty list as default
+    memory_prompts_display_list = data.get('memory_prompt_section', [])
+    if memory_prompts_display_list:
+        for prompt_text in memory_prompts_display_list:
+            st.write(f"{prompt_text}") # Display as paragraph, no leading hyphen
+    else:
+        st.write(translate_text_with_ai("No memory prompts available.", st.session_state['preferred_language'])) # Removed client_ai
+
+    st.markdown("---")
+
+    st.subheader(translate_text_with_ai("PDF Customization", st.session_state['preferred_language'])) # Removed client_ai
+    st.session_state['custom_masthead_text'] = st.text_input(
+        translate_text_with_ai("Optional: Custom Masthead for PDF (e.g., Your Company Name, Care Community Name)", st.session_state['preferred_language']), # Removed client_ai
+        value=st.session_state['custom_masthead_text'],
+        help=translate_text_with_ai("Leave blank to use the default 'The Daily Resense Register'.", st.session_state['preferred_language']), # Removed client_ai
+        key="custom_masthead_input"
+    )
+    
+    # Generate PDF bytes once
+    with st.spinner(translate_text_with_ai("Preparing your PDF worksheet...", st.session_state['preferred_language'])): # Removed client_ai
+        pdf_bytes_main = get_history_pdf(
+            raw_data_for_pdf, 
+            selected_date.strftime('%B %d, %Y'), 
+            user_info, 
+            st.session_state['preferred_language'],
+            st.session_state['custom_masthead_text'] # Pass the custom masthead text
+        )
+    
+    # Create Base64 encoded link
+    lang_suffix = f"_{st.session_state['preferred_language']}" if st.session_state['preferred_language'] != 'English' else ''
+    pdf_file_name = f"This_Day_in_History_{selected_date.strftime('%Y%m%d')}{lang_suffix}.pdf"
+
+    b64_pdf_main = base64.b64encode(pdf_bytes_main).decode('latin-1')
+    pdf_viewer_link_main = f'<a href="data:application/pdf;base64,{b64_pdf_main}" target="_blank">{translate_text_with_ai("View PDF in Browser", st.session_state["preferred_language"])}</a>' # Removed client_ai
+
+    # Display status message if any
+    if st.session_state['last_download_status'] == 'success':
+        st.success(translate_text_with_ai("PDF download successfully logged to Google Sheet!", st.session_state['preferred_language'])) # Removed client_ai
+        st.session_state['last_download_status'] = None # Clear the message after display
+    elif st.session_state['last_download_status'] == 'failure':
+        st.error(translate_text_with_ai("Failed to log PDF download to Google Sheet. Please check permissions or try again.", st.session_state['preferred_language'])) # Removed client_ai
+        st.session_state['last_download_status'] = None # Clear the message after display
+
+
+    col1, col2 = st.columns([1, 1])
+    with col1:
+        st.download_button(
+            translate_text_with_ai("Download Daily Page PDF", st.session_state['preferred_language']), # Removed client_ai
+            pdf_bytes_main, 
+            file_name=pdf_file_name,
+            mime="application/pdf",
+            on_click=handle_pdf_download_click, # Use the new handler
+            args=(st.session_state['logged_in_username'], pdf_file_name, selected_date) # Pass arguments
+        )
+    with col2:
+        st.markdown(pdf_viewer_link_main, unsafe_allow_html=True)
+    
+    # --- Offline Access (Conceptual - requires local storage solution) ---
+    st.sidebar.markdown("---")
+    st.sidebar.subheader(translate_text_with_ai("Future Features", st.session_state['preferred_language'])) # Removed client_ai
+    st.sidebar.info(translate_text_with_ai("🗓️ **Offline Access:** Coming soon! Downloaded PDFs provide a workaround for now.", st.session_state['preferred_language'])) # Removed client_ai
+    
+    # --- Sharing/Email Option (Conceptual - requires external email service) ---
+    st.sidebar.info(translate_text_with_ai("📧 **Share Daily Page:** Future integration with email services for sharing daily/weekly content.", st.session_state['preferred_language'])) # Removed client_ai
+
+    # Feedback form at the bottom
+    show_feedback_form()
+
+    # Warm the neighbouring days and other languages in the background (when enabled)
+    prefetcher.after_daily_page(
+        selected_date, st.session_state['preferred_language'],
+        preferred_decade=st.session_state.get('preferred_decade_main_app') if st.session_state.get('preferred_decade_main_app') != "None" else None,
+        topic=st.session_state.get('preferred_topic_main_app') if st.session_state.get('preferred_topic_main_app') != "None" else None,
+        difficulty=st.session_state['difficulty'],
+        local_city=st.session_state['local_city'] if st.session_state['local_city'].strip() else None,
+        local_state_country=st.session_state['local_state_country'] if st.session_state['local_state_country'].strip() else None
+    )
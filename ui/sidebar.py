@@ -0,0 +1,72 @@
+"""Sidebar shown to authenticated users: navigation and content settings."""
+import streamlit as st
+
+from backend.ai import translate_text_with_ai
+from backend.config import ADMIN_USERNAMES, DECADES, LANGUAGES, LOGO_URL, TOPICS
+from backend.sheets import log_event
+from ui.common import set_page
+
+
+def render_sidebar():
+    """Builds the sidebar (always visible when authenticated)."""
+    st.sidebar.image(LOGO_URL, use_container_width=True)
+    st.sidebar.markdown("---")
+    st.sidebar.header(translate_text_with_ai("Navigation", st.session_state['preferred_language'])) # Removed client_ai
+    if st.sidebar.button(translate_text_with_ai("🏠 Home", st.session_state['preferred_language']), key="sidebar_home_btn"): # Removed client_ai
+        set_page('main_app')
+    if st.sidebar.button(translate_text_with_ai("🎮 Play Trivia!", st.session_state['preferred_language']), key="sidebar_trivia_btn"): # Removed client_ai
+        set_page('trivia_page')
+    # NEW: Weekly Planner button in sidebar
+    if st.sidebar.button(translate_text_with_ai("🗓️ Weekly Planner", st.session_state['preferred_language']), key="sidebar_weekly_planner_btn"): # Removed client_ai
+        set_page('weekly_planner_page')
+    if st.session_state['logged_in_username'] in ADMIN_USERNAMES:
+        if st.sidebar.button("🛠️ Admin", key="sidebar_admin_btn"):
+            set_page('admin_page')
+
+    st.sidebar.markdown("---")
+    st.sidebar.header(translate_text_with_ai("Settings", st.session_state['preferred_language'])) # Removed client_ai
+    
+    st.sidebar.subheader(translate_text_with_ai("Content Customization", st.session_state['preferred_language'])) # Removed client_ai
+    st.session_state['preferred_topic_main_app'] = st.sidebar.selectbox(
+        translate_text_with_ai("Preferred Topic for Events (Optional)", st.session_state['preferred_language']), # Removed client_ai
+        options=TOPICS,
+        index=0,
+        key='sidebar_topic_select'
+    )
+    st.session_state['preferred_decade_main_app'] = st.sidebar.selectbox(
+        translate_text_with_ai("Preferred Decade for Articles (Optional)", st.session_state['preferred_language']), # Removed client_ai
+        options=DECADES,
+        index=0,
+        key='sidebar_decade_select'
+    )
+
+    st.sidebar.markdown("---")
+    st.sidebar.subheader(translate_text_with_ai("📍 Local History Settings", st.session_state['preferred_language'])) # Removed client_ai
+    st.session_state['local_city'] = st.sidebar.text_input(
+        translate_text_with_ai("Your City (Optional)", st.session_state['preferred_language']), # Removed client_ai
+        value=st.session_state['local_city'],
+        key='sidebar_local_city'
+    )
+    st.session_state['local_state_country'] = st.sidebar.text_input(
+        translate_text_with_ai("Your State/Country (Optional)", st.session_state['preferred_language']), # Removed client_ai
+        value=st.session_state['local_state_country'],
+        key='sidebar_local_state_country'
+    )
+    st.sidebar.info(translate_text_with_ai("Integrating local historical facts specific to your area. Please fill in both fields for best results. If left blank, a general U.S. historical fact will be provided.", st.session_state['preferred_language'])) # Removed client_ai
+    
+    st.sidebar.markdown("---")
+    st.sidebar.subheader(translate_text_with_ai("🌐 Language Settings", st.session_state['preferred_language'])) # Removed client_ai
+    st.session_state['preferred_language'] = st.sidebar.selectbox(
+        translate_text_with_ai("Display Language", st.session_state['preferred_language']), # Removed client_ai
+        options=LANGUAGES,
+        index=LANGUAGES.index(st.session_state['preferred_language']),
+        key='sidebar_language_select',
+        help=translate_text_with_ai("Select the language for the daily content and PDF.", st.session_state['preferred_language']) # Removed client_ai
+    )
+
+    st.sidebar.markdown("---")
+    if st.sidebar.button(translate_text_with_ai("🚪 Log Out", st.session_state['preferred_language']), key="sidebar_logout_btn"): # Removed client_ai
+        log_event("logout", st.session_state['logged_in_username'])
+        st.session_state['is_authenticated'] = False
+        st.session_state['logged_in_username'] = ""
+        set_page('login_page') # Go back to the login page (or main app if unauthenticated)
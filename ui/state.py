@@ -0,0 +1,81 @@
+"""Per-session state defaults and the compact records kept in session state."""
+import streamlit as st
+
+from backend.content_store import content_store
+
+
+class TriviaQuestionState:
+    """
+    One trivia question's progress in a session. A __slots__ record rather than a dict, since
+    every session holds one per question; the explanation itself is in the content store.
+    """
+    __slots__ = ('user_answer', 'is_correct', 'feedback', 'hint_revealed', 'attempts', 'out_of_chances', 'points_earned', 'explanation_ref')
+
+    def __init__(self, user_answer='', is_correct=False, feedback='', hint_revealed=False, attempts=0,
+                 out_of_chances=False, points_earned=0, explanation_ref=None):
+        self.user_answer = user_answer
+        self.is_correct = is_correct
+        self.feedback = feedback
+        self.hint_revealed = hint_revealed
+        self.attempts = attempts
+        self.out_of_chances = out_of_chances
+        self.points_earned = points_earned
+        self.explanation_ref = explanation_ref # Content store key of the generated explanation
+
+    def to_progress(self):
+        """A JSON-ready dict for the durable progress store, with the explanation text itself."""
+        progress = {name: getattr(self, name) for name in self.__slots__ if name != 'explanation_ref'}
+        progress['related_article_content'] = content_store.get(self.explanation_ref)
+        return progress
+
+    @classmethod
+    def from_progress(cls, progress):
+        explanation = progress.get('related_article_content')
+        fields = {name: progress[name] for name in cls.__slots__ if name in progress}
+        return cls(**fields, explanation_ref=content_store.put(explanation) if explanation else None)
+
+
+def init_session_state():
+    """Sets every session_state key the pages rely on, leaving existing values untouched."""
+    if 'is_authenticated' not in st.session_state:
+        st.session_state['is_authenticated'] = False
+    if 'logged_in_username' not in st.session_state:
+        st.session_state['logged_in_username'] = ""
+    if 'current_page' not in st.session_state:
+        st.session_state['current_page'] = 'main_app' # Default page for authenticated users
+    # Daily content is kept in the shared content store; sessions hold its keys (see backend/content_store.py)
+    if 'daily_content_ref' not in st.session_state: # The raw, untranslated content, used for the PDF
+        st.session_state['daily_content_ref'] = None
+    if 'translated_content_ref' not in st.session_state: # The same content in the preferred language, shown on the page
+        st.session_state['translated_content_ref'] = None
+    if 'last_fetched_date' not in st.session_state:
+        st.session_state['last_fetched_date'] = None # To track when data was last fetched
+    if 'trivia_question_states' not in st.session_state:
+        st.session_state['trivia_question_states'] = {} # {'trivia_q_<index>': TriviaQuestionState}
+    if 'hints_remaining' not in st.session_state:
+        st.session_state['hints_remaining'] = 3 # Total hints allowed per day
+    if 'current_trivia_score' not in st.session_state:
+        st.session_state['current_trivia_score'] = 0
+    if 'total_possible_daily_trivia_score' not in st.session_state:
+        st.session_state['total_possible_daily_trivia_score'] = 0
+    if 'score_logged_today' not in st.session_state:
+        st.session_state['score_logged_today'] = False
+    if 'difficulty' not in st.session_state: # New session state for difficulty
+        st.session_state['difficulty'] = 'Medium' # Default difficulty
+    if 'local_city' not in st.session_state:
+        st.session_state['local_city'] = ""
+    if 'local_state_country' not in st.session_state:
+        st.session_state['local_state_country'] = ""
+    if 'preferred_language' not in st.session_state:
+        st.session_state['preferred_language'] = 'English' # Default language
+    if 'custom_masthead_text' not in st.session_state: # NEW: Custom masthead text for PDF
+        st.session_state['custom_masthead_text'] = ""
+    if 'last_download_status' not in st.session_state: # NEW: To track PDF download logging status for user feedback
+        st.session_state['last_download_status'] = None
+    # NEW: To track weekly PDF download logging status for user feedback
+    if 'last_weekly_download_status' not in st.session_state: 
+        st.session_state['last_weekly_download_status'] = None
+    if 'trivia_questions_ref' not in st.session_state: # Content store key of the English trivia questions shown on the trivia page
+        st.session_state['trivia_questions_ref'] = None
+    if 'trivia_data_key' not in st.session_state: # Date/topic/difficulty the trivia questions were fetched for
+        st.session_state['trivia_data_key'] = None
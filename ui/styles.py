@@ -0,0 +1,151 @@
+"""Custom CSS for sidebar styling and the default (black) app theme."""
+import streamlit as st
+
+APP_CSS = """
+    <style>
+    /* Overall Sidebar Styling to match logo colors */
+    div[data-testid="stSidebar"] {
+        background-color: #5A2D81; /* Deep purple from logo */
+        color: white; /* Default text color */
+    }
+
+    /* Ensuring all text elements within sidebar are white */
+    div[data-testid="stSidebar"] * {
+        color: white !important;
+    }
+
+    /* Headers in sidebar */
+    div[data-testid="stSidebar"] h1,
+    div[data-testid="stSidebar"] h2,
+    div[data-testid="stSidebar"] h3,
+    div[data-testid="stSidebar"] h4,
+    div[data-testid="stSidebar"] h5,
+    div[data-testid="stSidebar"] h6 {
+        color: white !important;
+    }
+
+    /* Info boxes in sidebar */
+    div[data-testid="stSidebar"] .stAlert {
+        background-color: #7B4CA0; /* Slightly lighter purple for info boxes */
+        border-color: #7B4CA0;
+    }
+
+    /* Buttons in sidebar */
+    div[data-testid="stSidebar"] .stButton > button {
+        background-color: #8A2BE2; /* Blue Violet for buttons */
+        color: white;
+        border: none;
+        border-radius: 0.5rem;
+        padding: 0.5rem 1rem;
+        transition: all 0.2s ease-in-out;
+    }
+
+    div[data-testid="stSidebar"] .stButton > button:hover {
+        background-color: #A020F0; /* Purple on hover */
+        color: white;
+    }
+
+    /* Selectbox dropdown background and text */
+    .st-emotion-cache-10q763j { /* This is a common class for dropdowns/popovers */
+        background-color: #7B4CA0 !important; /* Lighter purple for dropdowns */
+        color: white !important;
+    }
+    .st-emotion-cache-10q763j * { /* Ensure all text in dropdowns is white */
+        color: white !important;
+    }
+    /* Specific styling for selectbox options on hover/selected */
+    .st-emotion-cache-lck165:hover { /* Selectbox option on hover */
+        background-color: #A020F0 !important;
+    }
+    .st-emotion-cache-1n1j053 { /* Selectbox selected option */
+        background-color: #A020F0 !important;
+    }
+
+    /* Popover button (the 'ⓘ' icon) */
+    div[data-testid="stSidebar"] .stPopover > button {
+        color: white !important;
+        background-color: transparent !important;
+        border: none !important;
+    }
+    div[data-testid="stSidebar"] .stPopover > button:hover {
+        background-color: #7B4CA0 !important; /* Lighter purple on hover for icon */
+    }
+
+    /* Input fields (e.g., text_input for selectbox search) within sidebar */
+    div[data-testid="stSidebar"] input[type="text"] {
+        background-color: #7B4CA0; /* Match selectbox background */
+        color: white;
+        border-color: #7B4CA0;
+    }
+    div[data-testid="stSidebar"] input[type="text"]:focus {
+        border-color: #A020F0;
+    }
+
+    /* Default general app styling for main content area (black background) */
+    .stApp {
+        background-color: #000000; /* Black background */
+        color: #E0E0E0; /* Light text for contrast */
+    }
+    .stMarkdown, .stText { color: #E0E0E0; }
+    h1, h2, h3, h4, h5, h6 { color: #E0E0E0; }
+    .stAlert {
+        background-color: #333333; /* Darker background for alerts */
+        color: #E0E0E0;
+        border-color: #444444;
+    }
+    .stTextInput > div > div > input {
+        background-color: #333333;
+        color: #E0E0E0;
+        border-color: #444444;
+    }
+    .stSelectbox > div > div > div { /* Target for selectbox background */
+        background-color: #333333;
+        color: #E0E0E0;
+    }
+    .stSelectbox > div > div > div > div > span { /* Target for selectbox text */
+        color: #E0E0E0 !important;
+    }
+    /* Ensure no lingering background issues from blocks */
+    div[data-testid="stVerticalBlock"] {
+        background-color: transparent !important;
+    }
+    div[data-testid="stHorizontalBlock"] {
+        background-color: transparent !important;
+    }
+    /* Adjust button colors for general main content buttons */
+    .stButton > button {
+        background-color: #555555; /* Darker button for main content */
+        color: #E0E0E0;
+        border: none;
+        border-radius: 0.5rem;
+    }
+    .stButton > button:hover {
+        background-color: #777777;
+    }
+    /* Date input styling */
+    .stDateInput > div > div > input {
+        background-color: #333333;
+        color: #E0E0E0;
+        border-color: #444444;
+    }
+
+    /* Specific styling for the "Check Answer" button */
+    div[data-testid^="stButton-primary-check_btn_"] > button {
+        background-color: #FFFFFF !important; /* White background */
+        color: #000000 !important; /* Black text */
+        border: 1px solid #000000 !important; /* Add a thin black border for contrast */
+    }
+
+    div[data-testid^="stButton-primary-check_btn_"] > button:hover {
+        background-color: #F0F0F0 !important; /* Slightly off-white on hover */
+        color: #000000 !important;
+        border: 1px solid #000000 !important;
+    }
+
+    </style>
+"""
+
+
+def apply_styles():
+    """Injects the app CSS. Streamlit needs the element on every run, but the string is built only once."""
+    st.markdown(APP_CSS, unsafe_allow_html=True)
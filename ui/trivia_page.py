@@ -0,0 +1,293 @@
+"""The daily trivia challenge page."""
+from datetime import datetime
+
+import streamlit as st
+
+from backend.ai import (
+    check_partial_correctness_with_ai,
+    generate_related_trivia_article,
+    get_trivia_questions,
+    translate_text_with_ai,
+)
+from backend.config import DIFFICULTIES
+from backend.content_store import content_store
+from backend.progress import trivia_progress
+from backend.sheets import get_leaderboard_data, log_trivia_score
+from backend.text import clean_text_for_latin1
+from ui.common import set_page
+from ui.state import TriviaQuestionState
+
+# Per-day trivia scores saved to, and restored from, the durable progress store along with the questions and their states
+PROGRESS_SCORE_KEYS = ('hints_remaining', 'current_trivia_score', 'score_logged_today')
+
+
+def show_trivia_page():
+    st.title(translate_text_with_ai("🧠 Daily Trivia Challenge!", st.session_state['preferred_language'])) # Removed client_ai
+    st.button(translate_text_with_ai("⬅️ Back to Main Page", st.session_state['preferred_language']), on_click=set_page, args=('main_app',), key="back_to_main_from_trivia_top") # Removed client_ai
+
+    # Feedback email note at the top
+    st.markdown("---")
+    st.markdown(translate_text_with_ai("📧 You can send us feedback at: `thisdayinhistoryapp@gmail.com`", st.session_state['preferred_language'])) # Removed client_ai
+    st.markdown("---")
+
+    st.subheader(translate_text_with_ai("Trivia Settings", st.session_state['preferred_language'])) # Removed client_ai
+    # Add the note about inputting a response
+    st.info(translate_text_with_ai("💡 To check your answer, please input your response into the text box and then click the 'Check Answer' button.", st.session_state['preferred_language'])) # Removed client_ai
+    
+    # Moved: Difficulty selection is now on the trivia page
+    st.session_state['difficulty'] = st.selectbox(
+        translate_text_with_ai("Trivia Difficulty", st.session_state['preferred_language']), # Removed client_ai
+        options=DIFFICULTIES,
+        index=DIFFICULTIES.index(st.session_state['difficulty']), # Set initial value from session state
+        key='trivia_difficulty_select',
+        help=translate_text_with_ai("Adjusts the complexity of the trivia questions: Easy (well-known), Medium (general facts), Hard (obscure facts).", st.session_state['preferred_language']) # Removed client_ai
+    )
+    st.markdown("---")
+
+    # Trivia only depends on the date, difficulty and topic, so a difficulty change fetches just the
+    # five questions (from the shared trivia cache when another user already generated them).
+    current_selected_date = datetime.today().date() # Assume trivia is for today's date
+    topic = st.session_state.get('preferred_topic_main_app') if st.session_state.get('preferred_topic_main_app') != "None" else None
+    trivia_data_key = f"{current_selected_date.strftime('%Y-%m-%d')}-{topic}-trivia_difficulty_{st.session_state['difficulty']}"
+
+    # The questions are kept in the shared content store; if they were dropped from it, restore or fetch them again
+    trivia_questions = content_store.get(st.session_state['trivia_questions_ref'])
+    if trivia_questions is None:
+        st.session_state['trivia_data_key'] = None
+
+    # Only re-fetch if the selected difficulty, date or topic has changed, and the user has no
+    # saved progress for it (from another tab, an earlier connection, or before switching difficulty)
+    saved_progress = None
+    if st.session_state['trivia_data_key'] != trivia_data_key:
+        saved_progress = trivia_progress.load(st.session_state['logged_in_username'], trivia_data_key)
+    if saved_progress:
+        trivia_questions = _restore_progress(saved_progress)
+        st.session_state['trivia_data_key'] = trivia_data_key
+    elif st.session_state['trivia_data_key'] != trivia_data_key:
+        with st.spinner(translate_text_with_ai(f"Generating new trivia questions for {st.session_state['difficulty']} difficulty...", st.session_state['preferred_language'])): # Removed client_ai
+            # Trivia is always kept in English
+            trivia_questions = get_trivia_questions(
+                current_selected_date.day, current_selected_date.month,
+                difficulty=st.session_state['difficulty'],
+                topic=topic,
+                current_year=current_selected_date.year
+            )
+            st.session_state['trivia_questions_ref'] = content_store.put(trivia_questions) if trivia_questions else None
+            if trivia_questions: # Leave the key unset after a failure so the next rerun retries
+                st.session_state['trivia_data_key'] = trivia_data_key
+            st.session_state['trivia_question_states'] = {} # Reset trivia states for new difficulty's data
+            st.session_state['hints_remaining'] = 3
+            st.session_state['current_trivia_score'] = 0
+            st.session_state['total_possible_daily_trivia_score'] = 0
+            st.session_state['score_logged_today'] = False
+
+    # The raw, untranslated trivia questions are displayed on the trivia page
+    if trivia_questions: # Only proceed to display trivia questions if they exist
+        # Calculate total possible points
+        st.session_state['total_possible_daily_trivia_score'] = len(trivia_questions) * 3
+        st.info(f"**{translate_text_with_ai('Total Possible Points', st.session_state['preferred_language'])}:** {st.session_state['total_possible_daily_trivia_score']} | **{translate_text_with_ai('Your Current Score', st.session_state['preferred_language'])}:** {st.session_state['current_trivia_score']}") # Removed client_ai
+        st.markdown(translate_text_with_ai("**Scoring:** You earn 3 points for a correct answer on the first attempt, 2 points on the second, and 1 point on the third. No points are awarded after three incorrect attempts.", st.session_state['preferred_language'])) # Removed client_ai
+
+
+        for i, trivia_item in enumerate(trivia_questions):
+            _show_trivia_question(i, trivia_item, len(trivia_questions))
+            
+        st.markdown("---")
+        # Check if all questions are answered correctly or out of chances
+        all_completed = all(st.session_state['trivia_question_states'][f"trivia_q_{i}"].is_correct or \
+                            st.session_state['trivia_question_states'][f"trivia_q_{i}"].out_of_chances \
+                            for i in range(len(trivia_questions)))
+        
+        if all_completed:
+            st.success(translate_text_with_ai("You've completed the trivia challenge for today!", st.session_state['preferred_language'])) # Removed client_ai
+            if not st.session_state['score_logged_today']:
+                if log_trivia_score(st.session_state['logged_in_username'], st.session_state['current_trivia_score']):
+                    st.session_state['score_logged_today'] = True
+                    st.success(translate_text_with_ai("Your score has been logged!", st.session_state['preferred_language'])) # Removed client_ai
+                else:
+                    st.error(translate_text_with_ai("Failed to log your score.", st.session_state['preferred_language'])) # Removed client_ai
+        else:
+            # Hint clicks rerun only their question, so the live count is shown there, not here
+            st.info(translate_text_with_ai("You have 3 hints a day. Each question's Hint button shows how many are left.", st.session_state['preferred_language'])) # Removed client_ai
+        
+        st.markdown("---")
+        _show_leaderboard()
+
+        st.button(translate_text_with_ai("⬅️ Back to Main Page", st.session_state['preferred_language']), on_click=set_page, args=('main_app',), key="back_to_main_from_trivia_bottom") # Removed client_ai
+    else: # Added an else block here to explicitly state if no trivia is loaded
+        st.info(translate_text_with_ai("No trivia questions are available for today. Please check your content preferences or try again later.", st.session_state['preferred_language'])) # Removed client_ai
+    _save_progress()
+
+
+def _save_progress():
+    """Hands the current trivia state to the write-behind progress store (a no-op if unchanged)."""
+    trivia_questions = content_store.get(st.session_state['trivia_questions_ref'])
+    if st.session_state['trivia_data_key'] and trivia_questions:
+        progress = {key: st.session_state[key] for key in PROGRESS_SCORE_KEYS}
+        progress['raw_trivia_data'] = trivia_questions
+        progress['trivia_question_states'] = {key: q_state.to_progress() for key, q_state in st.session_state['trivia_question_states'].items()}
+        trivia_progress.save(st.session_state['logged_in_username'], st.session_state['trivia_data_key'], progress)
+
+
+def _restore_progress(progress):
+    """Puts saved progress back into session state and returns the saved questions."""
+    st.session_state['trivia_questions_ref'] = content_store.put(progress['raw_trivia_data'])
+    st.session_state['trivia_question_states'] = {key: TriviaQuestionState.from_progress(q_state) for key, q_state in progress['trivia_question_states'].items()}
+    st.session_state.update({key: progress[key] for key in PROGRESS_SCORE_KEYS})
+    return content_store.get(st.session_state['trivia_questions_ref'])
+
+
+@st.fragment
+def _show_trivia_question(i, trivia_item, total_questions):
+    """
+    Renders one trivia question. As a fragment, "Hint" and wrong "Check Answer" clicks
+    rerun only this question's block instead of the sidebar, the other questions and the
+    leaderboard. Hints are spent from the shared hints_remaining when clicked, so another
+    question's Hint button, whose count is only as fresh as its question's last rerun, can
+    never spend a hint that isn't left. A finished question changes the score shown outside
+    this fragment, so it reruns the whole page.
+    """
+    question_key_base = f"trivia_q_{i}" # Base key for state
+    
+    # Initialize state for this question if not already present
+    if question_key_base not in st.session_state['trivia_question_states']:
+        st.session_state['trivia_question_states'][question_key_base] = TriviaQuestionState()
+
+    q_state = st.session_state['trivia_question_states'][question_key_base]
+
+    st.markdown("---")
+    # Question X of Y indicator
+    st.markdown(f"**{translate_text_with_ai('Question', st.session_state['preferred_language'])} {i+1} {translate_text_with_ai('of', st.session_state['preferred_language'])} {total_questions}:**") # Removed client_ai
+    
+    # Display question
+    st.markdown(f"{trivia_item.get('question', 'No question available.')}") # Display question
+    
+    # Display hint ONLY if revealed or out of chances
+    if q_state.hint_revealed or q_state.out_of_chances:
+         if trivia_item.get('hint'):
+            st.info(f"Hint: {trivia_item.get('hint', 'No hint available.')}") # Display hint
+
+    col_input, col_check, col_hint = st.columns([0.6, 0.2, 0.2])
+
+    with col_input:
+        user_input = st.text_input(
+            translate_text_with_ai(f"Your Answer for Q{i+1}:", st.session_state['preferred_language']), # Removed client_ai
+            value=q_state.user_answer, 
+            key=f"input_{question_key_base}", 
+            disabled=q_state.is_correct or q_state.out_of_chances # Disable if correct or out of chances
+        )
+        q_state.user_answer = user_input # Update state on input change for persistence
+
+    with col_check:
+        # Disable check button if correct, no input, or out of chances
+        if not q_state.is_correct and not q_state.out_of_chances:
+            if st.button(translate_text_with_ai("Check Answer", st.session_state['preferred_language']), key=f"check_btn_{question_key_base}", disabled=not user_input.strip()): # Removed client_ai
+                user_answer_cleaned = user_input.strip().lower()
+                correct_answer_original = trivia_item.get('answer', '').strip() # Use .get() here too
+                correct_answer_cleaned = correct_answer_original.lower()
+
+                is_exact_match = (user_answer_cleaned == correct_answer_cleaned)
+                is_partial_match = False
+                if not is_exact_match:
+                    is_partial_match = check_partial_correctness_with_ai(user_input, correct_answer_original) # Removed client_ai
+
+                if is_exact_match or is_partial_match:
+                    if not q_state.is_correct: # Only award points if not already correct
+                        q_state.is_correct = True
+                        points = 0
+                        if q_state.attempts == 0: # First try (0 attempts before this correct one)
+                            points = 3
+                        elif q_state.attempts == 1: # Second try
+                            points = 2
+                        elif q_state.attempts == 2: # Third try
+                            points = 1
+                        # If points have already been awarded, don't add them again
+                        if q_state.points_earned == 0:
+                            q_state.points_earned = points
+                            st.session_state['current_trivia_score'] += points
+                        
+                        if is_exact_match:
+                            q_state.feedback = translate_text_with_ai(f"✅ Correct! You earned {points} points for this question.", st.session_state['preferred_language']) # Removed client_ai
+                        else: # It's a partial match
+                            q_state.feedback = translate_text_with_ai(f"✅ Partially correct! You earned {points} points for this question.", st.session_state['preferred_language']) # Removed client_ai
+                    else:
+                        q_state.feedback = translate_text_with_ai("✅ Already correct!", st.session_state['preferred_language']) # Should not happen with disabled button, but as a safeguard # Removed client_ai
+                else: # Neither exact nor partial match
+                    q_state.attempts += 1 # Increment attempts on incorrect answer
+                    if q_state.attempts >= 3:
+                        q_state.out_of_chances = True
+                        # Display correct answer here if user is out of chances
+                        translated_correct_answer = translate_text_with_ai(trivia_item.get('answer', ''), st.session_state['preferred_language']) # Use .get() here too # Removed client_ai
+                        q_state.feedback = translate_text_with_ai(f"❌ You've used all {q_state.attempts} attempts. The correct answer was: **{translated_correct_answer}**. You earned 0 points for this question.", st.session_state['preferred_language']) # Removed client_ai
+                        st.info(f"Answer: {trivia_item.get('answer', 'No answer available.')}") # Display answer immediately if out of chances
+                        # Ensure points_earned is 0 if out of chances and not previously correct
+                        if q_state.points_earned == 0:
+                            q_state.points_earned = 0 # Explicitly set to 0
+                    else:
+                        q_state.feedback = translate_text_with_ai(f"❌ Incorrect. Try again! (Attempts: {q_state.attempts}/3)", st.session_state['preferred_language']) # Removed client_ai
+                # A finished question changes the score and completion status shown outside this
+                # fragment, so only then rerun the whole page; wrong attempts stay fragment-local.
+                if q_state.is_correct or q_state.out_of_chances:
+                    st.rerun()
+
+    with col_hint:
+        # Show hint button only if not correct, not out of chances, hints remaining, not already revealed, and hint content exists
+        if not q_state.is_correct and not q_state.out_of_chances and st.session_state['hints_remaining'] > 0 and not q_state.hint_revealed and trivia_item.get('hint'):
+            # The callback runs before this fragment reruns, so the hint shows in the same rerun
+            st.button(translate_text_with_ai(f"Hint ({st.session_state['hints_remaining']})", st.session_state['preferred_language']), key=f"hint_btn_{question_key_base}", # Removed client_ai
+                      on_click=_use_hint, args=(question_key_base,))
+        # Always display hint if it was revealed for this question OR out of chances (for learning) AND hint content exists
+        elif (q_state.hint_revealed or q_state.out_of_chances) and trivia_item.get('hint'):
+            st.info(f"{translate_text_with_ai('Hint', st.session_state['preferred_language'])}: {trivia_item.get('hint', '')}") # Removed client_ai
+            if q_state.hint_revealed and not q_state.is_correct and not q_state.out_of_chances:
+                st.caption(translate_text_with_ai(f"Hints left today: {st.session_state['hints_remaining']}", st.session_state['preferred_language']))
+        elif not q_state.is_correct and not q_state.out_of_chances and trivia_item.get('hint'):
+            st.caption(translate_text_with_ai("No hints left today.", st.session_state['preferred_language']))
+
+    # Display feedback based on the state
+    if q_state.feedback:
+        if q_state.is_correct:
+            st.success(q_state.feedback)
+        elif q_state.out_of_chances:
+            st.error(q_state.feedback)
+        else: # Incorrect but still has chances
+            st.error(q_state.feedback)
+
+    # Add expander for related article - ONLY show if out of chances or correct
+    if q_state.out_of_chances or q_state.is_correct: # Show explanation if correct OR out of chances
+        with st.expander(translate_text_with_ai(f"Show Explanation for Q{i+1}", st.session_state['preferred_language'])): # Removed client_ai
+            explanation = content_store.get(q_state.explanation_ref)
+            if explanation is None:
+                # Generate article in English first
+                generated_article_en = generate_related_trivia_article(
+                    trivia_item.get('question', ''), trivia_item.get('answer', '') # Removed client_ai
+                )
+                # Translate to preferred language for display
+                explanation = clean_text_for_latin1(translate_text_with_ai(generated_article_en, st.session_state['preferred_language'])) # Ensured cleaning here
+                q_state.explanation_ref = content_store.put(explanation)
+            st.write(explanation)
+
+    _save_progress()
+
+
+def _use_hint(question_key_base):
+    """Reveals the question's hint if any of the day's hints are left (a stale button may offer one that isn't)."""
+    q_state = st.session_state['trivia_question_states'].get(question_key_base)
+    if q_state is not None and st.session_state['hints_remaining'] > 0:
+        st.session_state['hints_remaining'] -= 1
+        q_state.hint_revealed = True
+
+
+@st.fragment
+def _show_leaderboard():
+    """
+    Renders the leaderboard panel as its own fragment, so hint and wrong-answer clicks don't
+    rerun it. Full reruns (a finished question) do, but get_leaderboard_data is cached.
+    """
+    st.subheader(translate_text_with_ai("🏆 Leaderboard", st.session_state['preferred_language']))
+    leaderboard = get_leaderboard_data()
+    if leaderboard:
+        for rank, (username, score) in enumerate(leaderboard):
+            st.write(f"{rank+1}. {username}: {score} {translate_text_with_ai('points', st.session_state['preferred_language'])}")
+    else:
+        st.info(translate_text_with_ai("No scores logged yet for the leaderboard. Be the first!", st.session_state['preferred_language']))
@@ -0,0 +1,85 @@
+"""The weekly planner page: a week (or any range up to EXPORT_MAX_DAYS) of daily PDFs bundled into one ZIP."""
+import time
+from datetime import datetime, timedelta # Import timedelta for date calculations
+
+import streamlit as st
+
+from backend.ai import translate_text_with_ai
+from backend.config import EXPORT_MAX_DAYS
+from backend.export import archive_path, export_date_range
+from ui.common import handle_weekly_pdf_download_click, set_page
+
+
+def show_weekly_planner_page():
+    st.title(translate_text_with_ai("🗓️ Weekly Planner", st.session_state['preferred_language'])) # Removed client_ai
+    st.write(translate_text_with_ai(f"Generate 'This Day in History' PDFs for an entire week, or any range of up to {EXPORT_MAX_DAYS} days, starting from your chosen date, and download them as a single ZIP file.", st.session_state['preferred_language'])) # Removed client_ai
+
+    # User selects the range; it defaults to the week starting on the chosen date.
+    start_date = st.date_input(translate_text_with_ai("Select a Start Date for the Week", st.session_state['preferred_language']), datetime.today().date()) # Removed client_ai
+    end_date = st.date_input(translate_text_with_ai("Select an End Date", st.session_state['preferred_language']), start_date + timedelta(days=6),
+                             min_value=start_date, max_value=start_date + timedelta(days=EXPORT_MAX_DAYS - 1))
+    day_count = (end_date - start_date).days + 1
+
+    # Button to trigger the PDF generation and zipping process.
+    if st.button(translate_text_with_ai("Generate Weekly PDFs" if day_count == 7 else f"Generate {day_count} PDFs", st.session_state['preferred_language'])): # Removed client_ai
+        # A week keeps its familiar name; other ranges are named after their dates.
+        zip_file_name = "This_Week_in_History.zip" if day_count == 7 else f"This_Day_in_History_{start_date:%Y-%m-%d}_to_{end_date:%Y-%m-%d}.zip"
+        user_info_for_pdf = {
+            'name': st.session_state['logged_in_username'],
+            'jobs': '', 'hobbies': '', 'decade': '', 'life_experiences': '', 'college_chapter': ''
+        }
+        preferences = {
+            'topic': st.session_state.get('preferred_topic_main_app') if st.session_state.get('preferred_topic_main_app') != "None" else None,
+            'preferred_decade': st.session_state.get('preferred_decade_main_app') if st.session_state.get('preferred_decade_main_app') != "None" else None,
+            'difficulty': st.session_state['difficulty'],
+            'local_city': st.session_state['local_city'] if st.session_state['local_city'].strip() else None,
+            'local_state_country': st.session_state['local_state_country'] if st.session_state['local_state_country'].strip() else None,
+        }
+
+        try:
+            # Days are generated and rendered in the background at batch priority (see backend/export.py), and an
+            # interrupted export picks up where it stopped when the button is pressed again.
+            path = archive_path(start_date, end_date, user_info_for_pdf, st.session_state['preferred_language'], st.session_state['custom_masthead_text'], **preferences)
+            progress = st.progress(0.0, text=translate_text_with_ai("Generating PDFs and zipping them... This may take a moment.", st.session_state['preferred_language'])) # Removed client_ai
+            started = time.monotonic()
+            settled, failed_days = 0, []
+            for day, outcome, _ in export_date_range(path, start_date, end_date, user_info_for_pdf, st.session_state['preferred_language'],
+                                                     st.session_state['custom_masthead_text'], **preferences):
+                settled += 1
+                if outcome == 'failed':
+                    failed_days.append(day)
+                progress.progress(settled / day_count, text=f"{day.strftime('%B %d, %Y')} ({settled}/{day_count})")
+            elapsed = time.monotonic() - started
+
+            if failed_days:
+                st.warning(translate_text_with_ai(f"Could not generate {len(failed_days)} of {day_count} days ({', '.join(day.strftime('%B %d') for day in sorted(failed_days))}). Press the button again to retry them; finished days are kept.", st.session_state['preferred_language'])) # Removed client_ai
+            if len(failed_days) < day_count:
+                # Provide the download button to the user.
+                with open(path, 'rb') as zip_file:
+                    zip_bytes = zip_file.read()
+                st.download_button(
+                    label=translate_text_with_ai(f"⬇️ Download {zip_file_name}", st.session_state['preferred_language']), # Removed client_ai
+                    data=zip_bytes,
+                    file_name=zip_file_name,
+                    mime="application/zip",
+                    on_click=handle_weekly_pdf_download_click, # Use the new handler for weekly download
+                    args=(st.session_state['logged_in_username'], zip_file_name, start_date) # Pass arguments
+                )
+                st.success(translate_text_with_ai(f"{day_count - len(failed_days)} PDFs generated and zipped in {elapsed:.0f} seconds! Click the button above to download.", st.session_state['preferred_language'])) # Removed client_ai
+
+        except Exception as e:
+            # General error handling for any issues during the process.
+            st.error(translate_text_with_ai(f"An error occurred during PDF generation or zipping: {e}", st.session_state['preferred_language'])) # Removed client_ai
+        
+    # Display status message for weekly download if any
+    if st.session_state['last_weekly_download_status'] == 'success':
+        st.success(translate_text_with_ai("Weekly PDF download successfully logged to Google Sheet!", st.session_state['preferred_language'])) # Removed client_ai
+        st.session_state['last_weekly_download_status'] = None # Clear the message after display
+    elif st.session_state['last_weekly_download_status'] == 'failure':
+        st.error(translate_text_with_ai("Failed to log weekly PDF download to Google Sheet. Please check permissions or try again.", st.session_state['preferred_language'])) # Removed client_ai
+        st.session_state['last_weekly_download_status'] = None # Clear the message after display
+
+    st.markdown("---") # Visual separator
+    # Navigation buttons within the page for convenience.
+    st.button(translate_text_with_ai("⬅️ Back to Main App", st.session_state['preferred_language']), on_click=lambda: set_page('main_app')) # Removed client_ai
+    st.button(translate_text_with_ai("🧠 Go to Trivia", st.session_state['preferred_language']), on_click=lambda: set_page('trivia_page')) # Removed client_ai